@@ -0,0 +1,6 @@
+"""Benchmarks of `cmds` on synthetic databases.
+
+Run `python -m benchmarks run` to time the `Cmds` operations and the command line against
+generated databases of every size and storage engine, and `python -m benchmarks compare`
+to flag regressions between two result files. See `python -m benchmarks --help`.
+"""
@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from benchmarks import results as results_module
+from benchmarks import suite
+from command_storage.models.enums import engine as engine_enums
+
+app = typer.Typer(add_completion=False, help="Benchmarks of cmds on synthetic databases.")
+
+DEFAULT_SIZES = "1000,10000,100000"
+DEFAULT_THRESHOLD = 0.2
+
+
+def _parse_list(value: str, name: str) -> list[str]:
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    if not items:
+        raise typer.BadParameter(f"{name} can't be empty")
+    return items
+
+
+@app.command()
+def run(
+    output: Path = typer.Option(Path("benchmark-results.json"), "--output", "-o", help="Result file to write."),
+    sizes: str = typer.Option(DEFAULT_SIZES, "--sizes", "-s", help="Comma separated no. of commands, e.g. 1000,1000000."),
+    engines: str = typer.Option(",".join(engine.value for engine in engine_enums.Engine), "--engines", "-e", help="Comma separated storage engines."),
+    cases: Optional[str] = typer.Option(None, "--cases", "-c", help="Comma separated cases to run. Defaults to all cases."),
+    repeat: int = typer.Option(5, "--repeat", "-r", min=1, help="Timed runs per case."),
+    no_subprocess: bool = typer.Option(False, "--no-subprocess", help="Skip the cases starting cmds processes."),
+) -> None:
+    """Time every case against generated databases of every size and engine."""
+    try:
+        size_values = [int(size) for size in _parse_list(sizes, "--sizes")]
+        engine_values = [engine_enums.Engine(engine) for engine in _parse_list(engines, "--engines")]
+    except ValueError as error:
+        raise typer.BadParameter(str(error))
+
+    case_names = _parse_list(cases, "--cases") if cases is not None else None
+    unknown = set(case_names or ()) - {case.name for case in suite.CASES}
+    if unknown:
+        raise typer.BadParameter(f"Unknown cases: {', '.join(sorted(unknown))}")
+
+    def report(name: str, times: list[float]) -> None:
+        stats = suite.summarize(times)
+        typer.echo(f"{name:<50} min {stats['min'] * 1000:>10.2f} ms   median {stats['median'] * 1000:>10.2f} ms")
+
+    results = suite.run_suite(size_values, engine_values, repeat, case_names, not no_subprocess, report)
+    settings = {"sizes": size_values, "engines": [engine.value for engine in engine_values], "repeat": repeat}
+    results_module.write_results(output, results, settings)
+    typer.echo(f"Results written to {output}")
+
+
+@app.command()
+def compare(
+    base: Path = typer.Argument(..., help="Result file of the baseline run."),
+    new: Path = typer.Argument(..., help="Result file of the run to check."),
+    threshold: float = typer.Option(DEFAULT_THRESHOLD, "--threshold", "-t", min=0, help="Allowed relative slowdown of the best time, 0.2 is 20%."),
+) -> None:
+    """Compare two result files and fail if a case got slower than the threshold allows."""
+    try:
+        comparisons = results_module.compare(results_module.load_results(base), results_module.load_results(new))
+    except (OSError, ValueError, KeyError, json.JSONDecodeError) as error:
+        typer.secho(f"Can't compare results: {error}", fg=typer.colors.RED)
+        raise typer.Exit(2)
+
+    regressions = [comparison for comparison in comparisons if comparison.is_regression(threshold)]
+    for comparison in comparisons:
+        line = f"{comparison.name:<50} {comparison.base * 1000:>10.2f} ms -> {comparison.new * 1000:>10.2f} ms  {comparison.ratio:>6.2f}x"
+        typer.secho(line, fg=typer.colors.RED if comparison in regressions else None)
+
+    if regressions:
+        typer.secho(f"{len(regressions)} of {len(comparisons)} cases regressed by more than {threshold:.0%}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+    typer.secho(f"No regressions in {len(comparisons)} cases", fg=typer.colors.GREEN)
+
+
+if __name__ == "__main__":
+    app(prog_name="python -m benchmarks")
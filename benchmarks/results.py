@@ -0,0 +1,87 @@
+"""Result files of benchmark runs and their comparison."""
+
+import json
+import platform
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+_RESULTS_VERSION = 1  # bump whenever the layout of the result files changes
+MIN_REGRESSION_SECONDS = 0.001  # slowdowns below this are noise, whatever the ratio
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """Best times of a case in two runs"""
+
+    name: str
+    base: float
+    new: float
+
+    @property
+    def ratio(self) -> float:
+        return self.new / self.base if self.base else float("inf")
+
+    def is_regression(self, threshold: float) -> bool:
+        """Returns whether the case got slower by more than the threshold
+
+        Args:
+            threshold (float): Allowed relative slowdown, e.g. `0.1` for 10%
+
+        Returns:
+            bool: Whether the case regressed
+        """
+        return self.ratio > 1 + threshold and self.new - self.base > MIN_REGRESSION_SECONDS
+
+
+def write_results(path: Path, results: dict[str, dict[str, Any]], settings: dict[str, Any]) -> None:
+    """Writes the results of a run together with what they were measured on
+
+    Args:
+        path (Path): Result file
+        results (dict[str, dict[str, Any]]): Statistics by case
+        settings (dict[str, Any]): Settings of the run
+    """
+    document = {
+        "version": _RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "settings": settings,
+        "results": results,
+    }
+    path.write_text(json.dumps(document, indent=4))
+
+
+def load_results(path: Path) -> dict[str, dict[str, Any]]:
+    """Reads the results of a run
+
+    Args:
+        path (Path): Result file
+
+    Raises:
+        ValueError: Raised if the file isn't a result file of this version
+
+    Returns:
+        dict[str, dict[str, Any]]: Statistics by case
+    """
+    document = json.loads(path.read_text())
+    if not isinstance(document, dict) or document.get("version") != _RESULTS_VERSION:
+        raise ValueError(f"{path} isn't a version {_RESULTS_VERSION} benchmark result file")
+    return document["results"]
+
+
+def compare(base: dict[str, dict[str, Any]], new: dict[str, dict[str, Any]]) -> list[Comparison]:
+    """Compares the best times of the cases run in both runs. Best times are compared as
+    they are the least affected by other load on the machine.
+
+    Args:
+        base (dict[str, dict[str, Any]]): Statistics of the baseline run
+        new (dict[str, dict[str, Any]]): Statistics of the run to check
+
+    Returns:
+        list[Comparison]: Comparison of every common case, in the order of the new run
+    """
+    return [Comparison(name, base[name]["min"], stats["min"]) for name, stats in new.items() if name in base]
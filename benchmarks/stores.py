@@ -0,0 +1,118 @@
+"""Synthetic databases resembling what people store in `cmds`."""
+
+import random
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from command_storage.models.database import db_models
+from command_storage.models.database.db_handler import get_db_handler, init_database
+from command_storage.models.enums import engine as engine_enums
+from command_storage.models.enums import error as error_enums
+
+_TEMPLATES = [
+    ("git", "git log --oneline --graph -n {number} {branch}"),
+    ("git", "git rebase -i HEAD~{number}"),
+    ("git", "git push --force-with-lease origin {branch}"),
+    ("docker", "docker run -it --rm -p {port}:{port} {image}:{tag}"),
+    ("docker", "docker compose -f {path}/docker-compose.yml up -d {image}"),
+    ("kubectl", "kubectl get pods -n {namespace} -l app={image} -o wide"),
+    ("kubectl", "kubectl logs -f deployment/{image} -n {namespace} --since={number}m"),
+    ("ssh", "ssh -i ~/.ssh/{user}.pem {user}@{host} -p {port}"),
+    ("find", "find {path} -name '*.{extension}' -mtime -{number} -print"),
+    ("grep", "grep -rn --include='*.{extension}' '{word}' {path}"),
+    ("curl", "curl -sS -H 'Accept: application/json' https://{host}/api/v{number}/{word}"),
+    ("tar", "tar -czvf {word}-{number}.tar.gz {path}"),
+    ("psql", "psql -h {host} -U {user} -d {word} -c 'select count(*) from {word}'"),
+    ("rsync", "rsync -avz --delete {path}/ {user}@{host}:{path}"),
+]
+_WORDS = {
+    "branch": ["main", "develop", "release/2.1", "feature/search", "hotfix/login"],
+    "image": ["postgres", "redis", "nginx", "api", "worker", "frontend"],
+    "tag": ["latest", "alpine", "1.25", "16-bookworm"],
+    "namespace": ["default", "staging", "production", "monitoring"],
+    "user": ["admin", "deploy", "ubuntu", "ashu"],
+    "host": ["db.internal", "10.0.0.12", "bastion.example.com", "api.example.org"],
+    "path": ["/var/log", "~/projects", "/srv/data", "./build", "/etc/nginx"],
+    "extension": ["py", "log", "json", "yaml", "md"],
+    "word": ["orders", "users", "metrics", "invoices", "events", "sessions"],
+}
+_VERBS = ["show", "run", "tail", "sync", "push", "pull", "list", "clean", "deploy", "check"]
+
+
+def generate_commands(size: int, seed: int = 0) -> dict[str, db_models.Command]:
+    """Generates commands with unique keys. The same size and seed always give the same
+    commands.
+
+    Args:
+        size (int): No. of commands
+        seed (int, optional): Seed of the generator. Defaults to 0.
+
+    Returns:
+        dict[str, db_models.Command]: Commands by key in database order
+    """
+    rng = random.Random(seed)
+    commands = {}
+    for idx in range(size):
+        tool, template = rng.choice(_TEMPLATES)
+        words = {name: rng.choice(choices) for name, choices in _WORDS.items()}
+        command = template.format(number=rng.randint(1, 500), port=rng.choice([5432, 6379, 8080, 2222]), **words)
+        key = f"{tool}-{rng.choice(_VERBS)}-{words['word']}-{idx}"
+        description: Optional[str] = None
+        if rng.random() < 0.7:
+            description = f"{rng.choice(_VERBS).capitalize()} {words['word']} on {words['host']} with {tool}"
+        commands[key] = db_models.Command(key, command, description)
+    return commands
+
+
+def get_db_path(directory: Path, engine: engine_enums.Engine) -> Path:
+    """Returns the path of the database of the engine in the directory
+
+    Args:
+        directory (Path): Directory of the database
+        engine (engine_enums.Engine): Storage engine
+
+    Returns:
+        Path: Path of the database
+    """
+    return directory / f"cmds.{engine.value}"
+
+
+def create_store(directory: Path, engine: engine_enums.Engine, size: int, seed: int = 0) -> Path:
+    """Creates a database of generated commands through the storage engine itself
+
+    Args:
+        directory (Path): Empty directory to create the database in
+        engine (engine_enums.Engine): Storage engine
+        size (int): No. of commands
+        seed (int, optional): Seed of the generator. Defaults to 0.
+
+    Raises:
+        RuntimeError: Raised if the database can't be created
+
+    Returns:
+        Path: Path of the database
+    """
+    db_path = get_db_path(directory, engine)
+    if engine in (engine_enums.Engine.JSON, engine_enums.Engine.JSON_LOG):
+        db_path.write_text("{}")
+
+    commands = db_models.Commands.model_construct(commands=generate_commands(size, seed), error=error_enums.Error.SUCCESS)
+    if (
+        init_database(db_path, engine) != error_enums.Error.SUCCESS
+        or get_db_handler(db_path, engine).write_commands(commands).error != error_enums.Error.SUCCESS
+    ):
+        raise RuntimeError(f"Can't create the {engine.value} database in {directory}")
+    return db_path
+
+
+def restore_store(template: Path, directory: Path) -> None:
+    """Replaces the contents of the directory by a copy of the template directory, so
+    every run of a mutating benchmark starts from the same database and caches
+
+    Args:
+        template (Path): Directory holding the database to copy
+        directory (Path): Directory to copy it to
+    """
+    shutil.rmtree(directory, ignore_errors=True)
+    shutil.copytree(template, directory)
@@ -0,0 +1,246 @@
+"""Benchmark cases and the runner timing them.
+
+Every case runs against a copy of a generated database. Cases that change the database
+get a fresh copy before every run, so all runs measure the same work. Copying and warming
+up the caches of the copy is not part of the measured time.
+"""
+
+import contextlib
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+from benchmarks import stores
+from command_storage.controller import config
+from command_storage.controller.app import Cmds
+from command_storage.models.constants import DEFAULT_LIST_LIMIT
+from command_storage.models.enums import engine as engine_enums
+from command_storage.models.enums import error as error_enums
+from command_storage.models.enums import file_format as file_format_enums
+from command_storage.models.enums import search_field as search_field_enums
+
+_REPO_PATH = Path(__file__).resolve().parents[1]
+
+
+@dataclass(frozen=True)
+class Target:
+    """Database a case runs against together with the inputs of the cases"""
+
+    engine: engine_enums.Engine
+    db_path: Path
+    key: str  # key of a stored command
+    query: str  # misspelled key used as fuzzy search query
+    env: dict[str, str]  # environment of `cmds` subprocesses using the database
+
+
+@dataclass(frozen=True)
+class Case:
+    """A timed operation"""
+
+    name: str
+    run: Callable[[Target], None]
+    mutates: bool = False  # whether every run needs a fresh copy of the database
+    subprocess: bool = False  # whether the case starts a `cmds` process
+
+
+def _check(error: error_enums.Error) -> None:
+    """Fails the case if the operation failed, so errors are never timed as results"""
+    if error != error_enums.Error.SUCCESS:
+        raise RuntimeError(f"Benchmarked operation failed with '{error}'")
+
+
+def _cmds(target: Target) -> Cmds:
+    return Cmds(target.db_path, target.engine)
+
+
+def _invoke(target: Target, args: Sequence[str]) -> None:
+    """Runs the command line in-process like `typer.testing.CliRunner` does in the tests"""
+    from typer.testing import CliRunner
+
+    from command_storage.views import cli
+
+    result = CliRunner().invoke(cli.app, list(args))
+    if result.exit_code != 0:
+        raise RuntimeError(f"'cmds {' '.join(args)}' failed: {result.output}")
+
+
+def _spawn(target: Target, args: Sequence[str]) -> None:
+    """Runs the command line in a new `cmds` process"""
+    result = subprocess.run([sys.executable, "-m", "command_storage.views.main", *args], env=target.env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"'cmds {' '.join(args)}' failed: {result.stdout}{result.stderr}")
+
+
+def _export_json(target: Target) -> None:
+    """Exports like `cmds export` did before it streamed records"""
+    cmds = _cmds(target)
+    _check(cmds.export_json(cmds.list(0), str(target.db_path.with_name("export.json"))))
+
+
+CASES = [
+    Case("cmds.list", lambda target: _check(_cmds(target).list(DEFAULT_LIST_LIMIT).error)),
+    Case("cmds.list_all", lambda target: _check(_cmds(target).list(0).error)),
+    Case("cmds.get", lambda target: _check(_cmds(target).get(target.key).error)),
+    Case("cmds.list_fuzzy", lambda target: _check(_cmds(target).list_fuzzy(target.query, DEFAULT_LIST_LIMIT).error)),
+    Case(
+        "cmds.list_fuzzy_all_fields",
+        lambda target: _check(_cmds(target).list_fuzzy(target.query, DEFAULT_LIST_LIMIT, list(search_field_enums.SearchField)).error),
+    ),
+    Case("cmds.add", lambda target: _check(_cmds(target).add("benchmark-new-key", "echo new", None).error), mutates=True),
+    Case("cmds.update", lambda target: _check(_cmds(target).update(target.key, None, "echo updated", None)), mutates=True),
+    Case("cmds.delete", lambda target: _check(_cmds(target).delete(target.key, False)), mutates=True),
+    Case("cmds.export_json", _export_json),
+    Case(
+        "cmds.export_ndjson",
+        lambda target: _check(_cmds(target).export(str(target.db_path.with_name("export.ndjson")), file_format_enums.FileFormat.NDJSON)[0]),
+    ),
+    Case("cli.list", lambda target: _invoke(target, ["list"])),
+    Case("cli.list_fuzzy", lambda target: _invoke(target, ["list", target.query])),
+    Case("cli.store", lambda target: _invoke(target, ["store", "-k", "benchmark-new-key", "-c", "echo new"]), mutates=True),
+    Case("cli.export", lambda target: _invoke(target, ["export", "-f", str(target.db_path.with_name("export.json"))])),
+    Case("process.version", lambda target: _spawn(target, ["--version"]), subprocess=True),
+    Case("process.list", lambda target: _spawn(target, ["list"]), subprocess=True),
+    Case("process.get", lambda target: _spawn(target, ["get", target.key]), subprocess=True),
+    Case("process.list_fuzzy", lambda target: _spawn(target, ["list", target.query]), subprocess=True),
+    Case("process.store", lambda target: _spawn(target, ["store", "-k", "benchmark-new-key", "-c", "echo new"]), mutates=True, subprocess=True),
+]
+
+
+def _misspell(key: str) -> str:
+    """Returns the key with two neighbouring characters swapped in the middle"""
+    middle = len(key) // 2
+    return key[: middle - 1] + key[middle] + key[middle - 1] + key[middle + 1 :]
+
+
+@contextlib.contextmanager
+def _configured(directory: Path, db_path: Path, engine: engine_enums.Engine) -> Iterator[dict[str, str]]:
+    """Points `cmds` at the database, in-process and for subprocesses
+
+    Args:
+        directory (Path): Directory to keep the configs in
+        db_path (Path): Path of the database
+        engine (engine_enums.Engine): Storage engine of the database
+
+    Yields:
+        Iterator[dict[str, str]]: Environment of `cmds` subprocesses
+    """
+    home = directory / "home"
+    home.mkdir()
+    env = {
+        **os.environ,
+        "HOME": str(home),
+        "XDG_CONFIG_HOME": str(home / ".config"),
+        "CMDS_SOCKET": str(home / "cmds.sock"),  # never forward to a daemon of the user
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(_REPO_PATH), os.environ.get("PYTHONPATH")])),
+    }
+    (home / ".config").mkdir()
+    result = subprocess.run([sys.executable, "-m", "command_storage.views.cli", "init", "-db", str(db_path), "-e", engine.value], env=env, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Can't configure cmds for {db_path}: {result.stderr.decode()}")
+
+    config_dir, config_file = config.CONFIG_DIR_PATH, config.CONFIG_FILE_PATH
+    config.CONFIG_DIR_PATH = directory / "config"
+    config.CONFIG_FILE_PATH = config.CONFIG_DIR_PATH / "config.ini"
+    try:
+        _check(config.initialize_app(db_path, engine))
+        yield env
+    finally:
+        config.CONFIG_DIR_PATH, config.CONFIG_FILE_PATH = config_dir, config_file
+
+
+def _warm_up(target: Target) -> None:
+    """Builds the snapshot cache and the key index of a fresh copy of the database"""
+    cmds = _cmds(target)
+    _check(cmds.list(1).error)
+    _check(cmds.list_fuzzy(target.query, 1).error)
+
+
+def _time_case(case: Case, target: Target, template: Path, repeat: int) -> list[float]:
+    """Returns the wall times of the runs of the case in seconds. The first run only warms
+    up and isn't timed.
+
+    Args:
+        case (Case): Case to run
+        target (Target): Database to run against
+        template (Path): Directory holding the pristine database
+        repeat (int): No. of timed runs
+
+    Returns:
+        list[float]: Wall time of every timed run
+    """
+    work = target.db_path.parent
+    times = []
+    for run in range(repeat + 1):
+        if run == 0 or case.mutates:
+            stores.restore_store(template, work)
+            _warm_up(target)
+        start = time.perf_counter()
+        case.run(target)
+        if run:
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def run_suite(
+    sizes: Sequence[int],
+    engines: Sequence[engine_enums.Engine],
+    repeat: int,
+    case_names: Optional[Sequence[str]] = None,
+    subprocesses: bool = True,
+    report: Callable[[str, list[float]], None] = lambda name, times: None,
+) -> dict[str, dict[str, Any]]:
+    """Times the cases against generated databases of every size and engine
+
+    Args:
+        sizes (Sequence[int]): No. of commands of the databases
+        engines (Sequence[engine_enums.Engine]): Storage engines
+        repeat (int): No. of timed runs per case
+        case_names (Optional[Sequence[str]], optional): Names of the cases to run. Defaults
+        to all cases.
+        subprocesses (bool, optional): Whether to run the cases starting `cmds` processes.
+        Defaults to True.
+        report (Callable[[str, list[float]], None], optional): Called with the name and the
+        times of every finished case. Defaults to no reporting.
+
+    Returns:
+        dict[str, dict[str, Any]]: Statistics by `<engine>/<size>/<case>`
+    """
+    cases = [case for case in CASES if (case_names is None or case.name in case_names) and (subprocesses or not case.subprocess)]
+    results: dict[str, dict[str, Any]] = {}
+    for size in sizes:
+        commands = stores.generate_commands(size)
+        keys = list(commands)
+        key = keys[len(keys) // 2]
+        for engine in engines:
+            with tempfile.TemporaryDirectory(prefix="cmds-benchmark-") as tmp:
+                template, work = Path(tmp, "template"), Path(tmp, "work")
+                template.mkdir()
+                stores.create_store(template, engine, size)
+                stores.restore_store(template, work)
+                db_path = stores.get_db_path(work, engine)
+                with _configured(Path(tmp), db_path, engine) as env:
+                    target = Target(engine, db_path, key, _misspell(key), env)
+                    for case in cases:
+                        name = f"{engine.value}/{size}/{case.name}"
+                        times = _time_case(case, target, template, repeat)
+                        results[name] = summarize(times)
+                        report(name, times)
+    return results
+
+
+def summarize(times: list[float]) -> dict[str, Any]:
+    """Returns the statistics of the runs of a case
+
+    Args:
+        times (list[float]): Wall times of the runs in seconds
+
+    Returns:
+        dict[str, Any]: Best, median and all times
+    """
+    return {"min": min(times), "median": statistics.median(times), "runs": times}
@@ -1,78 +1,219 @@
+import contextlib
+import itertools
 import json
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Pattern, Sequence
 
 import typer
-from thefuzz import process
 
 from command_storage.controller import config
-from command_storage.models.constants import FUZZY_SEARCH_THRESHOLD
-from command_storage.models.database import db_models
-from command_storage.models.database.json_wrapper import JsonWrapper, get_database_path
+from command_storage.controller.transaction import Transaction
+from command_storage.models import tracing
+from command_storage.models.constants import FUZZY_INDEX_MIN_COMMANDS
+from command_storage.models.database import db_models, key_index
+from command_storage.models.database.base_wrapper import DatabaseReadError
+from command_storage.models.database.db_handler import get_db_handler
+from command_storage.models.database.json_wrapper import (
+    get_cache_enabled,
+    get_database_engine,
+    get_database_path,
+    get_lock_settings,
+)
+from command_storage.models.database.locking import (
+    DatabaseLockError,
+    LockSettings,
+    file_lock,
+)
+from command_storage.models.enums import compression as compression_enums
+from command_storage.models.enums import duplicate_policy as duplicate_policy_enums
+from command_storage.models.enums import engine as engine_enums
 from command_storage.models.enums import error as error_enums
+from command_storage.models.enums import file_format as file_format_enums
+from command_storage.models.enums import search_field as search_field_enums
+from command_storage.models.enums import shard_by as shard_by_enums
+from command_storage.models.models import import_summary as import_summary_model
 
 
 class Cmds:
     """Application Controller"""
 
-    def __init__(self, db_path: Path) -> None:
+    def __init__(
+        self,
+        db_path: Path,
+        engine: engine_enums.Engine = engine_enums.Engine.JSON,
+        lock_settings: Optional[LockSettings] = None,
+        use_cache: bool = True,
+        keep_in_memory: bool = False,
+    ) -> None:
         """Initializer for `Cmds`
 
         Args:
             db_path (Path): DB path for storing database file
+            engine (engine_enums.Engine, optional): Storage engine of the database.
+            Defaults to `engine_enums.Engine.JSON`.
+            lock_settings (Optional[LockSettings], optional): Retry/backoff settings for
+            the database lock. Defaults to `LockSettings()`.
+            use_cache (bool, optional): Whether to keep a snapshot cache of the parsed
+            database. Defaults to True.
+            keep_in_memory (bool, optional): Whether to keep the read commands and the key
+            index in memory for as long as the database files are unchanged. Used by
+            long-running processes like `cmds daemon`. Defaults to False.
         """
-        self._db_handler = JsonWrapper(db_path)
+        self._db_path = db_path
+        self._db_handler = get_db_handler(db_path, engine, use_cache)
+        self._lock_settings = lock_settings or LockSettings()
+        self._keep_in_memory = keep_in_memory
+        self._memory: Optional[tuple[Any, db_models.Commands]] = None  # signature and commands
+        self._key_index: Optional[key_index.KeyIndex] = None
+
+    def _get_commands(self) -> db_models.Commands:
+        """Reads all stored commands, from memory if they are kept there and the database
+        files are unchanged
+
+        Returns:
+            db_models.Commands: Returns the read commands. Must not be modified.
+        """
+        with tracing.phase("read database"):
+            if not self._keep_in_memory:
+                return self._db_handler.get_commands()
+
+            signature = self._db_handler.signature()  # taken first, a concurrent write is caught next time
+            if signature is not None and self._memory is not None and self._memory[0] == signature:
+                return self._memory[1]
+
+            commands = self._db_handler.get_commands()
+            if signature is not None and commands.error == error_enums.Error.SUCCESS:
+                self._memory = (signature, commands)
+            return commands
+
+    def _get_key_index(self, keys: list[str]) -> Optional[key_index.KeyIndex]:
+        """Returns the key index used by fuzzy search, if the store is large enough to
+        need one
+
+        Args:
+            keys (list[str]): Keys of the database in database order
+
+        Returns:
+            Optional[key_index.KeyIndex]: Index of the keys
+        """
+        if len(keys) < FUZZY_INDEX_MIN_COMMANDS:
+            return None
+
+        if self._key_index is not None and self._key_index.matches(keys):
+            return self._key_index
+
+        with tracing.phase("load key index"):
+            index = key_index.get_index(self._db_path, keys)
+        if self._keep_in_memory:
+            self._key_index = index
+        return index
+
+    def _locked(self, operation: Callable[[], error_enums.Error]) -> error_enums.Error:
+        """Runs a read-modify-write operation while holding the database lock so that
+        concurrent `cmds` processes don't lose each other's updates
+
+        Args:
+            operation (Callable[[], error_enums.Error]): Operation to run
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        self._memory = None  # the operation may change the commands it reads
+        try:
+            with tracing.phase("locked update"), file_lock(self._db_path, self._lock_settings):
+                return operation()
+        except DatabaseLockError:
+            return error_enums.Error.DB_LOCK_ERROR
+
+    def _indexed(
+        self,
+        error: error_enums.Error,
+        removed: tuple[str, ...] = (),
+        added: tuple[str, ...] = (),
+        cleared: bool = False,
+    ) -> error_enums.Error:
+        """Applies a successful mutation to the key index used by fuzzy search
+
+        Args:
+            error (error_enums.Error): Error code of the mutation
+            removed (tuple[str, ...], optional): Removed keys. Defaults to ().
+            added (tuple[str, ...], optional): Keys added at the end of the database.
+            Defaults to ().
+            cleared (bool, optional): Whether all commands were deleted. Defaults to False.
+
+        Returns:
+            error_enums.Error: Returns error code of the mutation
+        """
+        if error == error_enums.Error.SUCCESS:
+            if cleared:
+                key_index.clear_index(self._db_path)
+            elif removed or added:
+                key_index.update_index(self._db_path, removed, added)
+
+        return error
 
     def list(self, limit: int) -> db_models.Commands:
         """Interface to get list of all stored commands from database
 
         Args:
             limit (int): Maximum no. of records to return. If `0`, then no filtering and
-            returns all results.
+            returns all results. Limited lists stop reading the database after `limit`
+            commands.
 
         Returns:
             db_models.Commands: Returns all commands model
         """
-        commands = self._db_handler.get_commands()
-
-        if limit > 0:
-            commands_temp = {}
-            idx = 0
-            for key, value in commands.commands.items():
-                commands_temp[key] = value
-                idx += 1
-                if idx == limit:
-                    break
-            filter_commands = db_models.Commands(commands=commands_temp, error=commands.error)
-            return filter_commands
-
-        return commands
-
-    def list_fuzzy(self, key: str, limit: int) -> db_models.Commands:
+        if limit <= 0 or self._keep_in_memory:
+            commands = self._get_commands()
+            if limit <= 0:
+                return commands
+            return db_models.Commands(commands=dict(itertools.islice(commands.commands.items(), limit)), error=commands.error)
+
+        with tracing.phase("read database"):
+            read_error, records = self._db_handler.iter_commands()
+            if read_error != error_enums.Error.SUCCESS:
+                return db_models.Commands(commands={}, error=read_error)
+            try:
+                limited = {command.key: command for command in itertools.islice(records, limit)}
+            except DatabaseReadError as error:
+                return db_models.Commands(commands={}, error=error.error)
+
+        return db_models.Commands(commands=limited, error=error_enums.Error.SUCCESS)
+
+    def list_fuzzy(self, key: str, limit: int, fields: Optional[Sequence[search_field_enums.SearchField]] = None) -> db_models.Commands:
         """Interface to get list of all stored commands from database
 
         Args:
             key (str): Key for fuzzy matching.
             limit (int): Maximum no. of records to return. If `0`, then no filtering and
             returns all results.
+            fields (Optional[Sequence[search_field_enums.SearchField]], optional): Fields
+            of the commands to match on. Defaults to only the key.
 
         Returns:
             db_models.Commands: Returns all commands model.
         """
-        commands = self._db_handler.get_commands()
+        commands = self._get_commands()
         fuzzy_commands = db_models.Commands(commands={}, error=commands.error)
 
-        choices = list(commands.commands.keys())
-        if limit == 0:
-            limit = len(choices)
-        extract_list = process.extract(key, choices, limit=limit)
+        if fields and list(fields) != [search_field_enums.SearchField.KEY]:
+            from command_storage.controller import fuzzy_search
 
-        for extract in extract_list:
-            _key = extract[0]
-            prob = extract[1]
-            if prob >= FUZZY_SEARCH_THRESHOLD:
+            rows = [(_key, command.command, command.description) for _key, command in commands.commands.items()]
+            with tracing.phase("fuzzy search"):
+                keys = fuzzy_search.search(key, rows, fields, limit)
+            for _key in keys:
                 fuzzy_commands.commands[_key] = commands.commands[_key]
 
+            return fuzzy_commands
+
+        from command_storage.controller import fuzzy_search
+
+        with tracing.phase("fuzzy search"):
+            keys = fuzzy_search.staged_search(key, commands.commands, limit, self._get_key_index)
+        for _key in keys:
+            fuzzy_commands.commands[_key] = commands.commands[_key]
+
         return fuzzy_commands
 
     def add(self, key: str, command: str, description: Optional[str]) -> db_models.Commands:
@@ -86,17 +227,29 @@ class Cmds:
         Returns:
             db_models.Commands: Returns updated list of commands stored.
         """
-        commands = self._db_handler.get_commands()
+        new_command = db_models.Command(key=key, command=command, description=description)
+        add_error = self._locked(lambda: self._indexed(self._db_handler.add_command(new_command), added=(key,)))
 
-        if key in commands.commands:
-            return db_models.Commands(commands={}, error=error_enums.Error.DUPLICATE_KEY_ERROR)
+        return db_models.Commands(commands={}, error=add_error)
 
-        new_command = db_models.Command(key=key, command=command, description=description)
+    def get(self, key: str) -> db_models.Commands:
+        """Interface to get a single stored command by its key
 
-        commands.commands[key] = new_command
-        commands = self._db_handler.write_commands(commands)
+        Args:
+            key (str): Key of the command
 
-        return commands
+        Returns:
+            db_models.Commands: Returns the command (if found) as commands model
+        """
+        if not self._keep_in_memory:
+            return self._db_handler.get_command(key)
+
+        commands = self._get_commands()
+        if commands.error != error_enums.Error.SUCCESS:
+            return commands
+        if key not in commands.commands:
+            return db_models.Commands(commands={}, error=error_enums.Error.NON_EXISTENT_KEY_ERROR)
+        return db_models.Commands(commands={key: commands.commands[key]}, error=error_enums.Error.SUCCESS)
 
     def export_json(self, all_commands: db_models.Commands, export_file: str) -> error_enums.Error:
         """Exports the json data into given export file
@@ -117,6 +270,102 @@ class Cmds:
         except OSError:  # Catch file IO problems
             return error_enums.Error.JSON_EXPORT_FILE_ERROR
 
+    def export(
+        self,
+        export_file: str,
+        file_format: file_format_enums.FileFormat,
+        compression: Optional[compression_enums.Compression] = None,
+    ) -> tuple[error_enums.Error, int]:
+        """Streams all stored commands into the export file without loading them into a
+        list first. Nothing is written if there are no commands.
+
+        Args:
+            export_file (str): File into which data needs to be exported, `-` for stdout
+            file_format (file_format_enums.FileFormat): Format of the file
+            compression (Optional[compression_enums.Compression], optional): Compression of
+            the file. Defaults to None.
+
+        Returns:
+            tuple[error_enums.Error, int]: Error code and no. of exported commands
+        """
+        from command_storage.controller import exporter
+
+        read_error, commands = self._db_handler.iter_commands()
+        if read_error != error_enums.Error.SUCCESS:
+            return read_error, 0
+
+        try:
+            first = next(commands, None)
+            if first is None:
+                return error_enums.Error.SUCCESS, 0
+
+            with tracing.phase("write export"), exporter.open_output(export_file, compression) as stream:
+                count = exporter.write_commands(stream, itertools.chain((first,), commands), file_format)
+            return error_enums.Error.SUCCESS, count
+        except DatabaseReadError as error:  # the export file is left incomplete
+            return error.error, 0
+        except OSError:  # Catch file IO problems
+            return error_enums.Error.JSON_EXPORT_FILE_ERROR, 0
+
+    def import_commands(
+        self,
+        commands: Iterable[db_models.Command],
+        policy: duplicate_policy_enums.DuplicatePolicy,
+        dry_run: bool = False,
+    ) -> import_summary_model.ImportSummary:
+        """Interface to store many commands into the database with a single write. Nothing
+        is stored if the import fails.
+
+        Args:
+            commands (Iterable[db_models.Command]): Commands to store, in order
+            policy (duplicate_policy_enums.DuplicatePolicy): What to do with commands whose
+            key is already stored, or was imported before. Overwritten commands keep their
+            position.
+            dry_run (bool, optional): Whether to only count what would be stored. Defaults
+            to False.
+
+        Returns:
+            import_summary_model.ImportSummary: Returns the error code and counts of the import
+        """
+        summary = import_summary_model.ImportSummary(error=error_enums.Error.SUCCESS)
+
+        def merge() -> error_enums.Error:
+            nonlocal summary
+            stored = self._db_handler.get_commands()
+            if stored.error != error_enums.Error.SUCCESS:
+                return stored.error
+
+            added: dict[str, None] = {}
+            overwritten = skipped = 0
+            for command in commands:
+                if command.key in stored.commands:
+                    if policy == duplicate_policy_enums.DuplicatePolicy.FAIL:
+                        summary = import_summary_model.ImportSummary(error=error_enums.Error.DUPLICATE_KEY_ERROR, duplicate_key=command.key)
+                        return summary.error
+                    if policy == duplicate_policy_enums.DuplicatePolicy.SKIP:
+                        skipped += 1
+                        continue
+                    if command.key not in added:
+                        overwritten += 1
+                else:
+                    added[command.key] = None
+                stored.commands[command.key] = command
+
+            summary = import_summary_model.ImportSummary(
+                error=error_enums.Error.SUCCESS,
+                imported=len(added),
+                overwritten=overwritten,
+                skipped=skipped,
+            )
+            if dry_run or (not added and not overwritten):
+                return summary.error
+            return self._indexed(self._db_handler.write_commands(stored).error, added=tuple(added))
+
+        import_error = self._locked(merge)
+        if import_error != summary.error:
+            return import_summary_model.ImportSummary(error=import_error)
+        return summary
+
     def update(self, orig_key: str, new_key: Optional[str], command: Optional[str], description: Optional[str]) -> error_enums.Error:
         """Allows updating an existing command including (optionally) its key
 
@@ -129,31 +378,14 @@ class Cmds:
         Returns:
             error_enums.Error: Returns error code of the operation
         """
-        commands = self._db_handler.get_commands()
-
-        if orig_key not in commands.commands:
-            return error_enums.Error.NON_EXISTENT_KEY_ERROR
-
-        command_obj = commands.commands[orig_key]
-
-        # Update command
-        if command is not None:
-            command_obj.command = command
-
-        # Update description
-        if description is not None:
-            command_obj.description = description
-
-        # Update the key
-        if new_key is not None:
-            # insert new key and remove old one
-            commands.commands.pop(orig_key)
-            commands.commands[new_key] = command_obj
-        else:
-            commands.commands[orig_key] = command_obj
-
-        commands = self._db_handler.write_commands(commands)
-        return commands.error
+        renamed = new_key is not None
+        return self._locked(
+            lambda: self._indexed(
+                self._db_handler.update_command(orig_key, new_key, command, description),
+                removed=(orig_key,) if renamed else (),
+                added=(new_key,) if renamed else (),
+            )
+        )
 
     def delete(self, key: Optional[str], delete_all: bool) -> error_enums.Error:
         """Allows deleting a stored command by it's key
@@ -168,17 +400,157 @@ class Cmds:
         # -- DELETE ALL DATA --
         if delete_all:
             empty_commands = db_models.Commands(commands={}, error=error_enums.Error.SUCCESS)
-            commands = self._db_handler.write_commands(empty_commands)
-            return commands.error
+            return self._locked(lambda: self._indexed(self._db_handler.write_commands(empty_commands).error, cleared=True))
 
-        commands = self._db_handler.get_commands()
+        return self._locked(lambda: self._indexed(self._db_handler.delete_command(key), removed=(key,)))
 
-        if key not in commands.commands:
-            return error_enums.Error.NON_EXISTENT_KEY_ERROR
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[Transaction]:
+        """Context manager applying many changes with a single read and a single write of
+        the database. The database lock is held for the whole transaction, the changes are
+        written when the context exits and nothing is written if it exits with an
+        exception. Check `Transaction.error` after the context for the outcome of the
+        commit.
+
+        Yields:
+            Iterator[Transaction]: Working copy of the stored commands
+        """
+        self._memory = None  # the transaction may change the commands it reads
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(tracing.phase("transaction"))
+            try:
+                stack.enter_context(file_lock(self._db_path, self._lock_settings))
+            except DatabaseLockError:
+                stored = db_models.Commands(commands={}, error=error_enums.Error.DB_LOCK_ERROR)
+            else:
+                stored = self._db_handler.get_commands()
+
+            transaction = Transaction(stored)
+            yield transaction  # an exception raised inside the context skips the commit
+
+            if transaction.error == error_enums.Error.SUCCESS and transaction.changed:
+                written = self._db_handler.write_commands(db_models.Commands(commands=transaction.commands, error=error_enums.Error.SUCCESS))
+                transaction.error = self._indexed(written.error, removed=tuple(transaction.removed), added=tuple(transaction.appended))
+
+    def add_many(self, commands: Iterable[db_models.Command]) -> error_enums.Error:
+        """Interface to store many new commands with a single write. Nothing is stored if a
+        key is already stored or given twice.
+
+        Args:
+            commands (Iterable[db_models.Command]): Commands to store, in order
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        with self.transaction() as transaction:
+            add_error = transaction.add_many(commands)
+        return add_error if add_error != error_enums.Error.SUCCESS else transaction.error
+
+    def delete_many(self, keys: Iterable[str]) -> error_enums.Error:
+        """Interface to delete many stored commands with a single write. Nothing is
+        deleted if a key isn't stored.
+
+        Args:
+            keys (Iterable[str]): Keys that need to be deleted
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        with self.transaction() as transaction:
+            delete_error = transaction.delete_many(keys)
+        return delete_error if delete_error != error_enums.Error.SUCCESS else transaction.error
+
+    def delete_matching(self, keys: Sequence[str], pattern: Optional[Pattern[str]] = None, dry_run: bool = False) -> tuple[error_enums.Error, List[str]]:
+        """Interface to delete the given keys and all keys matching a pattern with a single
+        read and a single write. Nothing is deleted if a given key isn't stored.
+
+        Args:
+            keys (Sequence[str]): Keys that need to be deleted
+            pattern (Optional[Pattern[str]], optional): Pattern whole keys are matched
+            against. Defaults to None.
+            dry_run (bool, optional): Whether to only select the keys. Defaults to False.
+
+        Returns:
+            tuple[error_enums.Error, List[str]]: Error code and the selected keys in
+            database order. The given keys that aren't stored for
+            `NON_EXISTENT_KEY_ERROR`.
+        """
+        with self.transaction() as transaction:
+            if transaction.error != error_enums.Error.SUCCESS:
+                return transaction.error, []
+
+            missing = [key for key in dict.fromkeys(keys) if key not in transaction.commands]
+            if missing:
+                return error_enums.Error.NON_EXISTENT_KEY_ERROR, missing
+
+            given = set(keys)
+            selected = [key for key in transaction.commands if key in given or (pattern is not None and pattern.fullmatch(key))]
+            if not dry_run:
+                transaction.delete_many(selected)
+
+        return transaction.error, selected
 
-        commands.commands.pop(key)
-        commands = self._db_handler.write_commands(commands)
-        return commands.error
+    def compact(self) -> error_enums.Error:
+        """Compacts the database, e.g. folds the log of the log-structured engine into its
+        snapshot
+
+        Returns:
+            error_enums.Error: Returns error code of operation
+        """
+        return self._locked(self._db_handler.compact)
+
+    def reshard(self, shards: int, shard_by: shard_by_enums.ShardBy) -> error_enums.Error:
+        """Redistributes the commands of a sharded database over a new set of shards
+
+        Args:
+            shards (int): No. of shards
+            shard_by (shard_by_enums.ShardBy): What keys are assigned to shards by
+
+        Returns:
+            error_enums.Error: Returns error code of operation
+        """
+        from command_storage.models.database.shard_wrapper import ShardedWrapper
+
+        if not isinstance(self._db_handler, ShardedWrapper):
+            return error_enums.Error.NOT_SHARDED_ERROR
+
+        handler = self._db_handler
+        return self._locked(lambda: self._indexed(handler.reshard(shards, shard_by), cleared=True))  # the database order changes
+
+    def check(self) -> error_enums.Error:
+        """Fully validates every stored command
+
+        Returns:
+            error_enums.Error: Returns error code of operation
+        """
+        return self._db_handler.check()
+
+    def clear_cache(self) -> error_enums.Error:
+        """Removes caches kept next to the database. They are rebuilt on the next read.
+
+        Returns:
+            error_enums.Error: Returns error code of operation
+        """
+
+        def clear_caches() -> error_enums.Error:
+            clear_error = self._db_handler.clear_cache()
+            if clear_error != error_enums.Error.SUCCESS:
+                return clear_error
+            return key_index.clear_index(self._db_path)
+
+        return self._locked(clear_caches)
+
+
+_warm_cmds: Optional[dict[tuple[Path, engine_enums.Engine, LockSettings, bool], Cmds]] = None
+
+
+def keep_cmds_warm() -> None:
+    """Makes `get_cmds` reuse one `Cmds` per configuration that keeps the commands and
+    the key index in memory. Used by `cmds daemon`, which serves many commands from one
+    process.
+    """
+    global _warm_cmds
+    _warm_cmds = {}
 
 
 def get_cmds() -> Cmds:
@@ -192,7 +564,11 @@ def get_cmds() -> Cmds:
         Cmds: Returns an instance of `Cmds`.
     """
     if config.CONFIG_FILE_PATH.exists():
-        db_path = get_database_path(config.CONFIG_FILE_PATH)
+        with tracing.phase("read config"):
+            db_path = get_database_path(config.CONFIG_FILE_PATH)
+            engine = get_database_engine(config.CONFIG_FILE_PATH)
+            lock_settings = get_lock_settings(config.CONFIG_FILE_PATH)
+            use_cache = get_cache_enabled(config.CONFIG_FILE_PATH)
     else:
         typer.secho(
             message=f"Config file: '{config.CONFIG_FILE_PATH}' not found. Please, run 'cmds init'",
@@ -201,7 +577,15 @@ def get_cmds() -> Cmds:
         raise typer.Exit(1)
 
     if db_path.exists():
-        return Cmds(db_path)
+        if _warm_cmds is None:
+            return Cmds(db_path, engine, lock_settings, use_cache)
+
+        # the config is read every time, so a re-initialized app is picked up
+        settings = (db_path, engine, lock_settings, use_cache)
+        if settings not in _warm_cmds:
+            _warm_cmds.clear()
+            _warm_cmds[settings] = Cmds(db_path, engine, lock_settings, use_cache, keep_in_memory=True)
+        return _warm_cmds[settings]
     else:
         typer.secho(
             message=f"Database file: '{db_path}' not found. Please, run 'cmds init'",
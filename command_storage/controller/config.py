@@ -4,6 +4,7 @@ from pathlib import Path
 import typer
 
 from command_storage.models.constants import APP_NAME
+from command_storage.models.enums import engine as engine_enums
 from command_storage.models.enums import error as error_enums
 
 CONFIG_DIR_PATH = Path(typer.get_app_dir(APP_NAME))
@@ -30,17 +31,19 @@ def _initialize_config_file() -> error_enums.Error:
     return error_enums.Error.SUCCESS
 
 
-def _create_database_config(db_path: Path) -> error_enums.Error:
+def _create_database_config(db_path: Path, engine: engine_enums.Engine, use_cache: bool) -> error_enums.Error:
     """Creates database config in the config file
 
     Args:
         db_path (Path): Path for database file
+        engine (engine_enums.Engine): Storage engine of the database
+        use_cache (bool): Whether to keep a snapshot cache of the parsed database
 
     Returns:
         error_enums.Error: Returns the error code
     """
     config_parser = configparser.ConfigParser()
-    config_parser["General"] = {"database": str(db_path)}
+    config_parser["General"] = {"database": str(db_path), "engine": engine.value, "cache": str(use_cache).lower()}
 
     try:
         with CONFIG_FILE_PATH.open("w") as file:
@@ -51,11 +54,15 @@ def _create_database_config(db_path: Path) -> error_enums.Error:
     return error_enums.Error.SUCCESS
 
 
-def initialize_app(db_path: Path) -> error_enums.Error:
+def initialize_app(db_path: Path, engine: engine_enums.Engine = engine_enums.Engine.JSON, use_cache: bool = True) -> error_enums.Error:
     """Initializes the Cmds application
 
     Args:
         db_path (Path): DB path for database file
+        engine (engine_enums.Engine, optional): Storage engine of the database. Defaults
+        to `engine_enums.Engine.JSON`.
+        use_cache (bool, optional): Whether to keep a snapshot cache of the parsed
+        database. Defaults to True.
 
     Returns:
         error_enums.Error: Returns the error code
@@ -64,7 +71,7 @@ def initialize_app(db_path: Path) -> error_enums.Error:
     if config_code != error_enums.Error.SUCCESS:
         return config_code
 
-    database_code = _create_database_config(db_path)
+    database_code = _create_database_config(db_path, engine, use_cache)
     if database_code != error_enums.Error.SUCCESS:
         return database_code
 
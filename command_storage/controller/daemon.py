@@ -0,0 +1,146 @@
+"""Server of `cmds daemon`.
+
+The daemon runs the regular `cmds` command line application for every request, in-process
+and one request at a time, with `get_cmds` returning a warm `Cmds` that keeps the commands
+and the key index in memory. The memory is checked against the database files on every
+request, so edits by other processes are picked up.
+"""
+
+import contextlib
+import io
+import os
+import signal
+import socket
+import socketserver
+import sys
+import traceback
+from pathlib import Path
+from typing import Any
+
+from command_storage.controller import app as app_controller
+from command_storage.models import daemon_protocol
+from command_storage.models.constants import APP_NAME
+from command_storage.models.enums import error as error_enums
+
+
+def run_command(request: dict[str, Any]) -> dict[str, Any]:
+    """Runs a forwarded command line and captures its output
+
+    Args:
+        request (dict[str, Any]): Request sent by the client
+
+    Returns:
+        dict[str, Any]: Response holding stdout, stderr and the exit code
+    """
+    from command_storage.views.cli import app as cli_app
+
+    argv = request.get("argv")
+    if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv) or not daemon_protocol.is_forwarded(argv):
+        return {"stdout": "", "stderr": "Command is not served by the daemon.\n", "code": 2}
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    cwd, columns = os.getcwd(), os.environ.get("COLUMNS")
+    try:
+        os.chdir(request.get("cwd") or cwd)
+        os.environ["COLUMNS"] = str(request.get("columns") or 80)
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                cli_app(args=argv, prog_name=APP_NAME, color=bool(request.get("color")))
+                code = 0
+            except SystemExit as exit:
+                code = exit.code if isinstance(exit.code, int) else int(exit.code is not None)
+            except Exception:  # keep serving, report like an uncaught error in-process would
+                traceback.print_exc()
+                code = 1
+    except OSError as error:  # e.g. working directory of the client is gone
+        stderr.write(f"{error}\n")
+        code = 1
+    finally:
+        os.chdir(cwd)
+        if columns is None:
+            os.environ.pop("COLUMNS", None)
+        else:
+            os.environ["COLUMNS"] = columns
+
+    return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "code": code}
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """Serves one forwarded command line per connection"""
+
+    def handle(self) -> None:
+        try:
+            request = daemon_protocol.receive_message(self.request)
+        except (OSError, ValueError):  # client went away or sent garbage
+            return
+
+        response = run_command(request)
+        with contextlib.suppress(OSError):
+            daemon_protocol.send_message(self.request, response)
+
+
+def is_running(socket_path: Path) -> bool:
+    """Returns whether a daemon is listening on the socket
+
+    Args:
+        socket_path (Path): Path of the daemon socket
+
+    Returns:
+        bool: Whether the socket accepts connections
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(socket_path))
+            return True
+        except OSError:
+            return False
+
+
+def create_server(socket_path: Path) -> tuple[error_enums.Error, Any]:
+    """Creates the daemon server listening on the socket. Only the current user can
+    connect to it.
+
+    Args:
+        socket_path (Path): Path of the daemon socket
+
+    Returns:
+        tuple[error_enums.Error, Any]: Error code and the `socketserver.UnixStreamServer`
+        (`None` on errors)
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return error_enums.Error.DAEMON_SOCKET_ERROR, None
+
+    if is_running(socket_path):
+        return error_enums.Error.DAEMON_RUNNING_ERROR, None
+
+    app_controller.keep_cmds_warm()
+    umask = os.umask(0o177)
+    try:
+        socket_path.unlink(missing_ok=True)  # left behind by a daemon that was killed
+        server = socketserver.UnixStreamServer(str(socket_path), _RequestHandler)
+    except OSError:
+        return error_enums.Error.DAEMON_SOCKET_ERROR, None
+    finally:
+        os.umask(umask)
+
+    return error_enums.Error.SUCCESS, server
+
+
+def serve(server: Any, socket_path: Path) -> None:
+    """Serves requests until interrupted or terminated and removes the socket afterwards
+
+    Args:
+        server (Any): Server returned by `create_server`
+        socket_path (Path): Path of the daemon socket
+    """
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        with server:
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        socket_path.unlink(missing_ok=True)
@@ -0,0 +1,152 @@
+"""Streaming writers of the files `cmds export` writes.
+
+Commands are written one by one as the storage engine yields them, so no list of all
+records is built. JSON files hold an indented list of commands, the format `cmds export`
+always wrote, NDJSON files hold one compact command per line and CSV files have a `key`,
+`command` and `description` column. Every format can be gzip compressed on the fly.
+"""
+
+import contextlib
+import csv
+import gzip
+import io
+import sys
+from json.encoder import encode_basestring_ascii
+from typing import IO, Callable, Iterable, Iterator, Optional
+
+from command_storage.models.database import db_models
+from command_storage.models.enums import compression as compression_enums
+from command_storage.models.enums import file_format as file_format_enums
+
+_STDOUT = "-"
+
+# records are formatted from templates, which is several times faster than calling
+# `json.dumps` per record and gives the very same output
+_JSON_RECORD = '\n    {\n        "key": %s,\n        "command": %s,\n        "description": %s\n    }'
+_NDJSON_RECORD = '{"key":%s,"command":%s,"description":%s}\n'
+
+
+def _quote(value: Optional[str]) -> str:
+    """Returns the value as a JSON literal
+
+    Args:
+        value (Optional[str]): String to encode
+
+    Returns:
+        str: JSON string, `null` for `None`
+    """
+    return "null" if value is None else encode_basestring_ascii(value)
+
+
+@contextlib.contextmanager
+def open_output(file: str, compression: Optional[compression_enums.Compression]) -> Iterator[IO[str]]:
+    """Opens the file to export to as a text stream
+
+    Args:
+        file (str): Path of the file, `-` for stdout
+        compression (Optional[compression_enums.Compression]): Compression of the file
+
+    Raises:
+        OSError: Raised if the file can't be written
+
+    Yields:
+        Iterator[IO[str]]: Stream to write to
+    """
+    if file == _STDOUT:
+        sys.stdout.flush()
+        binary = sys.stdout.buffer
+    else:
+        binary = open(file, "wb")
+
+    try:
+        compressed = gzip.GzipFile(fileobj=binary, mode="wb") if compression == compression_enums.Compression.GZIP else None
+        stream = io.TextIOWrapper(compressed or binary, encoding="utf-8", newline="")
+        try:
+            yield stream
+        finally:
+            stream.detach()  # flushes without closing stdout
+        if compressed is not None:
+            compressed.close()  # writes the gzip trailer, leaves `binary` open
+        binary.flush()
+    finally:
+        if binary is not sys.stdout.buffer:
+            binary.close()
+
+
+def _write_json(stream: IO[str], commands: Iterable[db_models.Command]) -> int:
+    """Writes the commands as an indented JSON list, exactly like `json.dump(..., indent=4)`
+    of all of them would
+
+    Args:
+        stream (IO[str]): Stream to write to
+        commands (Iterable[db_models.Command]): Commands to write
+
+    Returns:
+        int: No. of written commands
+    """
+    count = 0
+    stream.write("[")
+    for command in commands:
+        if count:
+            stream.write(",")
+        stream.write(_JSON_RECORD % (_quote(command.key), _quote(command.command), _quote(command.description)))
+        count += 1
+    stream.write("\n]" if count else "]")
+    return count
+
+
+def _write_ndjson(stream: IO[str], commands: Iterable[db_models.Command]) -> int:
+    """Writes the commands as one compact JSON object per line
+
+    Args:
+        stream (IO[str]): Stream to write to
+        commands (Iterable[db_models.Command]): Commands to write
+
+    Returns:
+        int: No. of written commands
+    """
+    count = 0
+    for command in commands:
+        stream.write(_NDJSON_RECORD % (_quote(command.key), _quote(command.command), _quote(command.description)))
+        count += 1
+    return count
+
+
+def _write_csv(stream: IO[str], commands: Iterable[db_models.Command]) -> int:
+    """Writes the commands as CSV with a header. Missing descriptions are written empty.
+
+    Args:
+        stream (IO[str]): Stream to write to
+        commands (Iterable[db_models.Command]): Commands to write
+
+    Returns:
+        int: No. of written commands
+    """
+    count = 0
+    writer = csv.writer(stream)
+    writer.writerow(("key", "command", "description"))
+    for command in commands:
+        writer.writerow((command.key, command.command, command.description or ""))
+        count += 1
+    return count
+
+
+_WRITERS: dict[file_format_enums.FileFormat, Callable[[IO[str], Iterable[db_models.Command]], int]] = {
+    file_format_enums.FileFormat.JSON: _write_json,
+    file_format_enums.FileFormat.NDJSON: _write_ndjson,
+    file_format_enums.FileFormat.CSV: _write_csv,
+}
+
+
+def write_commands(stream: IO[str], commands: Iterable[db_models.Command], file_format: file_format_enums.FileFormat) -> int:
+    """Writes the commands in the given format
+
+    Args:
+        stream (IO[str]): Stream to write to
+        commands (Iterable[db_models.Command]): Commands to write, in order
+        file_format (file_format_enums.FileFormat): Format to write
+
+    Returns:
+        int: No. of written commands
+    """
+    return _WRITERS[file_format](stream, commands)
@@ -0,0 +1,207 @@
+"""Fuzzy search over the stored commands.
+
+Searching keys is staged. A key equal to the query comes first, keys starting with the
+query are scored next and the remaining keys are scored last, grouped by the best score
+their length allows. Every stage feeds one bounded heap and a group is skipped once none
+of its keys can beat the current k-th match.
+
+Searching several fields splits the corpus into chunks that are scored independently,
+each keeping its own top results. The per-chunk results are merged with a heap. Large
+corpora are scored in a process pool, one chunk per CPU, while small ones are scored
+in-process to avoid the cost of starting the pool.
+"""
+
+import bisect
+import heapq
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+from command_storage.models.constants import (
+    FUZZY_POOL_MIN_COMMANDS,
+    FUZZY_SEARCH_THRESHOLD,
+)
+from command_storage.models.database import key_index
+from command_storage.models.enums import search_field as search_field_enums
+
+Row = tuple[str, str, Optional[str]]  # key, command and description of a command
+Match = tuple[int, int, str]  # negated score, position in the database and key
+
+_LAST_CHARACTER = "\U0010ffff"  # sorts after every character, bounds the keys with a prefix
+
+
+def score_upper_bound(query_length: int, key_length: int) -> int:
+    """Returns the best `WRatio` score two strings of these (processed) lengths can have.
+    `WRatio` only compares whole strings if their lengths are similar and scales down
+    the partial matches of strings with very different lengths.
+
+    Args:
+        query_length (int): Length of the processed query
+        key_length (int): Length of the processed key
+
+    Returns:
+        int: Upper bound of the score
+    """
+    if not query_length or not key_length:
+        return 0
+
+    length_ratio = max(query_length, key_length) / min(query_length, key_length)
+    if length_ratio < 1.5:
+        return 100
+    if length_ratio <= 8:
+        return 90
+    return 60
+
+
+def staged_search(
+    query: str,
+    commands: Mapping[str, Any],
+    limit: int,
+    get_index: Callable[[list[str]], Optional[key_index.KeyIndex]] = lambda keys: None,
+) -> list[str]:
+    """Returns the keys matching the query, best first. A key equal to the query comes
+    first, the others follow by score and keys with the same score keep their database
+    order.
+
+    Args:
+        query (str): Search query
+        commands (Mapping[str, Any]): All commands by key in database order
+        limit (int): Maximum no. of keys to return. If `0`, returns all matching keys.
+        get_index (Callable[[list[str]], Optional[key_index.KeyIndex]], optional): Returns
+        the index of the keys used to find keys starting with the query and to shortlist
+        the others. Only called if the key itself isn't enough. Defaults to no index.
+
+    Returns:
+        list[str]: Keys of the matching commands
+    """
+    # Stage 1: the key itself
+    exact = [query] if query in commands else []
+    if exact and limit == 1:
+        return exact
+
+    from thefuzz import process, utils
+
+    processed_query = utils.full_process(utils.full_process(query), force_ascii=True)
+    if not processed_query:  # every other key scores 0
+        return exact
+
+    keys = list(commands)
+    index = get_index(keys)
+
+    # Stage 2: keys starting with the query
+    sorted_keys = index.sorted_keys() if index is not None else sorted(keys)
+    start = bisect.bisect_left(sorted_keys, query)
+    prefixed = set(sorted_keys[start : bisect.bisect_left(sorted_keys, query + _LAST_CHARACTER, start)])
+    prefixed.discard(query)
+
+    # Stage 3: the other keys, grouped by the best score their length allows
+    shortlist = index.shortlist(query) if index is not None else None
+    positions = dict(zip(keys, itertools.count()))
+    groups: dict[int, list[str]] = {}
+    bounds: dict[int, int] = {}
+    for key in keys if shortlist is None else shortlist:
+        if key in prefixed or key == query:
+            continue
+
+        if key.isascii() and key[:1].isalnum() and key[-1:].isalnum():
+            key_length = len(key)  # processing keeps the length of such keys
+        else:
+            key_length = len(utils.full_process(key, force_ascii=True))
+        bound = bounds.get(key_length)
+        if bound is None:
+            bound = bounds[key_length] = score_upper_bound(len(processed_query), key_length)
+        if bound >= FUZZY_SEARCH_THRESHOLD:
+            groups.setdefault(bound, []).append(key)
+
+    heap_size = limit - len(exact) if limit > 0 else 0
+    best: list[tuple[int, int, str]] = []  # min-heap of score, negated position and key
+
+    def score(candidates: list[str], bound: int) -> None:
+        """Pushes the candidates that can still make it into the heap"""
+        cutoff = FUZZY_SEARCH_THRESHOLD
+        if heap_size and len(best) == heap_size:
+            kth_score, kth_position = best[0][0], -best[0][1]
+            if kth_score > bound:
+                return
+            cutoff = kth_score
+            if kth_score == bound:  # only earlier keys win a tie
+                candidates = [key for key in candidates if positions[key] < kth_position]
+
+        # scores are rounded after the cutoff is applied, keep everything rounding up to the cutoff
+        for key, key_score in process.extractBests(query, candidates, score_cutoff=cutoff - 0.5, limit=None):
+            item = (key_score, -positions[key], key)
+            if heap_size and len(best) == heap_size:
+                heapq.heappushpop(best, item)
+            else:
+                heapq.heappush(best, item)
+
+    score(list(prefixed), 100)
+    for bound in sorted(groups, reverse=True):
+        score(groups[bound], bound)
+
+    return exact + [key for _, _, key in sorted(best, reverse=True)]
+
+
+def score_chunk(query: str, rows: Sequence[Row], fields: Sequence[search_field_enums.SearchField], offset: int, limit: int) -> list[Match]:
+    """Scores a chunk of commands. The score of a command is the best score of its
+    fields.
+
+    Args:
+        query (str): Search query
+        rows (Sequence[Row]): Commands of the chunk
+        fields (Sequence[search_field_enums.SearchField]): Fields to match on
+        offset (int): Position of the first command of the chunk in the database
+        limit (int): Maximum no. of matches to return. If `0`, returns all matches.
+
+    Returns:
+        list[Match]: Matches at or above `FUZZY_SEARCH_THRESHOLD`, best first
+    """
+    from thefuzz import process
+
+    columns = {
+        search_field_enums.SearchField.KEY: 0,
+        search_field_enums.SearchField.COMMAND: 1,
+        search_field_enums.SearchField.DESCRIPTION: 2,
+    }
+
+    best: dict[int, int] = {}
+    for field in fields:
+        column = columns[field]
+        texts = {idx: row[column] for idx, row in enumerate(rows) if row[column]}
+        # scores are rounded after the cutoff is applied, keep everything rounding up to the threshold
+        for _, score, idx in process.extractBests(query, texts, score_cutoff=FUZZY_SEARCH_THRESHOLD - 0.5, limit=None):
+            if score >= FUZZY_SEARCH_THRESHOLD and score > best.get(idx, -1):
+                best[idx] = score
+
+    matches = [(-score, offset + idx, rows[idx][0]) for idx, score in best.items()]
+    if limit > 0:
+        return heapq.nsmallest(limit, matches)
+    return sorted(matches)
+
+
+def search(query: str, rows: Sequence[Row], fields: Sequence[search_field_enums.SearchField], limit: int) -> list[str]:
+    """Returns the keys of the best matching commands, best first. Commands with the same
+    score keep their database order.
+
+    Args:
+        query (str): Search query
+        rows (Sequence[Row]): All commands in database order
+        fields (Sequence[search_field_enums.SearchField]): Fields to match on
+        limit (int): Maximum no. of keys to return. If `0`, returns all matching keys.
+
+    Returns:
+        list[str]: Keys of the matching commands
+    """
+    workers = os.cpu_count() or 1
+    if len(rows) < FUZZY_POOL_MIN_COMMANDS or workers == 1:
+        return [key for _, _, key in score_chunk(query, rows, fields, 0, limit)]
+
+    chunk_size = -(-len(rows) // workers)
+    offsets = range(0, len(rows), chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(score_chunk, query, rows[offset : offset + chunk_size], fields, offset, limit) for offset in offsets]
+        chunk_matches = [future.result() for future in futures]
+
+    merged = heapq.merge(*chunk_matches)
+    return [key for _, _, key in itertools.islice(merged, limit or None)]
@@ -0,0 +1,231 @@
+"""Streaming readers of the files `cmds import` takes.
+
+Files are read record by record, so a large file is never held in memory as a whole
+before its commands are built. JSON files hold a list of commands, the format
+`cmds export` writes, NDJSON files hold one command per line and CSV files have a
+`key`, `command` and optional `description` column. Files with a `.gz` extension are
+decompressed while reading. Records are validated in batches of
+`IMPORT_BATCH_SIZE`.
+"""
+
+import csv
+import gzip
+import io
+import json
+import sys
+from pathlib import Path
+from typing import IO, Any, Callable, Iterator, Optional
+
+from command_storage.models.constants import IMPORT_BATCH_SIZE
+from command_storage.models.database import db_models, json_stream
+from command_storage.models.enums import file_format as file_format_enums
+
+_STDIN = "-"
+_GZIP_SUFFIX = ".gz"
+
+_FORMATS_BY_SUFFIX = {
+    ".json": file_format_enums.FileFormat.JSON,
+    ".ndjson": file_format_enums.FileFormat.NDJSON,
+    ".jsonl": file_format_enums.FileFormat.NDJSON,
+    ".csv": file_format_enums.FileFormat.CSV,
+}
+
+
+class ImportFileError(Exception):
+    """Raised if the file to import can't be read or holds an invalid command"""
+
+
+def is_compressed(file: str) -> bool:
+    """Returns whether the file is gzip compressed judging by its extension
+
+    Args:
+        file (str): Path of the file
+
+    Returns:
+        bool: Whether the file has a `.gz` extension
+    """
+    return Path(file).suffix.lower() == _GZIP_SUFFIX
+
+
+def detect_format(file: str) -> Optional[file_format_enums.FileFormat]:
+    """Returns the format of the file guessed from its extension, ignoring a `.gz`
+    extension
+
+    Args:
+        file (str): Path of the file
+
+    Returns:
+        Optional[file_format_enums.FileFormat]: Format of the file, `None` if unknown
+    """
+    path = Path(file)
+    if is_compressed(file):
+        path = path.with_suffix("")
+    return _FORMATS_BY_SUFFIX.get(path.suffix.lower())
+
+
+class _CountingReader(io.RawIOBase):
+    """Binary reader reporting the no. of bytes read to a callback"""
+
+    def __init__(self, raw: IO[bytes], progress: Callable[[int], None]) -> None:
+        """Initializer for `_CountingReader`
+
+        Args:
+            raw (IO[bytes]): Reader to read from
+            progress (Callable[[int], None]): Called with the no. of bytes of every read
+        """
+        self._raw = raw
+        self._progress = progress
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._raw.read(len(buffer))
+        buffer[: len(data)] = data
+        self._progress(len(data))
+        return len(data)
+
+
+def _iter_json(stream: IO[str]) -> Iterator[Any]:
+    """Yields the items of a JSON list without parsing the whole list at once
+
+    Args:
+        stream (IO[str]): File holding the list
+
+    Raises:
+        ImportFileError: Raised if the file doesn't hold a valid JSON list
+
+    Yields:
+        Iterator[Any]: Parsed items
+    """
+    reader = json_stream.JsonStream(stream)
+    if not reader.skip("["):
+        raise ImportFileError("JSON file doesn't hold a list of commands")
+
+    item_no = 0
+    while not reader.skip("]"):
+        if item_no and not reader.skip(","):
+            raise ImportFileError(f"Invalid JSON after command no. {item_no}")
+        try:
+            item = reader.decode()
+        except json.JSONDecodeError as error:
+            raise ImportFileError(f"Invalid JSON in command no. {item_no + 1}: {error.msg}") from error
+        item_no += 1
+        yield item
+
+    if reader.peek():
+        raise ImportFileError("Unexpected data after the list of commands")
+
+
+def _iter_ndjson(stream: IO[str]) -> Iterator[Any]:
+    """Yields the items of a file holding one JSON value per line. Blank lines are skipped.
+
+    Args:
+        stream (IO[str]): File to read
+
+    Raises:
+        ImportFileError: Raised if a line isn't valid JSON
+
+    Yields:
+        Iterator[Any]: Parsed items
+    """
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ImportFileError(f"Invalid JSON on line {line_no}: {error.msg}") from error
+
+
+def _iter_csv(stream: IO[str]) -> Iterator[Any]:
+    """Yields the rows of a CSV file with a header. Empty descriptions are read as no
+    description.
+
+    Args:
+        stream (IO[str]): File to read
+
+    Raises:
+        ImportFileError: Raised if the header lacks the `key` or `command` column
+
+    Yields:
+        Iterator[Any]: Rows by column name
+    """
+    reader = csv.DictReader(stream)
+    if not {"key", "command"}.issubset(reader.fieldnames or ()):
+        raise ImportFileError("CSV file needs a header with 'key' and 'command' columns")
+
+    for row in reader:
+        yield {"key": row["key"], "command": row["command"], "description": row.get("description") or None}
+
+
+_READERS = {
+    file_format_enums.FileFormat.JSON: _iter_json,
+    file_format_enums.FileFormat.NDJSON: _iter_ndjson,
+    file_format_enums.FileFormat.CSV: _iter_csv,
+}
+
+
+def _validate(batch: list[Any], first_no: int) -> list[db_models.Command]:
+    """Validates a batch of records
+
+    Args:
+        batch (list[Any]): Parsed records
+        first_no (int): No. of the first record of the batch in the file, starting at 1
+
+    Raises:
+        ImportFileError: Raised if a record isn't a valid command
+
+    Returns:
+        list[db_models.Command]: Commands of the records
+    """
+    from pydantic import TypeAdapter, ValidationError
+
+    try:
+        return TypeAdapter(list[db_models.Command]).validate_python(batch)
+    except ValidationError as error:
+        details = error.errors()[-1]  # the earlier ones are about the input not being a `Command` already
+        record_no, _, *fields = details["loc"]
+        field = f"{'.'.join(map(str, fields))}: " if fields else ""
+        raise ImportFileError(f"Invalid command no. {first_no + int(record_no)}: {field}{details['msg']}") from error
+
+
+def read_commands(file: str, file_format: file_format_enums.FileFormat, progress: Callable[[int], None] = lambda size: None) -> Iterator[db_models.Command]:
+    """Yields the commands stored in the file
+
+    Args:
+        file (str): Path of the file, `-` for stdin
+        file_format (file_format_enums.FileFormat): Format of the file
+        progress (Callable[[int], None], optional): Called with the no. of bytes of every
+        read from the file. Defaults to no reporting.
+
+    Raises:
+        ImportFileError: Raised if the file can't be read or holds an invalid command
+
+    Yields:
+        Iterator[db_models.Command]: Commands in file order
+    """
+    try:
+        raw = sys.stdin.buffer if file == _STDIN else open(file, "rb")
+    except OSError as error:
+        raise ImportFileError(f"Can't read {file}: {error.strerror}") from error
+
+    binary: IO[bytes] = io.BufferedReader(_CountingReader(raw, progress))
+    if is_compressed(file):
+        binary = gzip.GzipFile(fileobj=binary, mode="rb")
+    stream = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+    try:
+        batch: list[Any] = []
+        record_no = 1
+        for record in _READERS[file_format](stream):
+            batch.append(record)
+            if len(batch) == IMPORT_BATCH_SIZE:
+                yield from _validate(batch, record_no)
+                record_no += len(batch)
+                batch = []
+        yield from _validate(batch, record_no)
+    except (OSError, EOFError, UnicodeDecodeError, csv.Error) as error:
+        raise ImportFileError(f"Can't read {file}: {error}") from error
+    finally:
+        if raw is not sys.stdin.buffer:
+            raw.close()
@@ -0,0 +1,169 @@
+from typing import Iterable, Optional
+
+from command_storage.models.database import db_models
+from command_storage.models.enums import error as error_enums
+
+
+class Transaction:
+    """Working copy of the stored commands that many changes are applied to before they
+    are written with a single write. Created by `Cmds.transaction`, which commits it.
+
+    Failed operations change nothing and return their error. Raise an exception inside the
+    transaction to roll back all of its changes.
+    """
+
+    def __init__(self, stored: db_models.Commands) -> None:
+        """Initializer for `Transaction`
+
+        Args:
+            stored (db_models.Commands): Commands read at the start of the transaction.
+            All operations fail with its error code if reading failed.
+        """
+        self.error = stored.error  # error code of the read at the start and, once committed, of the commit
+        self.commands = stored.commands  # the working copy, in database order
+        self.removed: dict[str, None] = {}  # stored keys removed or moved to the end of the database
+        self.appended: dict[str, None] = {}  # keys added at the end of the database, in order
+        self.changed = False
+
+    def _remove(self, key: str) -> db_models.Command:
+        """Removes a command from the working copy and records it for the key index
+
+        Args:
+            key (str): Key of a command in the working copy
+
+        Returns:
+            db_models.Command: Removed command
+        """
+        if key in self.appended:
+            self.appended.pop(key)
+        else:
+            self.removed[key] = None
+        return self.commands.pop(key)
+
+    def _append(self, command: db_models.Command) -> None:
+        """Adds a command at the end of the working copy and records it for the key index
+
+        Args:
+            command (db_models.Command): Command whose key isn't in the working copy
+        """
+        self.commands[command.key] = command
+        self.appended[command.key] = None
+        self.changed = True
+
+    def get(self, key: str) -> db_models.Commands:
+        """Returns a command of the working copy, including changes of the transaction
+
+        Args:
+            key (str): Key of the command
+
+        Returns:
+            db_models.Commands: Returns the command (if found) as commands model
+        """
+        if self.error != error_enums.Error.SUCCESS:
+            return db_models.Commands(commands={}, error=self.error)
+        if key not in self.commands:
+            return db_models.Commands(commands={}, error=error_enums.Error.NON_EXISTENT_KEY_ERROR)
+        return db_models.Commands(commands={key: self.commands[key]}, error=error_enums.Error.SUCCESS)
+
+    def add(self, key: str, command: str, description: Optional[str]) -> error_enums.Error:
+        """Stores a new command
+
+        Args:
+            key (str): Key for the new command to be stored.
+            command (str): Command to be stored.
+            description (Optional[str]): Description for command to be stored.
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        return self.add_many([db_models.Command(key=key, command=command, description=description)])
+
+    def add_many(self, commands: Iterable[db_models.Command]) -> error_enums.Error:
+        """Stores new commands, all of them or none if a key is already stored or given
+        twice
+
+        Args:
+            commands (Iterable[db_models.Command]): Commands to store, in order
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        if self.error != error_enums.Error.SUCCESS:
+            return self.error
+
+        new_commands: dict[str, db_models.Command] = {}
+        for command in commands:
+            if command.key in self.commands or command.key in new_commands:
+                return error_enums.Error.DUPLICATE_KEY_ERROR
+            new_commands[command.key] = command
+
+        for command in new_commands.values():
+            self._append(command)
+        return error_enums.Error.SUCCESS
+
+    def update(self, orig_key: str, new_key: Optional[str], command: Optional[str], description: Optional[str]) -> error_enums.Error:
+        """Updates an existing command including (optionally) its key. A renamed command
+        moves to the end of the database, as with `Cmds.update`.
+
+        Args:
+            orig_key (str): Key for which update needs to happen
+            new_key (Optional[str]): New key if key needs to be changed
+            command (Optional[str]): New command
+            description (Optional[str]): New description
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        if self.error != error_enums.Error.SUCCESS:
+            return self.error
+        if orig_key not in self.commands:
+            return error_enums.Error.NON_EXISTENT_KEY_ERROR
+
+        stored = self.commands[orig_key]
+        updated = db_models.Command(
+            key=orig_key if new_key is None else new_key,
+            command=stored.command if command is None else command,
+            description=stored.description if description is None else description,
+        )  # a new record, so the commands read at the start stay untouched for a rollback
+        if new_key is None:
+            self.commands[orig_key] = updated
+            self.changed = True
+        else:
+            self._remove(orig_key)
+            if new_key in self.commands:  # a rename onto a stored key replaces it, as with `Cmds.update`
+                self._remove(new_key)
+            self._append(updated)
+        return error_enums.Error.SUCCESS
+
+    def delete(self, key: str) -> error_enums.Error:
+        """Deletes a stored command by its key
+
+        Args:
+            key (str): Key that needs to be deleted
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        return self.delete_many([key])
+
+    def delete_many(self, keys: Iterable[str]) -> error_enums.Error:
+        """Deletes stored commands by their keys, all of them or none if a key isn't
+        stored
+
+        Args:
+            keys (Iterable[str]): Keys that need to be deleted
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        if self.error != error_enums.Error.SUCCESS:
+            return self.error
+
+        unique_keys = dict.fromkeys(keys)
+        if any(key not in self.commands for key in unique_keys):
+            return error_enums.Error.NON_EXISTENT_KEY_ERROR
+
+        for key in unique_keys:
+            self._remove(key)
+        self.changed = self.changed or bool(unique_keys)
+        return error_enums.Error.SUCCESS
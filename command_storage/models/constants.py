@@ -1,4 +1,18 @@
+from pathlib import Path
+
 APP_NAME: str = "cmds"
 VERSION: str = "0.1.3"
 FUZZY_SEARCH_THRESHOLD = 70
+FUZZY_INDEX_MIN_COMMANDS = 1000  # stores with fewer commands are fuzzy searched without the key index
+FUZZY_POOL_MIN_COMMANDS = 20000  # multi-field fuzzy search of smaller stores stays in a single process
 DEFAULT_LIST_LIMIT = 5
+DEFAULT_DB_FILE_PATH = Path.home().joinpath("." + Path.home().stem + "_cmds.json")
+LOG_COMPACTION_RATIO = 1.0  # compact once the log is larger than the snapshot by this ratio
+LOG_COMPACTION_MIN_BYTES = 64 * 1024
+LOCK_RETRIES = 100  # attempts to take the database lock before giving up
+LOCK_BACKOFF_SECONDS = 0.005  # first wait between attempts, doubled up to the maximum
+LOCK_MAX_BACKOFF_SECONDS = 0.2
+IMPORT_BATCH_SIZE = 1000  # imported records validated at once
+IMPORT_PROGRESS_MIN_BYTES = 1024 * 1024  # smaller files are imported without a progress bar
+DEFAULT_SHARD_COUNT = 16  # shard files of a new `sharded` database
+LIST_PAGE_SIZE = 100  # rows of a `cmds list` table laid out at once, the first page fixes the column widths
@@ -0,0 +1,77 @@
+"""Protocol spoken between `cmds` and `cmds daemon` over a Unix domain socket.
+
+A request is a single JSON message holding the command line arguments together with the
+working directory and terminal settings of the client. The response holds what the
+command wrote to stdout and stderr and its exit code. Every message is closed by shutting
+down the writing side of the connection. This module is imported by the `cmds` entry point
+before anything else and must only use the standard library.
+"""
+
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any
+
+DAEMON_SOCKET_ENV = "CMDS_SOCKET"
+
+# subcommands the daemon serves, anything else (and interactive options or stdio as a file) runs in-process
+FORWARDED_COMMANDS = frozenset({"list", "get", "copy", "store", "update", "delete", "export"})
+LOCAL_OPTIONS = frozenset({"-a", "--all", "--help", "-", "-si", "--from-stdin"})
+
+
+def get_socket_path() -> Path:
+    """Returns the path of the daemon socket
+
+    Returns:
+        Path: `$CMDS_SOCKET` if set, else `.cmds.sock` in the home directory
+    """
+    return Path(os.environ.get(DAEMON_SOCKET_ENV) or Path.home() / ".cmds.sock")
+
+
+def is_forwarded(argv: list[str]) -> bool:
+    """Returns whether the daemon can serve the command line
+
+    Args:
+        argv (list[str]): Command line arguments without the program name
+
+    Returns:
+        bool: Whether the command line can be forwarded to the daemon
+    """
+    return bool(argv) and argv[0] in FORWARDED_COMMANDS and not LOCAL_OPTIONS.intersection(argv)
+
+
+def send_message(connection: socket.socket, message: dict[str, Any]) -> None:
+    """Sends a message and closes the writing side of the connection
+
+    Args:
+        connection (socket.socket): Connected socket
+        message (dict[str, Any]): Message to send
+    """
+    connection.sendall(json.dumps(message).encode())
+    connection.shutdown(socket.SHUT_WR)
+
+
+def receive_message(connection: socket.socket) -> dict[str, Any]:
+    """Receives a message sent by `send_message`
+
+    Args:
+        connection (socket.socket): Connected socket
+
+    Raises:
+        ValueError: Raised if the message is not a JSON object
+
+    Returns:
+        dict[str, Any]: Received message
+    """
+    chunks = []
+    while True:
+        chunk = connection.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+
+    message = json.loads(b"".join(chunks))
+    if not isinstance(message, dict):
+        raise ValueError("Message is not a JSON object")
+    return message
@@ -0,0 +1,227 @@
+from pathlib import Path
+from typing import Iterator, Optional
+
+from pydantic import ValidationError
+
+from command_storage.models.database import db_models, snapshot_cache
+from command_storage.models.enums import error as error_enums
+
+
+class DatabaseReadError(Exception):
+    """Raised while iterating the stored commands if the database turns out to be
+    unreadable, e.g. by a malformed record further down the database file
+    """
+
+    def __init__(self, error: error_enums.Error) -> None:
+        """Initializer for `DatabaseReadError`
+
+        Args:
+            error (error_enums.Error): Error code of the failure
+        """
+        super().__init__(error)
+        self.error = error
+
+
+class BaseWrapper:
+    """Base class for all storage engines.
+
+    Engines must implement `get_commands` and `write_commands`. The point operations
+    used by `Cmds` fall back to a full read followed by a full write and should be
+    overridden by engines that can do better.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        """Initializer for `BaseWrapper`
+
+        Args:
+            db_path (Path): Path of the database
+        """
+        self._db_path = db_path
+
+    def data_files(self) -> list[Path]:
+        """Returns the files holding the stored commands
+
+        Returns:
+            list[Path]: Files changed by writes to the database
+        """
+        return [self._db_path]
+
+    def signature(self) -> Optional[tuple[Optional[snapshot_cache.Signature], ...]]:
+        """Returns the signature of the files holding the stored commands. It changes with
+        every write to the database, including writes by other processes.
+
+        Returns:
+            Optional[tuple[Optional[snapshot_cache.Signature], ...]]: Signature of every data
+            file (`None` for missing ones), `None` if a file can't be checked
+        """
+        signatures = []
+        for path in self.data_files():
+            try:
+                signatures.append(snapshot_cache.get_signature(path.stat()))
+            except FileNotFoundError:
+                signatures.append(None)
+            except OSError:
+                return None
+        return tuple(signatures)
+
+    def get_commands(self) -> db_models.Commands:
+        """Reads all stored commands and return the same
+
+        Returns:
+            db_models.Commands: Returns the read command as `db_models.Commands`
+        """
+        raise NotImplementedError
+
+    def iter_commands(self) -> tuple[error_enums.Error, Iterator[db_models.Command]]:
+        """Returns the stored commands one by one in database order. Engines that can read
+        records without loading the whole database should override this. Their iterators
+        raise `DatabaseReadError` for failures found while iterating.
+
+        Returns:
+            tuple[error_enums.Error, Iterator[db_models.Command]]: Error code and the
+            commands (empty on errors)
+        """
+        commands = self.get_commands()
+        return commands.error, iter(commands.commands.values())
+
+    def write_commands(self, commands: db_models.Commands) -> db_models.Commands:
+        """Stores new list of commands into the database
+
+        Args:
+            commands (db_models.Commands): New commands object
+
+        Returns:
+            db_models.Commands: Returns back the updated list of commands
+        """
+        raise NotImplementedError
+
+    def get_command(self, key: str) -> db_models.Commands:
+        """Reads a single stored command by its key
+
+        Args:
+            key (str): Key of the command
+
+        Returns:
+            db_models.Commands: Returns the command (if found) as `db_models.Commands`
+        """
+        commands = self.get_commands()
+        if commands.error != error_enums.Error.SUCCESS:
+            return commands
+
+        if key not in commands.commands:
+            return db_models.Commands(commands={}, error=error_enums.Error.NON_EXISTENT_KEY_ERROR)
+
+        return db_models.Commands(commands={key: commands.commands[key]}, error=error_enums.Error.SUCCESS)
+
+    def add_command(self, command: db_models.Command) -> error_enums.Error:
+        """Stores a new command
+
+        Args:
+            command (db_models.Command): Command to be stored
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        commands = self.get_commands()
+        if commands.error != error_enums.Error.SUCCESS:
+            return commands.error
+
+        if command.key in commands.commands:
+            return error_enums.Error.DUPLICATE_KEY_ERROR
+
+        commands.commands[command.key] = command
+        return self.write_commands(commands).error
+
+    def update_command(self, orig_key: str, new_key: Optional[str], command: Optional[str], description: Optional[str]) -> error_enums.Error:
+        """Updates an existing command including (optionally) its key
+
+        Args:
+            orig_key (str): Key for which update needs to happen
+            new_key (Optional[str]): New key if key needs to be changed
+            command (Optional[str]): New command
+            description (Optional[str]): New description
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        commands = self.get_commands()
+        if commands.error != error_enums.Error.SUCCESS:
+            return commands.error
+
+        if orig_key not in commands.commands:
+            return error_enums.Error.NON_EXISTENT_KEY_ERROR
+
+        command_obj = commands.commands[orig_key]
+
+        # Update command
+        if command is not None:
+            command_obj.command = command
+
+        # Update description
+        if description is not None:
+            command_obj.description = description
+
+        # Update the key
+        if new_key is not None:
+            # insert new key and remove old one
+            commands.commands.pop(orig_key)
+            command_obj.key = new_key
+            commands.commands[new_key] = command_obj
+        else:
+            commands.commands[orig_key] = command_obj
+
+        return self.write_commands(commands).error
+
+    def delete_command(self, key: str) -> error_enums.Error:
+        """Deletes a stored command by its key
+
+        Args:
+            key (str): Key that needs to be deleted
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        commands = self.get_commands()
+        if commands.error != error_enums.Error.SUCCESS:
+            return commands.error
+
+        if key not in commands.commands:
+            return error_enums.Error.NON_EXISTENT_KEY_ERROR
+
+        commands.commands.pop(key)
+        return self.write_commands(commands).error
+
+    def compact(self) -> error_enums.Error:
+        """Reclaims space left behind by earlier writes. Engines without anything to
+        reclaim do nothing.
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        return error_enums.Error.SUCCESS
+
+    def clear_cache(self) -> error_enums.Error:
+        """Removes caches kept next to the database. Engines without caches do nothing.
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        return error_enums.Error.SUCCESS
+
+    def check(self) -> error_enums.Error:
+        """Fully validates every stored command. Regular reads trust the database and skip
+        this.
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        commands = self.get_commands()
+        if commands.error != error_enums.Error.SUCCESS:
+            return commands.error
+
+        try:
+            db_models.Commands(commands={key: command.model_dump() for key, command in commands.commands.items()}, error=error_enums.Error.SUCCESS)
+        except ValidationError:
+            return error_enums.Error.DB_VALIDATION_ERROR
+
+        return error_enums.Error.SUCCESS
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+from command_storage.models.constants import DEFAULT_SHARD_COUNT
+from command_storage.models.database import (
+    json_wrapper,
+    log_wrapper,
+    shard_wrapper,
+    sqlite_wrapper,
+)
+from command_storage.models.database.base_wrapper import BaseWrapper
+from command_storage.models.enums import engine as engine_enums
+from command_storage.models.enums import error as error_enums
+from command_storage.models.enums import shard_by as shard_by_enums
+
+
+def get_db_handler(db_path: Path, engine: engine_enums.Engine, use_cache: bool = True) -> BaseWrapper:
+    """Returns the storage engine handler for the database
+
+    Args:
+        db_path (Path): Path of the database
+        engine (engine_enums.Engine): Storage engine of the database
+        use_cache (bool, optional): Whether JSON based engines keep a snapshot cache of
+        the parsed database. Defaults to True.
+
+    Returns:
+        BaseWrapper: Handler for the database
+    """
+    if engine == engine_enums.Engine.SQLITE:
+        return sqlite_wrapper.SqliteWrapper(db_path)
+
+    if engine == engine_enums.Engine.JSON_LOG:
+        return log_wrapper.LogJsonWrapper(db_path, use_cache)
+
+    if engine == engine_enums.Engine.SHARDED:
+        return shard_wrapper.ShardedWrapper(db_path, use_cache)
+
+    return json_wrapper.JsonWrapper(db_path, use_cache)
+
+
+def init_database(
+    db_path: Path,
+    engine: engine_enums.Engine,
+    shards: int = DEFAULT_SHARD_COUNT,
+    shard_by: shard_by_enums.ShardBy = shard_by_enums.ShardBy.HASH,
+) -> error_enums.Error:
+    """Create the Cmds database for the given storage engine
+
+    Args:
+        db_path (Path): Path to database file, the directory for the sharded engine
+        engine (engine_enums.Engine): Storage engine of the database
+        shards (int, optional): No. of shards of a new sharded database. Defaults to
+        `DEFAULT_SHARD_COUNT`.
+        shard_by (shard_by_enums.ShardBy, optional): What the keys of a new sharded
+        database are assigned to shards by. Defaults to `shard_by_enums.ShardBy.HASH`.
+
+    Returns:
+        error_enums.Error: Returns error code
+    """
+    if engine == engine_enums.Engine.SQLITE:
+        return sqlite_wrapper.init_database(db_path)
+
+    if engine == engine_enums.Engine.SHARDED:
+        return shard_wrapper.init_database(db_path, shards, shard_by)
+
+    # The log-structured engine keeps its snapshot in the JSON format
+    return json_wrapper.init_database(db_path)
@@ -1,16 +1,77 @@
-from typing import Optional, Union
+from typing import Any, Optional, Union
 
-from pydantic import BaseModel, field_serializer, validator
+from pydantic import BaseModel, GetCoreSchemaHandler, field_serializer, validator
+from pydantic_core import core_schema
 
 from command_storage.models.enums import error as error_enums
 
 
-class Command(BaseModel):
-    """Model for a command"""
+class Command:
+    """Model for a command.
 
-    key: str  # key to store with
-    command: str  # command to store with
-    description: Optional[str] = None  # description of command
+    A slotted record rather than a pydantic model so that stores with 100k commands load
+    fast and stay small in memory. Creating it directly does no validation and is meant
+    for trusted data like the records written by the storage engines themselves. Data
+    from elsewhere is validated by going through `Commands`, which validates every
+    record against `__get_pydantic_core_schema__`.
+    """
+
+    __slots__ = ("key", "command", "description")
+
+    def __init__(self, key: str, command: str, description: Optional[str] = None) -> None:
+        """Initializer for `Command`
+
+        Args:
+            key (str): key to store with
+            command (str): command to store with
+            description (Optional[str], optional): description of command. Defaults to None.
+        """
+        self.key = key
+        self.command = command
+        self.description = description
+
+    def model_dump(self) -> dict[str, Optional[str]]:
+        """Returns the command as a dictionary, like `pydantic.BaseModel.model_dump`
+
+        Returns:
+            dict[str, Optional[str]]: Fields of the command
+        """
+        return {"key": self.key, "command": self.command, "description": self.description}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Command):
+            return NotImplemented
+        return self.key == other.key and self.command == other.command and self.description == other.description
+
+    __hash__ = None  # mutable, like pydantic models
+
+    def __repr__(self) -> str:
+        return f"Command(key={self.key!r}, command={self.command!r}, description={self.description!r})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        """Schema used by pydantic to validate and serialize commands nested in `Commands`
+
+        Args:
+            source_type (Any): Annotated type, i.e. `Command`
+            handler (GetCoreSchemaHandler): Pydantic schema handler
+
+        Returns:
+            core_schema.CoreSchema: Accepts `Command` instances as they are and builds them
+            from dictionaries with a string `key` and `command` and an optional
+            `description`
+        """
+        fields_schema = core_schema.typed_dict_schema(
+            {
+                "key": core_schema.typed_dict_field(core_schema.str_schema()),
+                "command": core_schema.typed_dict_field(core_schema.str_schema()),
+                "description": core_schema.typed_dict_field(core_schema.nullable_schema(core_schema.str_schema()), required=False),
+            }
+        )
+        return core_schema.union_schema(
+            [core_schema.is_instance_schema(cls), core_schema.no_info_after_validator_function(lambda fields: cls(**fields), fields_schema)],
+            serialization=core_schema.plain_serializer_function_ser_schema(cls.model_dump),
+        )
 
 
 class Commands(BaseModel):
@@ -49,3 +110,21 @@ class Commands(BaseModel):
             return error_enums.ERROR_CODE_TO_NAME_MAPPING[value]
 
         return value
+
+
+def trusted_commands(commands: dict[str, dict[str, Optional[str]]]) -> Commands:
+    """Builds `Commands` out of command dictionaries written by the storage engines
+    without validating them. Use `Commands(commands=..., error=...)` for anything else.
+
+    Args:
+        commands (dict[str, dict[str, Optional[str]]]): Command dictionaries by key
+
+    Raises:
+        KeyError: Raised if a command dictionary misses `key` or `command`
+        TypeError: Raised if a command is not a dictionary
+
+    Returns:
+        Commands: Commands model
+    """
+    records = {key: Command(command["key"], command["command"], command.get("description")) for key, command in commands.items()}
+    return Commands.model_construct(commands=records, error=error_enums.Error.SUCCESS)
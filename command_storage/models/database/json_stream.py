@@ -0,0 +1,135 @@
+"""Incremental reading of large JSON documents.
+
+`JsonStream` reads a text stream in chunks and decodes one JSON value at a time, so the
+items of a large list or the members of a large object are parsed as they are consumed
+and only the current chunk is held in memory. The structure around the values (brackets,
+braces, commas and colons) is walked by the caller, except for `members`, which walks a
+whole object in a tight loop.
+"""
+
+import json
+import re
+from typing import IO, Any, Iterator
+
+_CHUNK_SIZE = 64 * 1024  # characters read at once
+_WHITESPACE = re.compile(r"\s*")
+# end of an object, or a member name with the comma before it and the colon after it
+_MEMBER = re.compile(r'[ \t\n\r]*(?:(\})|(,)?[ \t\n\r]*"((?:[^"\\]|\\.)*)"[ \t\n\r]*:[ \t\n\r]*)')
+
+
+class JsonStream:
+    """Cursor over a JSON document read from a text stream"""
+
+    def __init__(self, stream: IO[str]) -> None:
+        """Initializer for `JsonStream`
+
+        Args:
+            stream (IO[str]): Stream holding the document
+        """
+        self._stream = stream
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Drops the consumed part of the buffer and reads more. The buffer is left alone
+        at the end of the stream.
+
+        Returns:
+            bool: Whether anything was read
+        """
+        chunk = "" if self._eof else self._stream.read(_CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer, self._position = self._buffer[self._position :] + chunk, 0
+        return True
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character without consuming it
+
+        Returns:
+            str: Next character, empty at the end of the document
+        """
+        while True:
+            self._position = _WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer) or not self._fill():
+                return self._buffer[self._position : self._position + 1]
+
+    def skip(self, character: str) -> bool:
+        """Consumes the next character if it is the given one
+
+        Args:
+            character (str): Expected character, e.g. `,`
+
+        Returns:
+            bool: Whether the character was consumed
+        """
+        if self.peek() != character:
+            return False
+        self._position += 1
+        return True
+
+    def decode(self) -> Any:
+        """Decodes and consumes the next JSON value
+
+        Raises:
+            json.JSONDecodeError: Raised if the next value isn't valid JSON
+
+        Returns:
+            Any: Decoded value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if self._fill():  # the value may continue in the next chunk
+                    continue
+                raise
+            if end < len(self._buffer) or not self._fill():  # a number could continue in the next chunk
+                break
+
+        self._position = end
+        return value
+
+    def members(self) -> Iterator[tuple[str, Any]]:
+        """Consumes the object at the cursor, decoding one member at a time
+
+        Raises:
+            ValueError: Raised if the object isn't valid JSON
+
+        Yields:
+            Iterator[tuple[str, Any]]: Name and decoded value of every member
+        """
+        if not self.skip("{"):
+            raise ValueError("Expected an object")
+
+        scan_once, match_member = self._decoder.scan_once, _MEMBER.match
+        first = True
+        while True:
+            buffer = self._buffer
+            match = match_member(buffer, self._position)
+            if (match is None or match.end() == len(buffer)) and self._fill():  # the member may continue in the next chunk
+                continue
+            if match is None:
+                raise ValueError("Expected a member")
+            end_of_object, comma, name = match.groups()
+            if end_of_object:
+                self._position = match.end()
+                return
+            if (comma is None) != first:
+                raise ValueError("Expected ',' between members")
+
+            try:
+                value, end = scan_once(buffer, match.end())
+            except (StopIteration, json.JSONDecodeError):
+                if self._fill():
+                    continue
+                raise ValueError("Invalid member value")
+            if end == len(buffer) and self._fill():  # a number could continue in the next chunk
+                continue
+
+            self._position, first = end, False
+            yield json.loads(f'"{name}"') if "\\" in name else name, value
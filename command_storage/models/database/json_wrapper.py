@@ -1,12 +1,129 @@
 import configparser
 import json
+import os
+from json.encoder import encode_basestring_ascii
 from pathlib import Path
+from typing import IO, Iterator, Optional
 
-from command_storage.models.database import db_models
+from command_storage.models import tracing
+from command_storage.models.constants import DEFAULT_DB_FILE_PATH  # noqa: F401
+from command_storage.models.database import (
+    db_models,
+    json_stream,
+    offset_index,
+    snapshot_cache,
+)
+from command_storage.models.database.base_wrapper import BaseWrapper, DatabaseReadError
+from command_storage.models.database.locking import LockSettings, atomic_write_text
+from command_storage.models.enums import engine as engine_enums
 from command_storage.models.enums import error as error_enums
 from command_storage.models.enums import error as error_model
 
-DEFAULT_DB_FILE_PATH = Path.home().joinpath("." + Path.home().stem + "_cmds.json")
+# the database file is written from templates giving the very same text as
+# `json.dumps(commands.model_dump(), indent=4)`, which also tells where every record is
+_DB_HEAD = '{\n    "commands": {'
+_DB_ENTRY = "\n        %s: "
+_DB_RECORD = '{\n            "key": %s,\n            "command": %s,\n            "description": %s\n        }'
+_DB_TAIL = '\n    },\n    "error": %d\n}'
+_DB_EMPTY = '{\n    "commands": {},\n    "error": %d\n}'
+
+
+def _quote(value: Optional[str]) -> str:
+    """Returns the value as a JSON literal
+
+    Args:
+        value (Optional[str]): String to encode
+
+    Returns:
+        str: JSON string, `null` for `None`
+    """
+    return "null" if value is None else encode_basestring_ascii(value)
+
+
+def dump_commands(commands: db_models.Commands) -> tuple[str, dict[str, offset_index.Span]]:
+    """Returns the text of the database file holding the commands together with where
+    every record is in it. The text is ASCII, so character offsets are byte offsets.
+
+    Args:
+        commands (db_models.Commands): Commands to store
+
+    Returns:
+        tuple[str, dict[str, offset_index.Span]]: Text of the file and the offset and
+        length of the record of every key
+    """
+    error = commands.error.value.code if isinstance(commands.error, error_enums.Error) else commands.error
+    if not commands.commands:
+        return _DB_EMPTY % error, {}
+
+    parts = [_DB_HEAD]
+    offsets: dict[str, offset_index.Span] = {}
+    position = len(_DB_HEAD)
+    for key, command in commands.commands.items():
+        entry = ("," if offsets else "") + _DB_ENTRY % _quote(key)
+        record = _DB_RECORD % (_quote(command.key), _quote(command.command), _quote(command.description))
+        position += len(entry)
+        offsets[key] = (position, len(record))
+        position += len(record)
+        parts.append(entry)
+        parts.append(record)
+    parts.append(_DB_TAIL % error)
+    return "".join(parts), offsets
+
+
+def _next_member(reader: json_stream.JsonStream, first: bool) -> Optional[str]:
+    """Consumes the name of the next member of the object being read
+
+    Args:
+        reader (json_stream.JsonStream): Reader positioned inside the object
+        first (bool): Whether no member was read yet
+
+    Raises:
+        ValueError: Raised if the object is malformed
+
+    Returns:
+        Optional[str]: Name of the member, `None` at the end of the object
+    """
+    if reader.skip("}"):
+        return None
+    if not first and not reader.skip(","):
+        raise ValueError("Expected ',' between members")
+    name = reader.decode()
+    if not isinstance(name, str) or not reader.skip(":"):
+        raise ValueError("Expected a member name")
+    return name
+
+
+def _iter_database(db: IO[str]) -> Iterator[db_models.Command]:
+    """Yields the commands of a database file as their records are decoded and closes
+    the file once done. Nothing after the commands is read.
+
+    Args:
+        db (IO[str]): Open database file
+
+    Raises:
+        DatabaseReadError: Raised if the file is malformed or can't be read
+
+    Yields:
+        Iterator[db_models.Command]: Commands in database order
+    """
+    with db:
+        reader = json_stream.JsonStream(db)
+        try:
+            if not reader.skip("{"):
+                raise ValueError("Expected an object")
+            name = _next_member(reader, first=True)
+            while name is not None and name != "commands":
+                reader.decode()
+                name = _next_member(reader, first=False)
+            if name is None:  # no commands stored
+                return
+            for _, record in reader.members():
+                # Trust the file as it is written by `write_commands`. `check` validates it.
+                yield db_models.Command(record["key"], record["command"], record.get("description"))
+        except OSError as error:  # Catch file IO problems
+            raise DatabaseReadError(error_enums.Error.DB_READ_ERROR) from error
+        except (ValueError, AttributeError, KeyError, TypeError) as error:  # Catch wrong JSON format
+            raise DatabaseReadError(error_enums.Error.JSON_ERROR) from error
 
 
 def init_database(db_path: Path) -> error_model.Error:
@@ -42,31 +159,120 @@ def get_database_path(config_file: Path) -> Path:
     return Path(config_parser["General"]["database"])
 
 
-class JsonWrapper:
-    def __init__(self, db_path: Path) -> None:
+def get_database_engine(config_file: Path) -> engine_enums.Engine:
+    """Returns the storage engine of the database. Config files written before engines
+    were introduced have no `engine` entry and use JSON.
+
+    Args:
+        config_file (Path): Path to the config file
+
+    Returns:
+        engine_enums.Engine: Storage engine as read from config file
+    """
+    config_parser = configparser.ConfigParser()
+    config_parser.read(config_file)
+    return engine_enums.Engine(config_parser["General"].get("engine", engine_enums.Engine.JSON.value))
+
+
+def get_lock_settings(config_file: Path) -> LockSettings:
+    """Returns the retry/backoff settings for the database lock. Missing entries fall
+    back to the defaults.
+
+    Args:
+        config_file (Path): Path to the config file
+
+    Returns:
+        LockSettings: Lock settings as read from config file
+    """
+    config_parser = configparser.ConfigParser()
+    config_parser.read(config_file)
+    if not config_parser.has_section("Locking"):
+        return LockSettings()
+
+    defaults = LockSettings()
+    section = config_parser["Locking"]
+    return LockSettings(
+        retries=section.getint("retries", defaults.retries),
+        backoff=section.getfloat("backoff", defaults.backoff),
+        max_backoff=section.getfloat("max_backoff", defaults.max_backoff),
+    )
+
+
+def get_cache_enabled(config_file: Path) -> bool:
+    """Returns whether the snapshot cache of the parsed database is enabled. Enabled
+    unless turned off in the config file.
+
+    Args:
+        config_file (Path): Path to the config file
+
+    Returns:
+        bool: Whether the snapshot cache is enabled
+    """
+    config_parser = configparser.ConfigParser()
+    config_parser.read(config_file)
+    return config_parser["General"].getboolean("cache", True)
+
+
+class JsonWrapper(BaseWrapper):
+    """Storage engine keeping the whole database in a single JSON file"""
+
+    def __init__(self, db_path: Path, use_cache: bool = True) -> None:
         """Initializer for `JsonWrapper`
 
         Args:
             db_path (Path): Path of JSON file to be used as database
+            use_cache (bool, optional): Whether to keep a snapshot cache of the parsed
+            database next to it. Defaults to True.
         """
-        self._db_path = db_path
+        super().__init__(db_path)
+        self._use_cache = use_cache
 
     def get_commands(self) -> db_models.Commands:
-        """Reads all stored commands and return the same
+        """Reads all stored commands and return the same. Served from the snapshot cache
+        while the database file is unchanged.
 
         Returns:
             db_models.Commands: Returns the read command as `db_models.Commands`
         """
+        if self._use_cache:
+            with tracing.phase("load snapshot cache"):
+                commands = snapshot_cache.load_snapshot(self._db_path)
+            if commands is not None:
+                return commands
+
         try:
-            with self._db_path.open("r") as db:
+            with tracing.phase("parse json"), self._db_path.open("r") as db:
                 try:
                     json_data = json.load(db)
-                    return db_models.Commands(commands=json_data.get("commands", {}), error=error_enums.Error.SUCCESS)
-                except json.JSONDecodeError:  # Catch wrong JSON format
+                    # Trust the file as it is written by `write_commands`. `check` validates it.
+                    commands = db_models.trusted_commands(json_data.get("commands", {}))
+                except (json.JSONDecodeError, AttributeError, KeyError, TypeError):  # Catch wrong JSON format
                     return db_models.Commands(commands={}, error=error_enums.Error.JSON_ERROR)
+                signature = snapshot_cache.get_signature(os.fstat(db.fileno()))
         except OSError:  # Catch file IO problems
             return db_models.Commands(commands={}, error=error_enums.Error.DB_READ_ERROR)
 
+        if self._use_cache:
+            with tracing.phase("store snapshot cache"):
+                snapshot_cache.store_snapshot(self._db_path, signature, commands)
+
+        return commands
+
+    def iter_commands(self) -> tuple[error_enums.Error, Iterator[db_models.Command]]:
+        """Returns the stored commands one by one, decoding their records from the
+        database file as they are consumed. Only a chunk of the file is held in memory.
+
+        Returns:
+            tuple[error_enums.Error, Iterator[db_models.Command]]: Error code and the
+            commands (empty on errors)
+        """
+        try:
+            db = self._db_path.open("r")
+        except OSError:  # Catch file IO problems
+            return error_enums.Error.DB_READ_ERROR, iter(())
+
+        return error_enums.Error.SUCCESS, _iter_database(db)
+
     def write_commands(self, commands: db_models.Commands) -> db_models.Commands:
         """Stores new list of commands into the database
 
@@ -77,8 +283,92 @@ class JsonWrapper:
             db_models.Commands: Returns back the updated list of commands
         """
         try:
-            with self._db_path.open("w") as db:
-                json.dump(commands.model_dump(), db, indent=4)
-            return db_models.Commands(commands={}, error=error_enums.Error.SUCCESS)
+            with tracing.phase("write json"):
+                text, offsets = dump_commands(commands)
+                atomic_write_text(self._db_path, text)
+            signature = snapshot_cache.get_signature(self._db_path.stat())
         except OSError:  # Catch file IO problems
             return db_models.Commands(commands={}, error=error_enums.Error.DB_WRITE_ERROR)
+
+        with tracing.phase("store offset index"):
+            offset_index.store_offsets(self._db_path, signature, offsets)
+
+        if self._use_cache:
+            with tracing.phase("store snapshot cache"):
+                snapshot_cache.store_snapshot(self._db_path, signature, commands)
+
+        return db_models.Commands(commands={}, error=error_enums.Error.SUCCESS)
+
+    def get_command(self, key: str) -> db_models.Commands:
+        """Reads a single stored command by its key. Only its record is read and decoded,
+        using the offset index, which is rebuilt first if the database file was changed
+        by other means. Falls back to reading the whole file if it can't be indexed.
+
+        Args:
+            key (str): Key of the command
+
+        Returns:
+            db_models.Commands: Returns the command (if found) as `db_models.Commands`
+        """
+        try:
+            with tracing.phase("read record"), self._db_path.open("rb") as db:
+                signature = snapshot_cache.get_signature(os.fstat(db.fileno()))
+                spans = offset_index.find_spans(self._db_path, signature, key)
+                if spans is None and not offset_index.is_current(self._db_path, signature) and self._index_offsets() == signature:
+                    spans = offset_index.find_spans(self._db_path, signature, key)
+
+                for offset, length in spans or ():
+                    db.seek(offset)
+                    record = json.loads(db.read(length))
+                    if record["key"] == key:
+                        command = db_models.Command(record["key"], record["command"], record.get("description"))
+                        return db_models.Commands(commands={key: command}, error=error_enums.Error.SUCCESS)
+        except OSError:  # Catch file IO problems
+            return db_models.Commands(commands={}, error=error_enums.Error.DB_READ_ERROR)
+        except (ValueError, AttributeError, KeyError, TypeError):  # Index out of date despite its signature
+            spans = None
+
+        if spans is not None:
+            return db_models.Commands(commands={}, error=error_enums.Error.NON_EXISTENT_KEY_ERROR)
+
+        commands = JsonWrapper.get_commands(self)  # only the database file, whatever subclasses add to it
+        if commands.error != error_enums.Error.SUCCESS:
+            return commands
+        if key not in commands.commands:
+            return db_models.Commands(commands={}, error=error_enums.Error.NON_EXISTENT_KEY_ERROR)
+        return db_models.Commands(commands={key: commands.commands[key]}, error=error_enums.Error.SUCCESS)
+
+    def _index_offsets(self) -> Optional[snapshot_cache.Signature]:
+        """Builds the offset index of a database file that wasn't written by
+        `write_commands`, e.g. by an older version or by hand. Files that aren't laid out
+        like `write_commands` lays them out are recorded as not indexable.
+
+        Returns:
+            Optional[snapshot_cache.Signature]: Signature of the indexed file, `None` if it
+            can't be read
+        """
+        try:
+            with tracing.phase("build offset index"), self._db_path.open("rb") as db:
+                data = db.read()
+                signature = snapshot_cache.get_signature(os.fstat(db.fileno()))
+                commands = db_models.trusted_commands(json.loads(data).get("commands", {}))
+                text, offsets = dump_commands(commands)
+        except OSError:  # Catch file IO problems
+            return None
+        except (ValueError, AttributeError, KeyError, TypeError):  # Catch wrong JSON format
+            offset_index.store_offsets(self._db_path, signature, None)
+            return signature
+
+        offset_index.store_offsets(self._db_path, signature, offsets if text.encode() == data else None)
+        return signature
+
+    def clear_cache(self) -> error_enums.Error:
+        """Removes the snapshot cache of the parsed database and the offset index
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        clear_error = snapshot_cache.clear_snapshot(self._db_path)
+        if clear_error != error_enums.Error.SUCCESS:
+            return clear_error
+        return offset_index.clear_offsets(self._db_path)
@@ -0,0 +1,280 @@
+"""Persisted trigram index over the keys of the database.
+
+Fuzzy search shortlists the keys sharing at least one trigram with the query and scores
+only those. Next to the trigram postings the index keeps the keys sorted, so keys starting
+with the query are found by bisection. The index is kept in a `<db_path>.keyindex` file
+next to the database and is updated in place by every mutation. It also holds the keys it
+was built from, in database order, so an index that no longer matches the database (e.g.
+after editing the database by hand) is detected and rebuilt on the next search.
+
+Keys are normalized like the default processor of `thefuzz` (lower case, everything but
+letters and digits replaced by whitespace) and every word is padded with a space on both
+sides, so even one or two letter words produce a trigram. Keys shorter than a trigram match
+inside longer queries without sharing a trigram with them and are always shortlisted.
+"""
+
+import bisect
+import marshal
+import re
+from pathlib import Path
+from typing import Iterable, Optional
+
+from command_storage.models.database.locking import atomic_write_bytes
+from command_storage.models.enums import error as error_enums
+
+_INDEX_VERSION = 2  # bump whenever the layout of the index changes
+_SEPARATOR = "\0"  # separates keys in the posting lists, keys holding it are not indexed
+_NON_ALPHANUMERIC = re.compile(r"[\W_]+")
+_SHORT = ""  # posting of the keys shorter than a trigram
+
+
+def get_index_path(db_path: Path) -> Path:
+    """Returns the path of the key index kept next to the database
+
+    Args:
+        db_path (Path): Path of the database
+
+    Returns:
+        Path: Path of the key index
+    """
+    return db_path.with_name(db_path.name + ".keyindex")
+
+
+def trigrams(text: str) -> set[str]:
+    """Returns the trigrams of the normalized words of the text
+
+    Args:
+        text (str): Key or search query
+
+    Returns:
+        set[str]: Trigrams of the text, only `_SHORT` if the text is shorter than a trigram
+    """
+    normalized = _NON_ALPHANUMERIC.sub(" ", text.lower()).strip()
+    if len(normalized) < 3:
+        return {_SHORT}
+
+    grams = set()
+    for word in normalized.split():
+        padded = f" {word} "
+        grams.update(padded[idx : idx + 3] for idx in range(len(padded) - 2))
+    return grams
+
+
+class KeyIndex:
+    """Trigram postings and sorted keys together with the keys they were built from. Lists
+    of keys are kept as separator joined strings as they load much faster than lists.
+    """
+
+    def __init__(self, keys: str, sorted_keys: str, postings: dict[str, str]) -> None:
+        """Initializer for `KeyIndex`
+
+        Args:
+            keys (str): Indexed keys in database order, joined by the separator
+            sorted_keys (str): Indexed keys in sorted order, joined by the separator
+            postings (dict[str, str]): Joined keys by trigram
+        """
+        self._keys = keys
+        self._sorted_keys = sorted_keys
+        self._postings = postings
+
+    def matches(self, keys: list[str]) -> bool:
+        """Returns whether the index was built from exactly these keys
+
+        Args:
+            keys (list[str]): Keys of the database in database order
+
+        Returns:
+            bool: Whether the index is up to date
+        """
+        return self._keys == _SEPARATOR.join(keys)
+
+    def add(self, key: str) -> None:
+        """Indexes a key stored at the end of the database
+
+        Args:
+            key (str): New key
+        """
+        self._keys = f"{self._keys}{_SEPARATOR}{key}" if self._keys else key
+        sorted_keys = self.sorted_keys()
+        bisect.insort(sorted_keys, key)
+        self._sorted_keys = _SEPARATOR.join(sorted_keys)
+        for gram in trigrams(key):
+            posting = self._postings.get(gram)
+            self._postings[gram] = f"{posting}{_SEPARATOR}{key}" if posting else key
+
+    def remove(self, key: str) -> None:
+        """Removes a key from the index
+
+        Args:
+            key (str): Removed key
+        """
+        self._keys = _remove_key(self._keys, key)
+        self._sorted_keys = _remove_key(self._sorted_keys, key)
+        for gram in trigrams(key):
+            posting = _remove_key(self._postings.get(gram, ""), key)
+            if posting:
+                self._postings[gram] = posting
+            else:
+                self._postings.pop(gram, None)
+
+    def sorted_keys(self) -> list[str]:
+        """Returns the indexed keys in sorted order
+
+        Returns:
+            list[str]: Sorted keys
+        """
+        return self._sorted_keys.split(_SEPARATOR) if self._sorted_keys else []
+
+    def shortlist(self, query: str) -> Optional[set[str]]:
+        """Returns the keys sharing at least one trigram with the query and the keys
+        shorter than a trigram
+
+        Args:
+            query (str): Search query
+
+        Returns:
+            Optional[set[str]]: Shortlisted keys, `None` if the query is shorter than a
+            trigram and all keys need to be scored
+        """
+        query_grams = trigrams(query)
+        if _SHORT in query_grams:
+            return None
+
+        candidates: set[str] = set()
+        for gram in query_grams | {_SHORT}:
+            posting = self._postings.get(gram)
+            if posting:
+                candidates.update(posting.split(_SEPARATOR))
+
+        return candidates
+
+
+def _remove_key(joined: str, key: str) -> str:
+    """Removes one key from separator joined keys
+
+    Args:
+        joined (str): Separator joined keys
+        key (str): Key to remove
+
+    Returns:
+        str: Separator joined keys without `key`
+    """
+    keys = joined.split(_SEPARATOR)
+    if key in keys:
+        keys.remove(key)
+    return _SEPARATOR.join(keys)
+
+
+def build_index(keys: list[str]) -> Optional[KeyIndex]:
+    """Builds the index for the keys
+
+    Args:
+        keys (list[str]): Keys of the database in database order
+
+    Returns:
+        Optional[KeyIndex]: Index of the keys, `None` if a key can't be indexed
+    """
+    if any(_SEPARATOR in key for key in keys):
+        return None
+
+    postings: dict[str, list[str]] = {}
+    for key in keys:
+        for gram in trigrams(key):
+            postings.setdefault(gram, []).append(key)
+
+    return KeyIndex(_SEPARATOR.join(keys), _SEPARATOR.join(sorted(keys)), {gram: _SEPARATOR.join(posting) for gram, posting in postings.items()})
+
+
+def load_index(db_path: Path) -> Optional[KeyIndex]:
+    """Returns the persisted index
+
+    Args:
+        db_path (Path): Path of the database
+
+    Returns:
+        Optional[KeyIndex]: Persisted index, `None` if there is no usable index
+    """
+    try:
+        version, *fields = marshal.loads(get_index_path(db_path).read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):  # Missing or unreadable index
+        return None
+
+    if version != _INDEX_VERSION:
+        return None
+
+    keys, sorted_keys, postings = fields
+    return KeyIndex(keys, sorted_keys, postings)
+
+
+def store_index(db_path: Path, index: KeyIndex) -> None:
+    """Persists the index. Failures are ignored as the index is only an optimization.
+
+    Args:
+        db_path (Path): Path of the database
+        index (KeyIndex): Index to persist
+    """
+    try:
+        atomic_write_bytes(get_index_path(db_path), marshal.dumps((_INDEX_VERSION, index._keys, index._sorted_keys, index._postings)), durable=False)
+    except OSError:
+        pass
+
+
+def clear_index(db_path: Path) -> error_enums.Error:
+    """Removes the persisted index
+
+    Args:
+        db_path (Path): Path of the database
+
+    Returns:
+        error_enums.Error: Returns error code
+    """
+    try:
+        get_index_path(db_path).unlink(missing_ok=True)
+        return error_enums.Error.SUCCESS
+    except OSError:
+        return error_enums.Error.FILE_ERROR
+
+
+def get_index(db_path: Path, keys: list[str]) -> Optional[KeyIndex]:
+    """Returns the index of the keys. Builds (and persists) the index if it is missing or
+    doesn't match the keys of the database.
+
+    Args:
+        db_path (Path): Path of the database
+        keys (list[str]): Keys of the database in database order
+
+    Returns:
+        Optional[KeyIndex]: Index of the keys, `None` if a key can't be indexed
+    """
+    index = load_index(db_path)
+    if index is None or not index.matches(keys):
+        index = build_index(keys)
+        if index is not None:
+            store_index(db_path, index)
+
+    return index
+
+
+def update_index(db_path: Path, removed: Iterable[str] = (), added: Iterable[str] = ()) -> None:
+    """Applies a mutation of the database to the persisted index. Does nothing if the
+    database has no index yet.
+
+    Args:
+        db_path (Path): Path of the database
+        removed (Iterable[str], optional): Removed keys. Defaults to ().
+        added (Iterable[str], optional): Keys added at the end of the database. Defaults
+        to ().
+    """
+    index = load_index(db_path)
+    if index is None:
+        return
+
+    for key in removed:
+        index.remove(key)
+    for key in added:
+        if _SEPARATOR in key:  # can't be indexed, drop the index
+            clear_index(db_path)
+            return
+        index.add(key)
+
+    store_index(db_path, index)
@@ -0,0 +1,131 @@
+import os
+import random
+import stat
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from command_storage.models.constants import (
+    LOCK_BACKOFF_SECONDS,
+    LOCK_MAX_BACKOFF_SECONDS,
+    LOCK_RETRIES,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows has no advisory locks, writes stay atomic but unlocked
+    fcntl = None
+
+
+class LockSettings(NamedTuple):
+    """Retry/backoff settings used while waiting for the database lock"""
+
+    retries: int = LOCK_RETRIES
+    backoff: float = LOCK_BACKOFF_SECONDS
+    max_backoff: float = LOCK_MAX_BACKOFF_SECONDS
+
+
+class DatabaseLockError(Exception):
+    """Raised if the database lock could not be acquired within the configured retries"""
+
+
+def get_lock_path(db_path: Path) -> Path:
+    """Returns the path of the lock file kept next to the database
+
+    Args:
+        db_path (Path): Path of the database
+
+    Returns:
+        Path: Path of the lock file
+    """
+    return db_path.with_name(db_path.name + ".lock")
+
+
+@contextmanager
+def file_lock(db_path: Path, settings: LockSettings) -> Iterator[None]:
+    """Holds an exclusive advisory lock on the database for the duration of a
+    read-modify-write. Retries with exponential backoff and jitter while another process
+    holds the lock.
+
+    Args:
+        db_path (Path): Path of the database
+        settings (LockSettings): Retry/backoff settings
+
+    Raises:
+        DatabaseLockError: Raised if the lock is still held by another process after all
+        retries
+
+    Yields:
+        Iterator[None]: Yields once the lock is held
+    """
+    if fcntl is None:
+        yield
+        return
+
+    with get_lock_path(db_path).open("a") as lock_file:
+        backoff = settings.backoff
+        for attempt in range(settings.retries + 1):
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if attempt == settings.retries:
+                    raise DatabaseLockError(f"Could not lock database '{db_path}'")
+                time.sleep(backoff * random.uniform(0.5, 1.5))
+                backoff = min(backoff * 2, settings.max_backoff)
+
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_text(path: Path, data: str) -> None:
+    """Writes the text to a temporary file next to `path`, flushes it to disk and renames
+    it over `path`. Readers see either the old or the new content, never a truncated file.
+
+    Args:
+        path (Path): Path of the file to be replaced
+        data (str): New content of the file
+
+    Raises:
+        OSError: Raised on file IO problems. `path` is left untouched.
+    """
+    atomic_write_bytes(path, data.encode())
+
+
+def atomic_write_bytes(path: Path, data: bytes, durable: bool = True) -> None:
+    """Binary counterpart of `atomic_write_text`
+
+    Args:
+        path (Path): Path of the file to be replaced
+        data (bytes): New content of the file
+        durable (bool, optional): Whether to fsync the data before returning. Caches that
+        can be rebuilt skip it. Defaults to True.
+
+    Raises:
+        OSError: Raised on file IO problems. `path` is left untouched.
+    """
+    target = Path(os.path.realpath(path))  # replace the file behind a symlink, not the link
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+            if durable:
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+        if target.exists():
+            os.chmod(tmp_name, stat.S_IMODE(target.stat().st_mode))
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+    if durable and hasattr(os, "O_DIRECTORY"):  # persist the rename itself
+        dir_fd = os.open(target.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
@@ -0,0 +1,317 @@
+import itertools
+import json
+import os
+from pathlib import Path
+from typing import Iterator, Optional
+
+from command_storage.models import tracing
+from command_storage.models.constants import (
+    LOG_COMPACTION_MIN_BYTES,
+    LOG_COMPACTION_RATIO,
+)
+from command_storage.models.database import db_models
+from command_storage.models.database.json_wrapper import JsonWrapper
+from command_storage.models.enums import error as error_enums
+
+_PUT = "put"
+_DELETE = "delete"
+
+
+def get_log_path(db_path: Path) -> Path:
+    """Returns the path of the append-only log kept next to the snapshot
+
+    Args:
+        db_path (Path): Path of the JSON snapshot
+
+    Returns:
+        Path: Path of the NDJSON log
+    """
+    return db_path.with_name(db_path.name + ".log")
+
+
+class LogJsonWrapper(JsonWrapper):
+    """Log-structured storage engine. The database file holds a JSON snapshot in the same
+    format as `JsonWrapper` and every mutation is appended as one put or delete record to
+    an NDJSON log next to it. Reads replay the log over the snapshot and compaction folds
+    the log back into the snapshot.
+    """
+
+    def __init__(self, db_path: Path, use_cache: bool = True) -> None:
+        """Initializer for `LogJsonWrapper`
+
+        Args:
+            db_path (Path): Path of JSON file to be used as snapshot
+            use_cache (bool, optional): Whether to keep a snapshot cache of the parsed
+            snapshot next to it. Defaults to True.
+        """
+        super().__init__(db_path, use_cache)
+        self._log_path = get_log_path(db_path)
+
+    def data_files(self) -> list[Path]:
+        """Returns the files holding the stored commands
+
+        Returns:
+            list[Path]: The snapshot and the log
+        """
+        return [self._db_path, self._log_path]
+
+    def get_commands(self) -> db_models.Commands:
+        """Reads the snapshot, replays the log over it and returns the latest state
+
+        Returns:
+            db_models.Commands: Returns the read command as `db_models.Commands`
+        """
+        commands = super().get_commands()
+        if commands.error != error_enums.Error.SUCCESS:
+            return commands
+
+        try:
+            with self._log_path.open("r") as log:
+                lines = log.readlines()
+        except FileNotFoundError:  # Nothing logged since last compaction
+            return commands
+        except OSError:  # Catch file IO problems
+            return db_models.Commands(commands={}, error=error_enums.Error.DB_READ_ERROR)
+
+        with tracing.phase("replay log"):
+            for idx, line in enumerate(lines):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    if idx == len(lines) - 1:  # Torn final append, the mutation never completed
+                        break
+                    return db_models.Commands(commands={}, error=error_enums.Error.JSON_ERROR)
+
+                try:
+                    if record["op"] == _PUT:
+                        put = record["command"]
+                        commands.commands[put["key"]] = db_models.Command(put["key"], put["command"], put.get("description"))
+                    else:
+                        commands.commands.pop(record["key"], None)
+                except (AttributeError, KeyError, TypeError):  # Catch wrong record format
+                    return db_models.Commands(commands={}, error=error_enums.Error.JSON_ERROR)
+
+        return commands
+
+    def iter_commands(self) -> tuple[error_enums.Error, Iterator[db_models.Command]]:
+        """Returns the stored commands one by one. The log is read up front and applied
+        to the snapshot records as they are decoded: replaced commands keep their place,
+        deleted ones are skipped and new ones follow the snapshot, just like replaying
+        the log does.
+
+        Returns:
+            tuple[error_enums.Error, Iterator[db_models.Command]]: Error code and the
+            commands (empty on errors)
+        """
+        try:
+            with self._log_path.open("r") as log:
+                lines = log.readlines()
+        except FileNotFoundError:  # Nothing logged since last compaction
+            return super().iter_commands()
+        except OSError:  # Catch file IO problems
+            return error_enums.Error.DB_READ_ERROR, iter(())
+
+        replaced: dict[str, db_models.Command] = {}  # snapshot commands changed in place
+        removed: set[str] = set()  # snapshot commands deleted
+        appended: dict[str, db_models.Command] = {}  # commands following the snapshot
+        with tracing.phase("replay log"):
+            for idx, line in enumerate(lines):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    if idx == len(lines) - 1:  # Torn final append, the mutation never completed
+                        break
+                    return error_enums.Error.JSON_ERROR, iter(())
+
+                try:
+                    if record["op"] == _PUT:
+                        put = record["command"]
+                        key, command = put["key"], db_models.Command(put["key"], put["command"], put.get("description"))
+                        if key in appended or key in removed:
+                            appended[key] = command
+                        elif key in replaced:
+                            replaced[key] = command
+                        else:  # first record of the key, it stays in place if the snapshot has it
+                            stored = JsonWrapper.get_command(self, key)
+                            if stored.error not in (error_enums.Error.SUCCESS, error_enums.Error.NON_EXISTENT_KEY_ERROR):
+                                return stored.error, iter(())
+                            (replaced if stored.error == error_enums.Error.SUCCESS else appended)[key] = command
+                    elif appended.pop(record["key"], None) is None:
+                        replaced.pop(record["key"], None)
+                        removed.add(record["key"])
+                except (AttributeError, KeyError, TypeError):  # Catch wrong record format
+                    return error_enums.Error.JSON_ERROR, iter(())
+
+        read_error, snapshot = super().iter_commands()
+        if read_error != error_enums.Error.SUCCESS:
+            return read_error, iter(())
+
+        kept = (replaced.get(command.key, command) for command in snapshot if command.key not in removed)
+        return error_enums.Error.SUCCESS, itertools.chain(kept, appended.values())
+
+    def get_command(self, key: str) -> db_models.Commands:
+        """Reads a single stored command by its key. The log is searched from its end for
+        the latest record of the key, the snapshot is only read if the key wasn't logged.
+
+        Args:
+            key (str): Key of the command
+
+        Returns:
+            db_models.Commands: Returns the command (if found) as `db_models.Commands`
+        """
+        try:
+            with self._log_path.open("r") as log:
+                lines = log.readlines()
+        except FileNotFoundError:  # Nothing logged since last compaction
+            lines = []
+        except OSError:  # Catch file IO problems
+            return db_models.Commands(commands={}, error=error_enums.Error.DB_READ_ERROR)
+
+        quoted_key = json.dumps(key)
+        with tracing.phase("search log"):
+            for idx in range(len(lines) - 1, -1, -1):
+                if quoted_key not in lines[idx]:  # skip decoding records of other keys
+                    continue
+                try:
+                    record = json.loads(lines[idx])
+                except json.JSONDecodeError:
+                    if idx == len(lines) - 1:  # Torn final append, the mutation never completed
+                        continue
+                    return db_models.Commands(commands={}, error=error_enums.Error.JSON_ERROR)
+
+                try:
+                    if record["op"] == _PUT and record["command"]["key"] == key:
+                        put = record["command"]
+                        command = db_models.Command(put["key"], put["command"], put.get("description"))
+                        return db_models.Commands(commands={key: command}, error=error_enums.Error.SUCCESS)
+                    if record["op"] == _DELETE and record["key"] == key:
+                        return db_models.Commands(commands={}, error=error_enums.Error.NON_EXISTENT_KEY_ERROR)
+                except (AttributeError, KeyError, TypeError):  # Catch wrong record format
+                    return db_models.Commands(commands={}, error=error_enums.Error.JSON_ERROR)
+
+        return super().get_command(key)
+
+    def write_commands(self, commands: db_models.Commands) -> db_models.Commands:
+        """Stores new list of commands as the snapshot and empties the log
+
+        Args:
+            commands (db_models.Commands): New commands object
+
+        Returns:
+            db_models.Commands: Returns back the updated list of commands
+        """
+        written = super().write_commands(commands)
+        if written.error != error_enums.Error.SUCCESS:
+            return written
+
+        try:
+            self._log_path.unlink(missing_ok=True)
+        except OSError:  # Catch file IO problems
+            return db_models.Commands(commands={}, error=error_enums.Error.DB_WRITE_ERROR)
+
+        return written
+
+    def add_command(self, command: db_models.Command) -> error_enums.Error:
+        """Appends a put record for a new command
+
+        Args:
+            command (db_models.Command): Command to be stored
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        stored = self.get_command(command.key)
+        if stored.error == error_enums.Error.SUCCESS:
+            return error_enums.Error.DUPLICATE_KEY_ERROR
+        if stored.error != error_enums.Error.NON_EXISTENT_KEY_ERROR:
+            return stored.error
+
+        return self._append({"op": _PUT, "command": command.model_dump()})
+
+    def update_command(self, orig_key: str, new_key: Optional[str], command: Optional[str], description: Optional[str]) -> error_enums.Error:
+        """Appends the records for updating an existing command including (optionally) its
+        key
+
+        Args:
+            orig_key (str): Key for which update needs to happen
+            new_key (Optional[str]): New key if key needs to be changed
+            command (Optional[str]): New command
+            description (Optional[str]): New description
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        stored = self.get_command(orig_key)
+        if stored.error != error_enums.Error.SUCCESS:
+            return stored.error
+
+        command_obj = stored.commands[orig_key]
+        if command is not None:
+            command_obj.command = command
+        if description is not None:
+            command_obj.description = description
+
+        records = []
+        if new_key is not None:
+            # delete and put so that replay moves the command to the end like `JsonWrapper`
+            records.append({"op": _DELETE, "key": orig_key})
+            command_obj.key = new_key
+        records.append({"op": _PUT, "command": command_obj.model_dump()})
+
+        return self._append(*records)
+
+    def delete_command(self, key: str) -> error_enums.Error:
+        """Appends a delete record (tombstone) for a stored command
+
+        Args:
+            key (str): Key that needs to be deleted
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        stored = self.get_command(key)
+        if stored.error != error_enums.Error.SUCCESS:
+            return stored.error
+
+        return self._append({"op": _DELETE, "key": key})
+
+    def compact(self) -> error_enums.Error:
+        """Folds the log into the snapshot
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        commands = self.get_commands()
+        if commands.error != error_enums.Error.SUCCESS:
+            return commands.error
+
+        return self.write_commands(commands).error
+
+    def _append(self, *records: dict) -> error_enums.Error:
+        """Appends records to the log in a single write and compacts the log once it
+        outgrows the snapshot
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        data = "".join(json.dumps(record) + "\n" for record in records).encode()
+
+        try:
+            with self._log_path.open("a+b") as log:
+                end = log.seek(0, os.SEEK_END)
+                if end:
+                    log.seek(end - 1)
+                    if log.read(1) != b"\n":
+                        # Drop a torn record left behind by an interrupted append
+                        log.seek(0)
+                        log.truncate(log.read().rfind(b"\n") + 1)
+                log.write(data)
+            log_size = self._log_path.stat().st_size
+            snapshot_size = self._db_path.stat().st_size
+        except OSError:  # Catch file IO problems
+            return error_enums.Error.DB_WRITE_ERROR
+
+        if log_size > max(snapshot_size * LOG_COMPACTION_RATIO, LOG_COMPACTION_MIN_BYTES):
+            return self.compact()
+
+        return error_enums.Error.SUCCESS
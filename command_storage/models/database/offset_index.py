@@ -0,0 +1,170 @@
+"""Persisted index of where every command is stored in the JSON database file.
+
+The index maps every key to the byte offset and length of its record in the database file,
+so a single command is read by seeking to its record and decoding only that. It is an open
+addressing hash table of fixed size slots in a `<db_path>.offsets` file next to the
+database. A lookup reads the header and the few slots its key hashes to, so its cost
+doesn't depend on the size of the store. The header holds the signature of the database
+file the index was built for, an index for another signature is ignored.
+
+Slots hold a CRC32 of the key, not the key itself. Keys sharing a hash are all returned
+and told apart by the key field of their records.
+"""
+
+import struct
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from command_storage.models.database.locking import atomic_write_bytes
+from command_storage.models.database.snapshot_cache import Signature
+from command_storage.models.enums import error as error_enums
+
+_MAGIC = b"CMDO"
+_INDEX_VERSION = 1  # bump whenever the layout of the index changes
+_HEADER = struct.Struct("<4sIQQQQ")  # magic, version, signature (inode, size, mtime), no. of slots
+_SLOT = struct.Struct("<IQI")  # key hash, offset and length of the record, length 0 for empty slots
+_SLOTS_PER_READ = 8
+
+Span = tuple[int, int]  # offset and length of a record
+
+
+def get_index_path(db_path: Path) -> Path:
+    """Returns the path of the offset index kept next to the database
+
+    Args:
+        db_path (Path): Path of the database
+
+    Returns:
+        Path: Path of the offset index
+    """
+    return db_path.with_name(db_path.name + ".offsets")
+
+
+def _hash(key: str) -> int:
+    return zlib.crc32(key.encode("utf-8", "surrogatepass"))
+
+
+def store_offsets(db_path: Path, signature: Signature, offsets: Optional[dict[str, Span]]) -> None:
+    """Persists the offsets of the records of the database file. Failures are ignored as
+    the index is only an optimization.
+
+    Args:
+        db_path (Path): Path of the database
+        signature (Signature): Signature of the database file holding the records
+        offsets (Optional[dict[str, Span]]): Offset and length of the record of every key,
+        `None` to record that the file can't be indexed
+    """
+    slot_count = 0
+    slots = bytearray()
+    if offsets is not None:
+        slot_count = 8
+        while slot_count < 2 * len(offsets):
+            slot_count *= 2
+        mask = slot_count - 1
+        slots = bytearray(slot_count * _SLOT.size)
+        used = bytearray(slot_count)
+        for key, (offset, length) in offsets.items():
+            key_hash = _hash(key)
+            slot = key_hash & mask
+            while used[slot]:
+                slot = (slot + 1) & mask
+            used[slot] = 1
+            _SLOT.pack_into(slots, slot * _SLOT.size, key_hash, offset, length)
+
+    header = _HEADER.pack(_MAGIC, _INDEX_VERSION, *signature, slot_count)
+    try:
+        atomic_write_bytes(get_index_path(db_path), header + slots, durable=False)
+    except OSError:
+        pass
+
+
+def is_current(db_path: Path, signature: Signature) -> bool:
+    """Returns whether the index was built for the database file, including an index
+    recording that the file can't be indexed
+
+    Args:
+        db_path (Path): Path of the database
+        signature (Signature): Signature of the database file
+
+    Returns:
+        bool: Whether the index is up to date
+    """
+    try:
+        with get_index_path(db_path).open("rb") as index:
+            return _read_header(index.read(_HEADER.size), signature) is not None
+    except OSError:
+        return False
+
+
+def _read_header(data: bytes, signature: Signature) -> Optional[int]:
+    """Returns the no. of slots of the index if it matches the database file
+
+    Args:
+        data (bytes): Header of the index
+        signature (Signature): Signature of the database file
+
+    Returns:
+        Optional[int]: No. of slots, `None` if the index doesn't match
+    """
+    if len(data) != _HEADER.size:
+        return None
+    magic, version, *indexed_signature, slot_count = _HEADER.unpack(data)
+    if magic != _MAGIC or version != _INDEX_VERSION or tuple(indexed_signature) != tuple(signature):
+        return None
+    return slot_count
+
+
+def find_spans(db_path: Path, signature: Signature, key: str) -> Optional[list[Span]]:
+    """Returns where the record of the key may be stored
+
+    Args:
+        db_path (Path): Path of the database
+        signature (Signature): Signature of the database file
+        key (str): Key of the command
+
+    Returns:
+        Optional[list[Span]]: Offset and length of every record whose key shares the hash
+        of the key, empty if the key isn't stored. `None` if there is no usable index.
+    """
+    key_hash = _hash(key)
+    spans = []
+    try:
+        with get_index_path(db_path).open("rb") as index:
+            slot_count = _read_header(index.read(_HEADER.size), signature)
+            if not slot_count:
+                return None
+
+            slot, probed = key_hash & (slot_count - 1), 0
+            while probed < slot_count:
+                count = min(_SLOTS_PER_READ, slot_count - slot)
+                index.seek(_HEADER.size + slot * _SLOT.size)
+                data = index.read(count * _SLOT.size)
+                if len(data) != count * _SLOT.size:  # truncated index
+                    return None
+                for slot_hash, offset, length in _SLOT.iter_unpack(data):
+                    if not length:
+                        return spans
+                    if slot_hash == key_hash:
+                        spans.append((offset, length))
+                slot, probed = (slot + count) % slot_count, probed + count
+    except OSError:
+        return None
+
+    return spans
+
+
+def clear_offsets(db_path: Path) -> error_enums.Error:
+    """Removes the persisted index
+
+    Args:
+        db_path (Path): Path of the database
+
+    Returns:
+        error_enums.Error: Returns error code
+    """
+    try:
+        get_index_path(db_path).unlink(missing_ok=True)
+        return error_enums.Error.SUCCESS
+    except OSError:
+        return error_enums.Error.FILE_ERROR
@@ -0,0 +1,464 @@
+"""Storage engine splitting the database into shard files.
+
+The database path is a directory holding a `shards.json` manifest and N shard files. Each
+shard file is a JSON database written like the `json` engine writes its file, together with
+its own snapshot cache and offset index. Every key belongs to exactly one shard, picked by
+a hash of the whole key or of its prefix (the part before the first `-`, `_`, `.`, `:`, `/`
+or space), so related keys like `git-*` share a shard. Writes of a single command read and
+rewrite only its shard, reads of a single command read only its record. Listing and
+exporting go through the shards one after the other, so the database order is shard by
+shard and insertion order within a shard.
+
+Resharding writes a new generation of shard files and then replaces the manifest, so
+readers see either the old or the new layout. Writes changing several shards, like imports,
+write one shard after the other and aren't atomic across shards.
+"""
+
+import json
+import re
+import zlib
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+from pydantic import ValidationError
+
+from command_storage.models.constants import DEFAULT_SHARD_COUNT
+from command_storage.models.database import db_models
+from command_storage.models.database.base_wrapper import BaseWrapper, DatabaseReadError
+from command_storage.models.database.json_wrapper import JsonWrapper
+from command_storage.models.database.locking import atomic_write_text
+from command_storage.models.enums import error as error_enums
+from command_storage.models.enums import shard_by as shard_by_enums
+
+MANIFEST_NAME = "shards.json"
+_MANIFEST_VERSION = 1
+_PREFIX_END = re.compile(r"[-_.:/ ]")
+
+
+class Layout(NamedTuple):
+    """Shard layout of a database as recorded in its manifest"""
+
+    shards: int
+    by: shard_by_enums.ShardBy
+    generation: int = 0  # bumped by every reshard, part of the shard file names
+
+
+def get_manifest_path(db_path: Path) -> Path:
+    """Returns the path of the manifest of the sharded database
+
+    Args:
+        db_path (Path): Directory of the database
+
+    Returns:
+        Path: Path of the manifest
+    """
+    return db_path / MANIFEST_NAME
+
+
+def get_shard_path(db_path: Path, layout: Layout, shard: int) -> Path:
+    """Returns the path of a shard file
+
+    Args:
+        db_path (Path): Directory of the database
+        layout (Layout): Shard layout of the database
+        shard (int): No. of the shard
+
+    Returns:
+        Path: Path of the shard file
+    """
+    return db_path / f"shard-{layout.generation}-{shard:04d}.json"
+
+
+def get_shard(key: str, layout: Layout) -> int:
+    """Returns the shard a key belongs to
+
+    Args:
+        key (str): Key of a command
+        layout (Layout): Shard layout of the database
+
+    Returns:
+        int: No. of the shard
+    """
+    if layout.by == shard_by_enums.ShardBy.PREFIX:
+        key = _PREFIX_END.split(key, 1)[0]
+    return zlib.crc32(key.encode("utf-8", "surrogatepass")) % layout.shards
+
+
+def read_layout(db_path: Path) -> Optional[Layout]:
+    """Reads the shard layout from the manifest
+
+    Args:
+        db_path (Path): Directory of the database
+
+    Returns:
+        Optional[Layout]: Shard layout, `None` if the manifest can't be read
+    """
+    try:
+        manifest = json.loads(get_manifest_path(db_path).read_text())
+        layout = Layout(int(manifest["shards"]), shard_by_enums.ShardBy(manifest["by"]), int(manifest["generation"]))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return layout if manifest.get("version") == _MANIFEST_VERSION and layout.shards > 0 else None
+
+
+def _write_layout(db_path: Path, layout: Layout) -> None:
+    """Atomically replaces the manifest
+
+    Args:
+        db_path (Path): Directory of the database
+        layout (Layout): New shard layout
+
+    Raises:
+        OSError: Raised if the manifest can't be written
+    """
+    manifest = {"version": _MANIFEST_VERSION, "shards": layout.shards, "by": layout.by.value, "generation": layout.generation}
+    atomic_write_text(get_manifest_path(db_path), json.dumps(manifest, indent=4))
+
+
+def _write_shards(db_path: Path, layout: Layout, commands: db_models.Commands, use_cache: bool, only_changed: bool = False) -> error_enums.Error:
+    """Splits the commands into the shards of the layout and writes the shard files
+
+    Args:
+        db_path (Path): Directory of the database
+        layout (Layout): Shard layout to write
+        commands (db_models.Commands): All commands of the database
+        use_cache (bool): Whether to keep snapshot caches of the shards
+        only_changed (bool, optional): Whether to skip shard files already holding their
+        commands. Defaults to False.
+
+    Returns:
+        error_enums.Error: Returns error code of the operation
+    """
+    shards: list[dict[str, db_models.Command]] = [{} for _ in range(layout.shards)]
+    for key, command in commands.commands.items():
+        shards[get_shard(key, layout)][key] = command
+
+    for shard_no, shard_commands in enumerate(shards):
+        shard = JsonWrapper(get_shard_path(db_path, layout, shard_no), use_cache)
+        if only_changed:
+            stored = shard.get_commands()
+            if stored.error == error_enums.Error.SUCCESS and list(stored.commands.values()) == list(shard_commands.values()):
+                continue
+        written = shard.write_commands(db_models.Commands.model_construct(commands=shard_commands, error=error_enums.Error.SUCCESS))
+        if written.error != error_enums.Error.SUCCESS:
+            return written.error
+    return error_enums.Error.SUCCESS
+
+
+def init_database(db_path: Path, shards: int = DEFAULT_SHARD_COUNT, by: shard_by_enums.ShardBy = shard_by_enums.ShardBy.HASH) -> error_enums.Error:
+    """Create the Cmds sharded database. An existing database is kept with its layout.
+
+    Args:
+        db_path (Path): Directory of the database
+        shards (int, optional): No. of shards. Defaults to `DEFAULT_SHARD_COUNT`.
+        by (shard_by_enums.ShardBy, optional): What keys are assigned to shards by.
+        Defaults to `shard_by_enums.ShardBy.HASH`.
+
+    Returns:
+        error_enums.Error: Returns error code
+    """
+    if read_layout(db_path) is not None:
+        return error_enums.Error.SUCCESS
+
+    layout = Layout(shards, by)
+    try:
+        db_path.mkdir(parents=True, exist_ok=True)
+        shard_error = _write_shards(db_path, layout, db_models.Commands.model_construct(commands={}, error=error_enums.Error.SUCCESS), True)
+        if shard_error != error_enums.Error.SUCCESS:
+            return shard_error
+        _write_layout(db_path, layout)
+        return error_enums.Error.SUCCESS
+    except OSError:
+        return error_enums.Error.DB_WRITE_ERROR
+
+
+def migrate_from_json(json_path: Path, db_path: Path) -> error_enums.Error:
+    """One-shot migration of an existing JSON database into a sharded database. Keys
+    already present in the sharded database are overwritten.
+
+    Args:
+        json_path (Path): Path of the JSON database to read from
+        db_path (Path): Directory of the sharded database to write into
+
+    Returns:
+        error_enums.Error: Returns error code
+    """
+    commands = JsonWrapper(json_path).get_commands()
+    if commands.error != error_enums.Error.SUCCESS:
+        return commands.error
+
+    handler = ShardedWrapper(db_path)
+    stored = handler.get_commands()
+    if stored.error != error_enums.Error.SUCCESS:
+        return stored.error
+
+    stored.commands.update(commands.commands)
+    return handler.write_commands(stored).error
+
+
+class ShardedWrapper(BaseWrapper):
+    """Storage engine keeping the database in a directory of JSON shard files"""
+
+    def __init__(self, db_path: Path, use_cache: bool = True) -> None:
+        """Initializer for `ShardedWrapper`
+
+        Args:
+            db_path (Path): Directory of the database
+            use_cache (bool, optional): Whether to keep a snapshot cache of every parsed
+            shard next to it. Defaults to True.
+        """
+        super().__init__(db_path)
+        self._use_cache = use_cache
+
+    def _shards(self, layout: Layout) -> list[JsonWrapper]:
+        """Returns the engines of all shard files of the layout
+
+        Args:
+            layout (Layout): Shard layout of the database
+
+        Returns:
+            list[JsonWrapper]: Engine of every shard file, in shard order
+        """
+        return [JsonWrapper(get_shard_path(self._db_path, layout, shard), self._use_cache) for shard in range(layout.shards)]
+
+    def _shard_of(self, key: str) -> Optional[JsonWrapper]:
+        """Returns the engine of the shard file holding the key
+
+        Args:
+            key (str): Key of a command
+
+        Returns:
+            Optional[JsonWrapper]: Engine of the shard file, `None` if the manifest can't
+            be read
+        """
+        layout = read_layout(self._db_path)
+        if layout is None:
+            return None
+        return JsonWrapper(get_shard_path(self._db_path, layout, get_shard(key, layout)), self._use_cache)
+
+    def data_files(self) -> list[Path]:
+        """Returns the manifest and the shard files
+
+        Returns:
+            list[Path]: Files changed by writes to the database
+        """
+        layout = read_layout(self._db_path)
+        shard_files = [get_shard_path(self._db_path, layout, shard) for shard in range(layout.shards)] if layout is not None else []
+        return [get_manifest_path(self._db_path), *shard_files]
+
+    def get_commands(self) -> db_models.Commands:
+        """Reads the commands of all shards and return the same
+
+        Returns:
+            db_models.Commands: Returns the read command as `db_models.Commands`
+        """
+        layout = read_layout(self._db_path)
+        if layout is None:
+            return db_models.Commands(commands={}, error=error_enums.Error.DB_READ_ERROR)
+
+        commands: dict[str, db_models.Command] = {}
+        for shard in self._shards(layout):
+            shard_commands = shard.get_commands()
+            if shard_commands.error != error_enums.Error.SUCCESS:
+                return shard_commands
+            commands.update(shard_commands.commands)
+        return db_models.Commands.model_construct(commands=commands, error=error_enums.Error.SUCCESS)
+
+    def iter_commands(self) -> tuple[error_enums.Error, Iterator[db_models.Command]]:
+        """Returns the stored commands one by one, streaming one shard file after the
+        other. A shard is only opened once the commands of the shards before it are
+        consumed.
+
+        Returns:
+            tuple[error_enums.Error, Iterator[db_models.Command]]: Error code and the
+            commands (empty on errors)
+        """
+        layout = read_layout(self._db_path)
+        if layout is None:
+            return error_enums.Error.DB_READ_ERROR, iter(())
+
+        def records() -> Iterator[db_models.Command]:
+            for shard in self._shards(layout):
+                read_error, shard_commands = shard.iter_commands()
+                if read_error != error_enums.Error.SUCCESS:
+                    raise DatabaseReadError(read_error)
+                yield from shard_commands
+
+        return error_enums.Error.SUCCESS, records()
+
+    def write_commands(self, commands: db_models.Commands) -> db_models.Commands:
+        """Stores new list of commands, rewriting the shard files whose commands changed
+
+        Args:
+            commands (db_models.Commands): New commands object
+
+        Returns:
+            db_models.Commands: Returns back the updated list of commands
+        """
+        layout = read_layout(self._db_path)
+        if layout is None:
+            return db_models.Commands(commands={}, error=error_enums.Error.DB_READ_ERROR)
+        return db_models.Commands(commands={}, error=_write_shards(self._db_path, layout, commands, self._use_cache, only_changed=True))
+
+    def get_command(self, key: str) -> db_models.Commands:
+        """Reads a single stored command from its shard
+
+        Args:
+            key (str): Key of the command
+
+        Returns:
+            db_models.Commands: Returns the command (if found) as `db_models.Commands`
+        """
+        shard = self._shard_of(key)
+        if shard is None:
+            return db_models.Commands(commands={}, error=error_enums.Error.DB_READ_ERROR)
+        return shard.get_command(key)
+
+    def add_command(self, command: db_models.Command) -> error_enums.Error:
+        """Stores a new command, rewriting only its shard
+
+        Args:
+            command (db_models.Command): Command to be stored
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        shard = self._shard_of(command.key)
+        if shard is None:
+            return error_enums.Error.DB_READ_ERROR
+        return shard.add_command(command)
+
+    def update_command(self, orig_key: str, new_key: Optional[str], command: Optional[str], description: Optional[str]) -> error_enums.Error:
+        """Updates an existing command including (optionally) its key, rewriting only the
+        shards of the old and the new key. A command renamed into another shard is stored
+        there before it is removed from its old shard, so a failure in between leaves it
+        stored twice rather than lost.
+
+        Args:
+            orig_key (str): Key for which update needs to happen
+            new_key (Optional[str]): New key if key needs to be changed
+            command (Optional[str]): New command
+            description (Optional[str]): New description
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        layout = read_layout(self._db_path)
+        if layout is None:
+            return error_enums.Error.DB_READ_ERROR
+
+        shards = self._shards(layout)
+        orig_shard = shards[get_shard(orig_key, layout)]
+        if new_key is None or get_shard(new_key, layout) == get_shard(orig_key, layout):
+            return orig_shard.update_command(orig_key, new_key, command, description)
+
+        stored = orig_shard.get_command(orig_key)
+        if stored.error != error_enums.Error.SUCCESS:
+            return stored.error
+        stored_command = stored.commands[orig_key]
+        renamed = db_models.Command(
+            new_key,
+            stored_command.command if command is None else command,
+            stored_command.description if description is None else description,
+        )
+
+        new_shard = shards[get_shard(new_key, layout)]
+        new_shard_commands = new_shard.get_commands()
+        if new_shard_commands.error != error_enums.Error.SUCCESS:
+            return new_shard_commands.error
+        new_shard_commands.commands.pop(new_key, None)  # replaced, as with the other engines
+        new_shard_commands.commands[new_key] = renamed
+        write_error = new_shard.write_commands(new_shard_commands).error
+        if write_error != error_enums.Error.SUCCESS:
+            return write_error
+
+        return orig_shard.delete_command(orig_key)
+
+    def delete_command(self, key: str) -> error_enums.Error:
+        """Deletes a stored command by its key, rewriting only its shard
+
+        Args:
+            key (str): Key that needs to be deleted
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        shard = self._shard_of(key)
+        if shard is None:
+            return error_enums.Error.DB_READ_ERROR
+        return shard.delete_command(key)
+
+    def reshard(self, shards: int, by: shard_by_enums.ShardBy) -> error_enums.Error:
+        """Redistributes the commands over a new set of shard files. The old shard files
+        and their caches are removed once the manifest points to the new ones.
+
+        Args:
+            shards (int): No. of shards
+            by (shard_by_enums.ShardBy): What keys are assigned to shards by
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        old_layout = read_layout(self._db_path)
+        if old_layout is None:
+            return error_enums.Error.DB_READ_ERROR
+        commands = self.get_commands()
+        if commands.error != error_enums.Error.SUCCESS:
+            return commands.error
+
+        layout = Layout(shards, by, old_layout.generation + 1)
+        write_error = _write_shards(self._db_path, layout, commands, self._use_cache)
+        if write_error != error_enums.Error.SUCCESS:
+            return write_error
+        try:
+            _write_layout(self._db_path, layout)
+        except OSError:
+            return error_enums.Error.DB_WRITE_ERROR
+
+        for shard_no, shard in enumerate(self._shards(old_layout)):
+            shard.clear_cache()
+            try:
+                get_shard_path(self._db_path, old_layout, shard_no).unlink(missing_ok=True)
+            except OSError:  # left behind, never read again
+                pass
+        return error_enums.Error.SUCCESS
+
+    def clear_cache(self) -> error_enums.Error:
+        """Removes the snapshot caches and offset indexes of all shards
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        layout = read_layout(self._db_path)
+        if layout is None:
+            return error_enums.Error.DB_READ_ERROR
+        for shard in self._shards(layout):
+            clear_error = shard.clear_cache()
+            if clear_error != error_enums.Error.SUCCESS:
+                return clear_error
+        return error_enums.Error.SUCCESS
+
+    def check(self) -> error_enums.Error:
+        """Fully validates every stored command and that every key is stored in its shard
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        layout = read_layout(self._db_path)
+        if layout is None:
+            return error_enums.Error.DB_READ_ERROR
+
+        seen: set[str] = set()
+        for shard_no, shard in enumerate(self._shards(layout)):
+            commands = shard.get_commands()
+            if commands.error != error_enums.Error.SUCCESS:
+                return commands.error
+            try:
+                db_models.Commands(commands={key: command.model_dump() for key, command in commands.commands.items()}, error=error_enums.Error.SUCCESS)
+            except ValidationError:
+                return error_enums.Error.DB_VALIDATION_ERROR
+            if any(key in seen or get_shard(key, layout) != shard_no for key in commands.commands):
+                return error_enums.Error.DB_VALIDATION_ERROR
+            seen.update(commands.commands)
+
+        return error_enums.Error.SUCCESS
@@ -0,0 +1,100 @@
+"""On-disk cache of the parsed database.
+
+The cache holds the already parsed commands serialized with `marshal` (no code runs while
+loading it, unlike `pickle`) together with the signature of the database file it was built
+from. It is only used while the database file still has the same signature. Loading it
+skips reading and decoding the JSON text of the database.
+"""
+
+import marshal
+import os
+from pathlib import Path
+from typing import Optional
+
+from command_storage.models.database import db_models
+from command_storage.models.database.locking import atomic_write_bytes
+from command_storage.models.enums import error as error_enums
+
+_CACHE_VERSION = 1  # bump whenever the layout of the cached data changes
+
+Signature = tuple[int, int, int]
+
+
+def get_cache_path(db_path: Path) -> Path:
+    """Returns the path of the snapshot cache kept next to the database
+
+    Args:
+        db_path (Path): Path of the database
+
+    Returns:
+        Path: Path of the snapshot cache
+    """
+    return db_path.with_name(db_path.name + ".cache")
+
+
+def get_signature(stat_result: os.stat_result) -> Signature:
+    """Returns the signature identifying a version of the database file
+
+    Args:
+        stat_result (os.stat_result): Stat of the database file
+
+    Returns:
+        Signature: Inode, size and modification time of the file
+    """
+    return (stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns)
+
+
+def load_snapshot(db_path: Path) -> Optional[db_models.Commands]:
+    """Returns the cached commands if the cache matches the current database file
+
+    Args:
+        db_path (Path): Path of the database
+
+    Returns:
+        Optional[db_models.Commands]: Cached commands, `None` if there is no usable cache
+    """
+    try:
+        signature = get_signature(db_path.stat())
+        version, cached_signature, commands = marshal.loads(get_cache_path(db_path).read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):  # Missing or unreadable cache
+        return None
+
+    if version != _CACHE_VERSION or tuple(cached_signature) != signature:
+        return None
+
+    try:
+        return db_models.trusted_commands(commands)
+    except (AttributeError, KeyError, TypeError):  # Cache written by a different layout
+        return None
+
+
+def store_snapshot(db_path: Path, signature: Signature, commands: db_models.Commands) -> None:
+    """Caches the commands read from (or written to) the database file. Failures are
+    ignored as the cache is only an optimization.
+
+    Args:
+        db_path (Path): Path of the database
+        signature (Signature): Signature of the database file holding `commands`
+        commands (db_models.Commands): Commands held by the database file
+    """
+    data = commands.model_dump(include={"commands"})["commands"]
+    try:
+        atomic_write_bytes(get_cache_path(db_path), marshal.dumps((_CACHE_VERSION, signature, data)), durable=False)
+    except OSError:
+        pass
+
+
+def clear_snapshot(db_path: Path) -> error_enums.Error:
+    """Removes the snapshot cache
+
+    Args:
+        db_path (Path): Path of the database
+
+    Returns:
+        error_enums.Error: Returns error code
+    """
+    try:
+        get_cache_path(db_path).unlink(missing_ok=True)
+        return error_enums.Error.SUCCESS
+    except OSError:
+        return error_enums.Error.FILE_ERROR
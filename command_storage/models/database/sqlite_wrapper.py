@@ -0,0 +1,246 @@
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Iterator, Optional
+
+from command_storage.models.database import db_models
+from command_storage.models.database.base_wrapper import BaseWrapper
+from command_storage.models.database.json_wrapper import JsonWrapper
+from command_storage.models.enums import error as error_enums
+
+# `id` keeps the insertion order that the JSON database gives for free while the
+# unique constraint on `key` provides the index used for point lookups.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS commands (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    command TEXT NOT NULL,
+    description TEXT
+)
+"""
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    """Opens a connection to the SQLite database and ensures the schema exists
+
+    Args:
+        db_path (Path): Path to database file
+
+    Returns:
+        sqlite3.Connection: Open connection
+    """
+    connection = sqlite3.connect(db_path)
+    connection.execute(_SCHEMA)
+    return connection
+
+
+def init_database(db_path: Path) -> error_enums.Error:
+    """Create the Cmds SQLite database. Existing data is kept.
+
+    Args:
+        db_path (Path): Path to database file
+
+    Returns:
+        error_enums.Error: Returns error code
+    """
+    try:
+        with closing(_connect(db_path)) as connection:
+            connection.commit()
+        return error_enums.Error.SUCCESS
+    except sqlite3.Error:
+        return error_enums.Error.DB_WRITE_ERROR
+
+
+def migrate_from_json(json_path: Path, db_path: Path) -> error_enums.Error:
+    """One-shot migration of an existing JSON database into a SQLite database. Keys
+    already present in the SQLite database are overwritten.
+
+    Args:
+        json_path (Path): Path of the JSON database to read from
+        db_path (Path): Path of the SQLite database to write into
+
+    Returns:
+        error_enums.Error: Returns error code
+    """
+    commands = JsonWrapper(json_path).get_commands()
+    if commands.error != error_enums.Error.SUCCESS:
+        return commands.error
+
+    try:
+        with closing(_connect(db_path)) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO commands (key, command, description) VALUES (?, ?, ?)",
+                ((key, command.command, command.description) for key, command in commands.commands.items()),
+            )
+        return error_enums.Error.SUCCESS
+    except sqlite3.Error:
+        return error_enums.Error.DB_WRITE_ERROR
+
+
+class SqliteWrapper(BaseWrapper):
+    """Storage engine keeping one row per command in a SQLite database"""
+
+    def get_commands(self) -> db_models.Commands:
+        """Reads all stored commands and return the same
+
+        Returns:
+            db_models.Commands: Returns the read command as `db_models.Commands`
+        """
+        try:
+            with closing(_connect(self._db_path)) as connection:
+                rows = connection.execute("SELECT key, command, description FROM commands ORDER BY id").fetchall()
+        except sqlite3.Error:
+            return db_models.Commands(commands={}, error=error_enums.Error.DB_READ_ERROR)
+
+        commands = {key: db_models.Command(key=key, command=command, description=description) for key, command, description in rows}
+        return db_models.Commands(commands=commands, error=error_enums.Error.SUCCESS)
+
+    def iter_commands(self) -> tuple[error_enums.Error, Iterator[db_models.Command]]:
+        """Returns the stored commands one by one, fetching rows from the cursor as they
+        are consumed
+
+        Returns:
+            tuple[error_enums.Error, Iterator[db_models.Command]]: Error code and the
+            commands (empty on errors)
+        """
+        try:
+            connection = _connect(self._db_path)
+        except sqlite3.Error:
+            return error_enums.Error.DB_READ_ERROR, iter(())
+        try:
+            cursor = connection.execute("SELECT key, command, description FROM commands ORDER BY id")
+        except sqlite3.Error:
+            connection.close()
+            return error_enums.Error.DB_READ_ERROR, iter(())
+
+        def rows() -> Iterator[db_models.Command]:
+            with closing(connection):
+                for key, command, description in cursor:
+                    yield db_models.Command(key=key, command=command, description=description)
+
+        return error_enums.Error.SUCCESS, rows()
+
+    def write_commands(self, commands: db_models.Commands) -> db_models.Commands:
+        """Replaces all stored commands by the given ones in a single transaction
+
+        Args:
+            commands (db_models.Commands): New commands object
+
+        Returns:
+            db_models.Commands: Returns back the updated list of commands
+        """
+        try:
+            with closing(_connect(self._db_path)) as connection, connection:
+                connection.execute("DELETE FROM commands")
+                connection.executemany(
+                    "INSERT INTO commands (key, command, description) VALUES (?, ?, ?)",
+                    ((key, command.command, command.description) for key, command in commands.commands.items()),
+                )
+            return db_models.Commands(commands={}, error=error_enums.Error.SUCCESS)
+        except sqlite3.Error:
+            return db_models.Commands(commands={}, error=error_enums.Error.DB_WRITE_ERROR)
+
+    def get_command(self, key: str) -> db_models.Commands:
+        """Reads a single stored command by its key using the key index
+
+        Args:
+            key (str): Key of the command
+
+        Returns:
+            db_models.Commands: Returns the command (if found) as `db_models.Commands`
+        """
+        try:
+            with closing(_connect(self._db_path)) as connection:
+                row = connection.execute("SELECT command, description FROM commands WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return db_models.Commands(commands={}, error=error_enums.Error.DB_READ_ERROR)
+
+        if row is None:
+            return db_models.Commands(commands={}, error=error_enums.Error.NON_EXISTENT_KEY_ERROR)
+
+        command = db_models.Command(key=key, command=row[0], description=row[1])
+        return db_models.Commands(commands={key: command}, error=error_enums.Error.SUCCESS)
+
+    def add_command(self, command: db_models.Command) -> error_enums.Error:
+        """Stores a new command as a single row
+
+        Args:
+            command (db_models.Command): Command to be stored
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        try:
+            with closing(_connect(self._db_path)) as connection, connection:
+                connection.execute(
+                    "INSERT INTO commands (key, command, description) VALUES (?, ?, ?)",
+                    (command.key, command.command, command.description),
+                )
+            return error_enums.Error.SUCCESS
+        except sqlite3.IntegrityError:
+            return error_enums.Error.DUPLICATE_KEY_ERROR
+        except sqlite3.Error:
+            return error_enums.Error.DB_WRITE_ERROR
+
+    def update_command(self, orig_key: str, new_key: Optional[str], command: Optional[str], description: Optional[str]) -> error_enums.Error:
+        """Updates a single row including (optionally) its key
+
+        Args:
+            orig_key (str): Key for which update needs to happen
+            new_key (Optional[str]): New key if key needs to be changed
+            command (Optional[str]): New command
+            description (Optional[str]): New description
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        try:
+            with closing(_connect(self._db_path)) as connection, connection:
+                row = connection.execute("SELECT command, description FROM commands WHERE key = ?", (orig_key,)).fetchone()
+                if row is None:
+                    return error_enums.Error.NON_EXISTENT_KEY_ERROR
+
+                command = row[0] if command is None else command
+                description = row[1] if description is None else description
+
+                if new_key is None:
+                    connection.execute("UPDATE commands SET command = ?, description = ? WHERE key = ?", (command, description, orig_key))
+                else:
+                    # Same semantics as the JSON engine: renamed command moves to the end
+                    # and replaces any command already stored under the new key
+                    connection.execute("DELETE FROM commands WHERE key IN (?, ?)", (orig_key, new_key))
+                    connection.execute("INSERT INTO commands (key, command, description) VALUES (?, ?, ?)", (new_key, command, description))
+            return error_enums.Error.SUCCESS
+        except sqlite3.Error:
+            return error_enums.Error.DB_WRITE_ERROR
+
+    def delete_command(self, key: str) -> error_enums.Error:
+        """Deletes a single row by its key
+
+        Args:
+            key (str): Key that needs to be deleted
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        try:
+            with closing(_connect(self._db_path)) as connection, connection:
+                cursor = connection.execute("DELETE FROM commands WHERE key = ?", (key,))
+            if cursor.rowcount == 0:
+                return error_enums.Error.NON_EXISTENT_KEY_ERROR
+            return error_enums.Error.SUCCESS
+        except sqlite3.Error:
+            return error_enums.Error.DB_WRITE_ERROR
+
+    def compact(self) -> error_enums.Error:
+        """Rebuilds the database file to reclaim space of deleted rows
+
+        Returns:
+            error_enums.Error: Returns error code of the operation
+        """
+        try:
+            with closing(_connect(self._db_path)) as connection:
+                connection.execute("VACUUM")
+            return error_enums.Error.SUCCESS
+        except sqlite3.Error:
+            return error_enums.Error.DB_WRITE_ERROR
@@ -17,3 +17,27 @@ class Arguments(Enum):
     FILE = argument_model.Argument(short="-f", long="--file", type=str, description="Export file address with extension")
     ALL = argument_model.Argument(short="-a", long="--all", type=str, description="Delete all commands")
     LIMIT = argument_model.Argument(short="-l", long="--limit", type=str, description="Number of results to show. 0 means all results.")
+    ENGINE = argument_model.Argument(short="-e", long="--engine", type=str, description="Storage engine of the database.")
+    MIGRATE_FROM = argument_model.Argument(short="-m", long="--migrate-from", type=str, description="JSON database to migrate into SQLite database.")
+    NO_CACHE = argument_model.Argument(short="-nc", long="--no-cache", type=bool, description="Disable the snapshot cache of the parsed database.")
+    FIELDS = argument_model.Argument(short="-fs", long="--fields", type=str, description="Comma separated fields to fuzzy match on: key, command, description.")
+    FORMAT = argument_model.Argument(
+        short="-fmt", long="--format", type=str, description="File format. Guessed from the file extension if not given, JSON for stdout."
+    )
+    ON_DUPLICATE = argument_model.Argument(short="-od", long="--on-duplicate", type=str, description="What to do with commands whose key is already stored.")
+    COMPRESS = argument_model.Argument(short="-z", long="--compress", type=str, description="Compress the exported file. Implied by a .gz file extension.")
+    TIMINGS = argument_model.Argument(short="-t", long="--timings", type=bool, description="Print the wall time and peak memory of every phase to stderr.")
+    PROFILE = argument_model.Argument(short="-p", long="--profile", type=str, description="Write cProfile stats of the command to this file.")
+    OUTPUT_FORMAT = argument_model.Argument(
+        short="-fmt", long="--format", type=str, description="Output format. JSON, NDJSON and TSV skip the table layout for scripts."
+    )
+    NO_PAGER = argument_model.Argument(short="-np", long="--no-pager", type=bool, description="Never show tables longer than the terminal in a pager.")
+    MATCH = argument_model.Argument(short="-mt", long="--match", type=str, description="Glob pattern whole keys are matched against, e.g. 'tmp-*'.")
+    REGEX = argument_model.Argument(short="-re", long="--regex", type=bool, description="Match keys against --match as a regular expression instead of a glob.")
+    KEYS_FROM_STDIN = argument_model.Argument(short="-si", long="--from-stdin", type=bool, description="Read more keys from stdin, one per line.")
+    COMMANDS_FROM_STDIN = argument_model.Argument(
+        short="-si", long="--from-stdin", type=bool, description="Read the commands from stdin, one JSON object with key, command and description per line."
+    )
+    DRY_RUN = argument_model.Argument(short="-dr", long="--dry-run", type=bool, description="Show what would change without changing anything.")
+    SHARDS = argument_model.Argument(short="-sh", long="--shards", type=int, description="No. of shard files of a sharded database.")
+    SHARD_BY = argument_model.Argument(short="-sb", long="--shard-by", type=str, description="Assign keys to shards by a hash of the whole key or of its prefix.")
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class Compression(str, Enum):
+    """Compressions of exported files"""
+
+    GZIP = "gzip"
@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class DuplicatePolicy(str, Enum):
+    """What to do with imported commands whose key is already stored"""
+
+    SKIP = "skip"
+    OVERWRITE = "overwrite"
+    FAIL = "fail"
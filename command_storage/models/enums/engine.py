@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class Engine(str, Enum):
+    """Storage engines supported for the database"""
+
+    JSON = "json"
+    JSON_LOG = "jsonlog"
+    SQLITE = "sqlite"
+    SHARDED = "sharded"
@@ -13,6 +13,11 @@ class Error(Enum):
     JSON_EXPORT_FILE_ERROR = error_model.Error(code=6, name="JSON_ERROR", description="issue with exporting file data")
     DUPLICATE_KEY_ERROR = error_model.Error(code=7, name="DUPLICATE_KEY_ERROR", description="Duplicate key issue")
     NON_EXISTENT_KEY_ERROR = error_model.Error(code=7, name="NON_EXISTENT_KEY_ERROR", description="key doesn't exist in database")
+    DB_LOCK_ERROR = error_model.Error(code=8, name="DB_LOCK_ERROR", description="database is locked by another process")
+    DB_VALIDATION_ERROR = error_model.Error(code=9, name="DB_VALIDATION_ERROR", description="database contains invalid commands")
+    DAEMON_RUNNING_ERROR = error_model.Error(code=10, name="DAEMON_RUNNING_ERROR", description="daemon is already running")
+    DAEMON_SOCKET_ERROR = error_model.Error(code=11, name="DAEMON_SOCKET_ERROR", description="daemon socket can't be created")
+    NOT_SHARDED_ERROR = error_model.Error(code=12, name="NOT_SHARDED_ERROR", description="database doesn't use the sharded engine")
 
     def __str__(self) -> str:
         """User friendly print output
@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class FileFormat(str, Enum):
+    """File formats commands can be imported from and exported to"""
+
+    JSON = "json"
+    NDJSON = "ndjson"
+    CSV = "csv"
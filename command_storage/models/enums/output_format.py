@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class OutputFormat(str, Enum):
+    """Formats `cmds list` prints commands in"""
+
+    TABLE = "table"
+    JSON = "json"
+    NDJSON = "ndjson"
+    TSV = "tsv"
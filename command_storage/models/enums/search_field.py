@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class SearchField(str, Enum):
+    """Fields of a command that fuzzy search can match on"""
+
+    KEY = "key"
+    COMMAND = "command"
+    DESCRIPTION = "description"
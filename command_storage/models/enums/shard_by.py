@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class ShardBy(str, Enum):
+    """What the keys of a sharded database are assigned to shards by"""
+
+    HASH = "hash"  # the whole key, spreads keys evenly
+    PREFIX = "prefix"  # the part before the first separator, keeps related keys together
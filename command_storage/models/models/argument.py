@@ -1,16 +1,24 @@
-from pydantic import BaseModel, validator
+from dataclasses import dataclass
 
 
-class Argument(BaseModel):
-    """Defined model for defining a CLI argument with both short and long types"""
+@dataclass(frozen=True)
+class Argument:
+    """Defined model for defining a CLI argument with both short and long types. A plain
+    dataclass instead of a pydantic model as all arguments are built while the CLI starts.
+    """
 
     short: str  # must start with single dash (`-`)
     long: str  # must start with two dashes (`--`)
     type: type
     description: str
 
-    @validator("short")
-    def short_should_start_with_dash(cls, short: str) -> str:
+    def __post_init__(self) -> None:
+        """Validates the short and long arguments"""
+        self.short_should_start_with_dash(self.short)
+        self.long_should_start_with_double_dash(self.long)
+
+    @staticmethod
+    def short_should_start_with_dash(short: str) -> str:
         """Checks if short argument had a single dash `-` before it.
 
         Args:
@@ -27,8 +35,8 @@ class Argument(BaseModel):
 
         return short
 
-    @validator("long")
-    def long_should_start_with_double_dash(cls, long: str) -> str:
+    @staticmethod
+    def long_should_start_with_double_dash(long: str) -> str:
         """Checks if long argument had a double dash `--` before it.
 
         Args:
@@ -1,8 +1,11 @@
-from pydantic import BaseModel
+from dataclasses import dataclass
 
 
-class Error(BaseModel):
-    """Pydantic model to define User Interface application wide errors"""
+@dataclass(frozen=True)
+class Error:
+    """Model to define User Interface application wide errors. A plain dataclass instead
+    of a pydantic model as all errors are built while the CLI starts.
+    """
 
     name: str
     code: int
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from command_storage.models.enums import error as error_enums
+
+
+@dataclass(frozen=True)
+class ImportSummary:
+    """Outcome of importing commands"""
+
+    error: error_enums.Error
+    imported: int = 0  # commands stored under new keys
+    overwritten: int = 0  # stored commands replaced by imported ones
+    skipped: int = 0  # imported commands dropped as their key is already stored
+    duplicate_key: Optional[str] = None  # key that failed the import with `DuplicatePolicy.FAIL`
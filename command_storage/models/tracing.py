@@ -0,0 +1,187 @@
+"""Opt-in timings of the phases of a `cmds` invocation.
+
+Code marks its phases with `with tracing.phase("name"):`. Until a recorder is started,
+`phase` returns one shared no-op context manager, so marking phases costs a function call
+and nothing is measured. Once started (by `cmds --timings ...` or `CMDS_TRACE`), every phase
+records its wall time and the peak resident memory of the process at its end, together
+with how much the phase raised that peak. Peak memory comes from `getrusage`, which adds no
+overhead and is unavailable on Windows. This module must only use the standard library.
+"""
+
+import contextlib
+import sys
+import time
+from typing import Any, ContextManager, Iterator, Mapping, Optional
+
+TRACE_ENV = "CMDS_TRACE"  # `1` or `stderr` prints the timings, anything else is a JSON trace file
+STDERR_TARGET = "stderr"
+
+_NO_PHASE = contextlib.nullcontext()
+
+
+def _peak_rss() -> Optional[int]:
+    """Returns the peak resident memory of the process so far
+
+    Returns:
+        Optional[int]: Peak resident memory in bytes, `None` if unavailable
+    """
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # kilobytes everywhere else
+
+
+class Phase:
+    """Measurements of one phase. A plain class as dataclasses are slow to define and this
+    module is imported by every invocation.
+    """
+
+    __slots__ = ("name", "depth", "start_ms", "wall_ms", "peak_rss_bytes", "peak_rss_growth_bytes")
+
+    def __init__(self, name: str, depth: int, start_ms: float) -> None:
+        """Initializer for `Phase`
+
+        Args:
+            name (str): Name of the phase
+            depth (int): No. of phases the phase is nested in
+            start_ms (float): Start relative to the start of the recording
+        """
+        self.name = name
+        self.depth = depth
+        self.start_ms = start_ms
+        self.wall_ms = 0.0
+        self.peak_rss_bytes: Optional[int] = None  # peak resident memory of the process at the end of the phase
+        self.peak_rss_growth_bytes: Optional[int] = None  # how much the phase raised the peak
+
+
+class Recorder:
+    """Records the phases of one invocation"""
+
+    def __init__(self) -> None:
+        """Initializer for `Recorder`"""
+        self.phases: list[Phase] = []
+        self._depth = 0
+        self._origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measures the phase run inside the context
+
+        Args:
+            name (str): Name of the phase
+
+        Yields:
+            Iterator[None]: Nothing
+        """
+        start = time.perf_counter()
+        record = Phase(name, self._depth, (start - self._origin) * 1000)
+        self.phases.append(record)
+        peak_before = _peak_rss()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            record.wall_ms = (time.perf_counter() - start) * 1000
+            record.peak_rss_bytes = _peak_rss()
+            if peak_before is not None and record.peak_rss_bytes is not None:
+                record.peak_rss_growth_bytes = record.peak_rss_bytes - peak_before
+
+    def format(self) -> str:
+        """Returns the phases as an indented table
+
+        Returns:
+            str: Human readable timings
+        """
+        lines = [f"{'phase':<40} {'wall':>12} {'peak rss':>12} {'growth':>10}"]
+        for record in self.phases:
+            name = "  " * record.depth + record.name
+            peak = f"{record.peak_rss_bytes / 2**20:.1f} MB" if record.peak_rss_bytes is not None else "-"
+            growth = f"+{record.peak_rss_growth_bytes / 2**20:.1f} MB" if record.peak_rss_growth_bytes is not None else "-"
+            lines.append(f"{name:<40} {record.wall_ms:>9.2f} ms {peak:>12} {growth:>10}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the phases in the layout of the JSON trace file
+
+        Returns:
+            dict[str, Any]: JSON serializable trace
+        """
+        return {"argv": sys.argv[1:], "phases": [{field: getattr(record, field) for field in Phase.__slots__} for record in self.phases]}
+
+
+_recorder: Optional[Recorder] = None
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Returns a context manager measuring the phase while a recorder is started
+
+    Args:
+        name (str): Name of the phase
+
+    Returns:
+        ContextManager[None]: Measuring context manager, a no-op one if not recording
+    """
+    if _recorder is None:
+        return _NO_PHASE
+    return _recorder.phase(name)
+
+
+def start() -> Recorder:
+    """Starts recording phases
+
+    Returns:
+        Recorder: Started recorder
+    """
+    global _recorder
+    _recorder = Recorder()
+    return _recorder
+
+
+def stop() -> None:
+    """Stops recording phases"""
+    global _recorder
+    _recorder = None
+
+
+def write_trace(recorder: Recorder, target: str) -> None:
+    """Writes the recorded phases to stderr or a JSON trace file. Failing to write the
+    trace file is reported on stderr.
+
+    Args:
+        recorder (Recorder): Recorder holding the phases
+        target (str): `stderr` or the path of the trace file
+    """
+    if target == STDERR_TARGET:
+        sys.stderr.write(recorder.format())
+        sys.stderr.flush()
+        return
+
+    import json
+
+    try:
+        with open(target, "w") as trace_file:
+            json.dump(recorder.to_dict(), trace_file, indent=4)
+    except OSError as error:
+        sys.stderr.write(f"Can't write trace file {target}: {error}\n")
+
+
+def get_trace_target(timings: bool, environ: Mapping[str, str]) -> Optional[str]:
+    """Returns where the timings of the invocation go
+
+    Args:
+        timings (bool): Whether `--timings` was passed
+        environ (Mapping[str, str]): Environment of the process
+
+    Returns:
+        Optional[str]: `stderr`, the path of the trace file or `None` if not tracing
+    """
+    value = environ.get(TRACE_ENV, "")
+    if value and value not in ("0", "1", STDERR_TARGET):
+        return value
+    if timings or value in ("1", STDERR_TARGET):
+        return STDERR_TARGET
+    return None
@@ -1,20 +1,28 @@
-from typing import Optional
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
 import typer
 
-from command_storage.controller.app import get_cmds
 from command_storage.initializer import app
+from command_storage.models import tracing
+from command_storage.models.constants import IMPORT_PROGRESS_MIN_BYTES
 from command_storage.models.enums import arguments as arguments_enums
+from command_storage.models.enums import duplicate_policy as duplicate_policy_enums
 from command_storage.models.enums import error as error_enums
+from command_storage.models.enums import file_format as file_format_enums
+
+if TYPE_CHECKING:  # imports pydantic, which only the commands that read the database need
+    from command_storage.models.database import db_models
 
 _INITIAL_KEY = typer.Option(
-    ...,
+    None,
     arguments_enums.Arguments.KEY.value.long,
     arguments_enums.Arguments.KEY.value.short,
     help=arguments_enums.Arguments.KEY.value.description,
 )
 _INITIAL_COMMAND = typer.Option(
-    ...,
+    None,
     arguments_enums.Arguments.COMMAND.value.long,
     arguments_enums.Arguments.COMMAND.value.short,
     help=arguments_enums.Arguments.COMMAND.value.description,
@@ -25,15 +33,111 @@ _INITIAL_DESCRIPTION = typer.Option(
     arguments_enums.Arguments.DESCRIPTION.value.short,
     help=arguments_enums.Arguments.DESCRIPTION.value.description,
 )
+_INITIAL_FROM_STDIN = typer.Option(
+    False,
+    arguments_enums.Arguments.COMMANDS_FROM_STDIN.value.long,
+    arguments_enums.Arguments.COMMANDS_FROM_STDIN.value.short,
+    help=arguments_enums.Arguments.COMMANDS_FROM_STDIN.value.description,
+)
+_INITIAL_DRY_RUN = typer.Option(
+    False,
+    arguments_enums.Arguments.DRY_RUN.value.long,
+    arguments_enums.Arguments.DRY_RUN.value.short,
+    help=arguments_enums.Arguments.DRY_RUN.value.description,
+)
+_INITIAL_IMPORT_FILE = typer.Argument(
+    ...,
+    help="File to import commands from, '-' for stdin.",
+)
+_INITIAL_FORMAT = typer.Option(
+    None,
+    arguments_enums.Arguments.FORMAT.value.long,
+    arguments_enums.Arguments.FORMAT.value.short,
+    help=arguments_enums.Arguments.FORMAT.value.description,
+)
+_INITIAL_ON_DUPLICATE = typer.Option(
+    duplicate_policy_enums.DuplicatePolicy.FAIL,
+    arguments_enums.Arguments.ON_DUPLICATE.value.long,
+    arguments_enums.Arguments.ON_DUPLICATE.value.short,
+    help=arguments_enums.Arguments.ON_DUPLICATE.value.description,
+)
+
+
+def _validate_store_options(key: Optional[str], command: Optional[str], description: Optional[str], from_stdin: bool) -> None:
+    """Custom validator for `store` command options
+
+    Args:
+        key (Optional[str]): `--key` option
+        command (Optional[str]): `--command` option
+        description (Optional[str]): `--description` option
+        from_stdin (bool): `--from-stdin` option
+
+    Raises:
+        typer.BadParameter: Raised if neither a command nor `--from-stdin` is passed, or
+        both are.
+    """
+    if from_stdin and (key is not None or command is not None or description is not None):
+        raise typer.BadParameter("'--from-stdin' can't be combined with '--key', '--command' or '--description'.")
+    if not from_stdin and (key is None or command is None):
+        raise typer.BadParameter("Either provide '--key' and '--command' or use '--from-stdin' option to store many commands.")
+
+
+def _store_many(commands: "list[db_models.Command]", dry_run: bool) -> None:
+    """Stores new commands with a single write and prints a summary
+
+    Args:
+        commands (list[db_models.Command]): Commands to store, in order
+        dry_run (bool): Whether to only show the commands that would be stored
+
+    Raises:
+        typer.Exit: Raised if nothing could be stored
+    """
+    from command_storage.controller.app import get_cmds
+
+    summary = get_cmds().import_commands(commands, duplicate_policy_enums.DuplicatePolicy.FAIL, dry_run)
+
+    if summary.error != error_enums.Error.SUCCESS:
+        reason = f"key '{summary.duplicate_key}' is already stored" if summary.duplicate_key is not None else f"'{summary.error}'"
+        typer.secho(f"Error in storing the commands, nothing was stored: {reason}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if dry_run:
+        typer.secho(f"Would store {summary.imported} new commands:", fg=typer.colors.CYAN)
+        typer.echo("".join(f"{command.key}\n" for command in commands), nl=False)
+    else:
+        typer.secho(f"Successfully stored {summary.imported} new commands", fg=typer.colors.GREEN)
 
 
 @app.command()
 def store(
-    key: str = _INITIAL_KEY,
-    command: str = _INITIAL_COMMAND,
+    key: Optional[str] = _INITIAL_KEY,
+    command: Optional[str] = _INITIAL_COMMAND,
     description: Optional[str] = _INITIAL_DESCRIPTION,
+    from_stdin: bool = _INITIAL_FROM_STDIN,
+    dry_run: bool = _INITIAL_DRY_RUN,
 ) -> None:
-    """Store a new command into cmds."""
+    """Store a new command into cmds, or many commands read from stdin."""
+    _validate_store_options(key, command, description, from_stdin)
+
+    if from_stdin:
+        from command_storage.controller import importer
+
+        try:
+            commands = list(importer.read_commands("-", file_format_enums.FileFormat.NDJSON))
+        except importer.ImportFileError as error:
+            typer.secho(f"Error in storing the commands, nothing was stored: {error}", fg=typer.colors.RED)
+            raise typer.Exit(1)
+        _store_many(commands, dry_run)
+        return
+
+    if dry_run:
+        from command_storage.models.database import db_models
+
+        _store_many([db_models.Command(key=key, command=command, description=description)], dry_run)
+        return
+
+    from command_storage.controller.app import get_cmds
+
     cmds = get_cmds()
     commands = cmds.add(key, command, description)
 
@@ -48,3 +152,50 @@ def store(
         message=f"Successfully stored the new command: '{commands.error}'",
         fg=typer.colors.GREEN,
     )
+
+
+@app.command(name="import")
+def import_(
+    file: str = _INITIAL_IMPORT_FILE,
+    file_format: Optional[file_format_enums.FileFormat] = _INITIAL_FORMAT,
+    on_duplicate: duplicate_policy_enums.DuplicatePolicy = _INITIAL_ON_DUPLICATE,
+) -> None:
+    """Import commands from a JSON (as written by export), NDJSON or CSV file."""
+    from command_storage.controller import importer
+    from command_storage.controller.app import get_cmds
+
+    if file_format is None:
+        file_format = importer.detect_format(file)
+        if file_format is None:
+            typer.secho("Can't guess the file format from its extension, pass --format", fg=typer.colors.RED)
+            raise typer.Exit(1)
+
+    start = time.perf_counter()
+    try:
+        size = 0 if file == "-" else Path(file).stat().st_size
+    except OSError:
+        size = 0
+    try:
+        with tracing.phase("read import file"):
+            if size >= IMPORT_PROGRESS_MIN_BYTES:
+                with typer.progressbar(length=size, label="Reading", file=typer.get_text_stream("stderr")) as progress:
+                    commands = list(importer.read_commands(file, file_format, progress.update))
+            else:
+                commands = list(importer.read_commands(file, file_format))
+    except importer.ImportFileError as error:
+        typer.secho(f"Error in importing {file}: {error}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    summary = get_cmds().import_commands(commands, on_duplicate)
+    elapsed = time.perf_counter() - start
+
+    if summary.error != error_enums.Error.SUCCESS:
+        reason = f"key '{summary.duplicate_key}' is already stored" if summary.duplicate_key is not None else f"'{summary.error}'"
+        typer.secho(f"Error in importing {file}, nothing was stored: {reason}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    typer.secho(
+        f"Imported {summary.imported} new commands ({summary.overwritten} overwritten, {summary.skipped} skipped) "
+        f"in {elapsed:.2f}s ({len(commands) / max(elapsed, 1e-9):.0f} commands/s)",
+        fg=typer.colors.GREEN,
+    )
@@ -0,0 +1,22 @@
+import typer
+
+from command_storage.initializer import app
+from command_storage.models import daemon_protocol
+from command_storage.models.enums import error as error_enums
+
+
+@app.command()
+def daemon() -> None:
+    """Serves cmds from memory over a Unix domain socket. While it runs, 'list', 'get',
+    'copy', 'store', 'update', 'delete' and 'export' are forwarded to it."""
+    from command_storage.controller import daemon as daemon_controller
+
+    socket_path = daemon_protocol.get_socket_path()
+    create_error, server = daemon_controller.create_server(socket_path)
+
+    if create_error != error_enums.Error.SUCCESS:
+        typer.secho(f"Starting daemon on '{socket_path}' failed with '{create_error}'", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    typer.secho(f"Serving cmds on '{socket_path}'. Press Ctrl+C to stop.", fg=typer.colors.GREEN)
+    daemon_controller.serve(server, socket_path)
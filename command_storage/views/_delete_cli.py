@@ -1,8 +1,7 @@
-from typing import Optional
+from typing import List, Optional, Pattern
 
 import typer
 
-from command_storage.controller.app import get_cmds
 from command_storage.initializer import app
 from command_storage.models.enums import arguments as arguments_enums
 from command_storage.models.enums import error as error_enums
@@ -13,21 +12,75 @@ _INITIAL_DELETE_ALL = typer.Option(
     arguments_enums.Arguments.ALL.value.short,
     help=arguments_enums.Arguments.ALL.value.description,
 )
+_INITIAL_MATCH = typer.Option(
+    None,
+    arguments_enums.Arguments.MATCH.value.long,
+    arguments_enums.Arguments.MATCH.value.short,
+    help=arguments_enums.Arguments.MATCH.value.description,
+)
+_INITIAL_REGEX = typer.Option(
+    False,
+    arguments_enums.Arguments.REGEX.value.long,
+    arguments_enums.Arguments.REGEX.value.short,
+    help=arguments_enums.Arguments.REGEX.value.description,
+)
+_INITIAL_FROM_STDIN = typer.Option(
+    False,
+    arguments_enums.Arguments.KEYS_FROM_STDIN.value.long,
+    arguments_enums.Arguments.KEYS_FROM_STDIN.value.short,
+    help=arguments_enums.Arguments.KEYS_FROM_STDIN.value.description,
+)
+_INITIAL_DRY_RUN = typer.Option(
+    False,
+    arguments_enums.Arguments.DRY_RUN.value.long,
+    arguments_enums.Arguments.DRY_RUN.value.short,
+    help=arguments_enums.Arguments.DRY_RUN.value.description,
+)
 
 
-def _validate_delete_options(key: Optional[str], delete_all: bool) -> None:
+def _validate_delete_options(keys: List[str], delete_all: bool, match: Optional[str], regex: bool, from_stdin: bool) -> None:
     """Custom validator for `delete` command arguments and options
 
     Args:
-        key (Optional[str]): Key argument
+        keys (List[str]): Key arguments
         delete_all (bool): `--all` option
+        match (Optional[str]): `--match` option
+        regex (bool): `--regex` option
+        from_stdin (bool): `--from-stdin` option
 
     Raises:
-        typer.BadParameter: Raised if neither `key` argument not `-all` option are
-        passed.
+        typer.BadParameter: Raised if no key argument or option selecting keys is passed,
+        or if `--all` is combined with them.
     """
-    if not key and not delete_all:
+    selects_keys = bool(keys) or match is not None or from_stdin
+    if not selects_keys and not delete_all:
         raise typer.BadParameter("Either provide a key or use '--all' option to delete all stored commands.")
+    if selects_keys and delete_all:
+        raise typer.BadParameter("'--all' can't be combined with keys, '--match' or '--from-stdin'.")
+    if regex and match is None:
+        raise typer.BadParameter("'--regex' needs a '--match' pattern.")
+
+
+def _compile_pattern(match: str, regex: bool) -> Pattern[str]:
+    """Compiles the `--match` option
+
+    Args:
+        match (str): Glob pattern or regular expression
+        regex (bool): Whether `match` is a regular expression
+
+    Raises:
+        typer.BadParameter: Raised if the regular expression is invalid
+
+    Returns:
+        Pattern[str]: Pattern whole keys are matched against
+    """
+    import fnmatch
+    import re
+
+    try:
+        return re.compile(match if regex else fnmatch.translate(match))
+    except re.error as error:
+        raise typer.BadParameter(f"Invalid regular expression '{match}': {error}")
 
 
 def _confirm_delete_all() -> bool:
@@ -36,33 +89,96 @@ def _confirm_delete_all() -> bool:
     return confirmation
 
 
+def _delete_single(key: str) -> None:
+    """Deletes a single stored command by its key
+
+    Args:
+        key (str): Key that needs to be deleted
+    """
+    from command_storage.controller.app import get_cmds
+
+    cmds = get_cmds()
+    delete_error = cmds.delete(key, False)
+
+    if delete_error == error_enums.Error.SUCCESS:
+        typer.secho(f"Successfully deleted key: '{key}': '{delete_error}'", fg=typer.colors.GREEN)
+    else:
+        typer.secho(f"Error in deleting key: '{key}': '{delete_error}'", fg=typer.colors.RED)
+
+
+def _delete_many(keys: List[str], pattern: Optional[Pattern[str]], dry_run: bool) -> None:
+    """Deletes the given keys and the keys matching the pattern with a single write and
+    prints a summary
+
+    Args:
+        keys (List[str]): Keys that need to be deleted
+        pattern (Optional[Pattern[str]]): Pattern whole keys are matched against
+        dry_run (bool): Whether to only show the keys that would be deleted
+
+    Raises:
+        typer.Exit: Raised if nothing could be deleted
+    """
+    from command_storage.controller.app import get_cmds
+
+    delete_error, selected = get_cmds().delete_matching(keys, pattern, dry_run)
+
+    if delete_error == error_enums.Error.NON_EXISTENT_KEY_ERROR:
+        missing = ", ".join(f"'{key}'" for key in selected)
+        typer.secho(f"Error in deleting keys, nothing was deleted: keys not stored: {missing}", fg=typer.colors.RED)
+        raise typer.Exit(1)
+    if delete_error != error_enums.Error.SUCCESS:
+        typer.secho(f"Error in deleting keys, nothing was deleted: '{delete_error}'", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    if not selected:
+        typer.secho("No stored command matches, nothing was deleted", fg=typer.colors.CYAN)
+    elif dry_run:
+        typer.secho(f"Would delete {len(selected)} commands:", fg=typer.colors.CYAN)
+        typer.echo("".join(f"{key}\n" for key in selected), nl=False)
+    else:
+        typer.secho(f"Successfully deleted {len(selected)} commands", fg=typer.colors.GREEN)
+
+
 @app.command()
-def delete(key: Optional[str] = typer.Argument(None), delete_all: bool = _INITIAL_DELETE_ALL) -> None:
-    """Allows deletion of stored command by key"""
-    _validate_delete_options(key, delete_all)
+def delete(
+    keys: Optional[List[str]] = typer.Argument(None),
+    delete_all: bool = _INITIAL_DELETE_ALL,
+    match: Optional[str] = _INITIAL_MATCH,
+    regex: bool = _INITIAL_REGEX,
+    from_stdin: bool = _INITIAL_FROM_STDIN,
+    dry_run: bool = _INITIAL_DRY_RUN,
+) -> None:
+    """Allows deletion of stored commands by key, by pattern or all of them"""
+    keys = list(keys or [])
+    _validate_delete_options(keys, delete_all, match, regex, from_stdin)
+    pattern = _compile_pattern(match, regex) if match is not None else None
+
+    if from_stdin:
+        keys.extend(line.rstrip("\r\n") for line in typer.get_text_stream("stdin") if line.strip())
+
+    if not delete_all:
+        if len(keys) == 1 and pattern is None and not from_stdin and not dry_run:
+            _delete_single(keys[0])
+        else:
+            _delete_many(keys, pattern, dry_run)
+        return
+
+    if dry_run:
+        import re
 
-    if delete_all and not _confirm_delete_all():
+        _delete_many([], re.compile(".*", re.DOTALL), dry_run)
+        return
+
+    if not _confirm_delete_all():
         typer.secho("Aborted. No data has been deleted.", fg=typer.colors.CYAN)
         return
 
+    from command_storage.controller.app import get_cmds
+
     cmds = get_cmds()
-    delete_error = cmds.delete(key, delete_all)
+    delete_error = cmds.delete(None, delete_all)
 
     if delete_error == error_enums.Error.SUCCESS:
-        if delete_all:
-            msg = "Successfully deleted all stored commands"
-        else:
-            msg = f"Successfully deleted key: '{key}': '{delete_error}'"
-        typer.secho(
-            msg,
-            fg=typer.colors.GREEN,
-        )
+        typer.secho("Successfully deleted all stored commands", fg=typer.colors.GREEN)
     else:
-        if delete_all:
-            msg = "Error in deleting all stored commands: '{delete_error}'"
-        else:
-            msg = f"Error in deleting key: '{key}': '{delete_error}'"
-        typer.secho(
-            msg,
-            fg=typer.colors.RED,
-        )
+        typer.secho(f"Error in deleting all stored commands: '{delete_error}'", fg=typer.colors.RED)
@@ -0,0 +1,84 @@
+import typer
+
+from command_storage.initializer import app
+from command_storage.models.constants import DEFAULT_SHARD_COUNT
+from command_storage.models.enums import arguments as arguments_enums
+from command_storage.models.enums import error as error_enums
+from command_storage.models.enums import shard_by as shard_by_enums
+
+cache_app = typer.Typer(help="Manage caches kept next to the database.")
+app.add_typer(cache_app, name="cache")
+
+_INITIAL_SHARDS = typer.Option(
+    DEFAULT_SHARD_COUNT,
+    arguments_enums.Arguments.SHARDS.value.long,
+    arguments_enums.Arguments.SHARDS.value.short,
+    min=1,
+    help=arguments_enums.Arguments.SHARDS.value.description,
+)
+_INITIAL_SHARD_BY = typer.Option(
+    shard_by_enums.ShardBy.HASH,
+    arguments_enums.Arguments.SHARD_BY.value.long,
+    arguments_enums.Arguments.SHARD_BY.value.short,
+    help=arguments_enums.Arguments.SHARD_BY.value.description,
+)
+
+
+@app.command()
+def compact() -> None:
+    """Compacts the database. Folds the log of the 'jsonlog' engine into its snapshot."""
+    from command_storage.controller.app import get_cmds
+
+    cmds = get_cmds()
+    compact_error = cmds.compact()
+
+    if compact_error == error_enums.Error.SUCCESS:
+        typer.secho(f"Successfully compacted the database: '{compact_error}'", fg=typer.colors.GREEN)
+    else:
+        typer.secho(f"Error in compacting the database: '{compact_error}'", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+
+@app.command()
+def check() -> None:
+    """Fully validates every stored command. Regular commands trust the database."""
+    from command_storage.controller.app import get_cmds
+
+    cmds = get_cmds()
+    check_error = cmds.check()
+
+    if check_error == error_enums.Error.SUCCESS:
+        typer.secho(f"Database is valid: '{check_error}'", fg=typer.colors.GREEN)
+    else:
+        typer.secho(f"Database is invalid: '{check_error}'", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+
+@app.command()
+def reshard(shards: int = _INITIAL_SHARDS, shard_by: shard_by_enums.ShardBy = _INITIAL_SHARD_BY) -> None:
+    """Redistributes the commands of a 'sharded' database over a new set of shard files."""
+    from command_storage.controller.app import get_cmds
+
+    cmds = get_cmds()
+    reshard_error = cmds.reshard(shards, shard_by)
+
+    if reshard_error == error_enums.Error.SUCCESS:
+        typer.secho(f"Successfully resharded the database into {shards} shards by {shard_by.value}: '{reshard_error}'", fg=typer.colors.GREEN)
+    else:
+        typer.secho(f"Error in resharding the database: '{reshard_error}'", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+
+@cache_app.command("clear")
+def cache_clear() -> None:
+    """Removes caches kept next to the database. They are rebuilt on the next read."""
+    from command_storage.controller.app import get_cmds
+
+    cmds = get_cmds()
+    clear_error = cmds.clear_cache()
+
+    if clear_error == error_enums.Error.SUCCESS:
+        typer.secho(f"Successfully cleared the cache: '{clear_error}'", fg=typer.colors.GREEN)
+    else:
+        typer.secho(f"Error in clearing the cache: '{clear_error}'", fg=typer.colors.RED)
+        raise typer.Exit(1)
@@ -1,19 +1,22 @@
-import os
+import shutil
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-import pyperclip
 import typer
-from tabulate import tabulate
 
-from command_storage.controller.app import get_cmds
 from command_storage.initializer import app
+from command_storage.models import tracing
 from command_storage.models.constants import DEFAULT_LIST_LIMIT
 from command_storage.models.enums import arguments as arguments_enums
+from command_storage.models.enums import compression as compression_enums
 from command_storage.models.enums import error as error_enums
+from command_storage.models.enums import file_format as file_format_enums
+from command_storage.models.enums import output_format as output_format_enums
+from command_storage.models.enums import search_field as search_field_enums
 
-DEFAULT_FILE_LOCATION = Path().joinpath(f"command_storage_export_{datetime.now()}.json")
+DEFAULT_FILE_LOCATION_TEMPLATE = "command_storage_export_{timestamp}.{extension}"
 
 _INITIAL_KEY = typer.Argument(
     None,
@@ -25,11 +28,42 @@ _INITIAL_LIMIT = typer.Option(
     arguments_enums.Arguments.LIMIT.value.short,
     help=arguments_enums.Arguments.LIMIT.value.description,
 )
+_INITIAL_FIELDS = typer.Option(
+    search_field_enums.SearchField.KEY.value,
+    arguments_enums.Arguments.FIELDS.value.long,
+    arguments_enums.Arguments.FIELDS.value.short,
+    help=arguments_enums.Arguments.FIELDS.value.description,
+)
+_INITIAL_OUTPUT_FORMAT = typer.Option(
+    output_format_enums.OutputFormat.TABLE.value,
+    arguments_enums.Arguments.OUTPUT_FORMAT.value.long,
+    arguments_enums.Arguments.OUTPUT_FORMAT.value.short,
+    help=arguments_enums.Arguments.OUTPUT_FORMAT.value.description,
+)
+_INITIAL_NO_PAGER = typer.Option(
+    False,
+    arguments_enums.Arguments.NO_PAGER.value.long,
+    arguments_enums.Arguments.NO_PAGER.value.short,
+    help=arguments_enums.Arguments.NO_PAGER.value.description,
+)
 _INITIAL_FILE = typer.Option(
-    DEFAULT_FILE_LOCATION,
+    None,
     arguments_enums.Arguments.FILE.value.long,
     arguments_enums.Arguments.FILE.value.short,
     help=arguments_enums.Arguments.FILE.value.description,
+    show_default=DEFAULT_FILE_LOCATION_TEMPLATE.format(timestamp="<timestamp>", extension="<format>[.gz]"),
+)
+_INITIAL_FORMAT = typer.Option(
+    None,
+    arguments_enums.Arguments.FORMAT.value.long,
+    arguments_enums.Arguments.FORMAT.value.short,
+    help=arguments_enums.Arguments.FORMAT.value.description,
+)
+_INITIAL_COMPRESS = typer.Option(
+    None,
+    arguments_enums.Arguments.COMPRESS.value.long,
+    arguments_enums.Arguments.COMPRESS.value.short,
+    help=arguments_enums.Arguments.COMPRESS.value.description,
 )
 _INITIAL_COPY_KEY = typer.Argument(
     None,
@@ -38,13 +72,27 @@ _INITIAL_COPY_KEY = typer.Argument(
 
 
 @app.command()
-def list(key: Optional[str] = _INITIAL_KEY, limit: int = _INITIAL_LIMIT) -> None:
-    """Show list of all stored commands. Also supports fuzzy matching on key. Run 'cmds
-    list --help' to see how."""
+def list(
+    key: Optional[str] = _INITIAL_KEY,
+    limit: int = _INITIAL_LIMIT,
+    fields: str = _INITIAL_FIELDS,
+    output_format: output_format_enums.OutputFormat = _INITIAL_OUTPUT_FORMAT,
+    no_pager: bool = _INITIAL_NO_PAGER,
+) -> None:
+    """Show list of all stored commands. Also supports fuzzy matching on key, command and
+    description. Run 'cmds list --help' to see how."""
+    try:
+        search_fields = [search_field_enums.SearchField(field.strip()) for field in fields.split(",")]
+    except ValueError:
+        valid_fields = ", ".join(field.value for field in search_field_enums.SearchField)
+        raise typer.BadParameter(f"'{fields}' is not a comma separated list of: {valid_fields}.")
+
+    from command_storage.controller.app import get_cmds
+
     cmds = get_cmds()
 
     if key:
-        all_commands = cmds.list_fuzzy(key, limit)
+        all_commands = cmds.list_fuzzy(key, limit, search_fields)
     else:
         all_commands = cmds.list(limit)
 
@@ -52,6 +100,21 @@ def list(key: Optional[str] = _INITIAL_KEY, limit: int = _INITIAL_LIMIT) -> None
         typer.secho(f"Error in fetching commands: '{all_commands.error}'", fg=typer.colors.RED)
         raise typer.Exit(1)
 
+    from command_storage.views import rendering
+
+    if output_format != output_format_enums.OutputFormat.TABLE:
+        # no layout and no messages, an empty result is an empty list or no lines
+        with tracing.phase(f"render {output_format.value}"):
+            if output_format == output_format_enums.OutputFormat.TSV:
+                rendering.write_tsv(sys.stdout, all_commands.commands.values())
+            else:
+                from command_storage.controller import exporter
+
+                exporter.write_commands(sys.stdout, all_commands.commands.values(), file_format_enums.FileFormat(output_format.value))
+                if output_format == output_format_enums.OutputFormat.JSON:
+                    sys.stdout.write("\n")
+        return
+
     if len(all_commands.commands) == 0:
         if key:
             msg = f"There are no commands in cmds matching with {key}"
@@ -60,74 +123,96 @@ def list(key: Optional[str] = _INITIAL_KEY, limit: int = _INITIAL_LIMIT) -> None
         typer.secho(msg, fg=typer.colors.RED)
         raise typer.Exit()
 
-    # echo commands
-    table = []
-    headers = ["Key", "Command", "Description"]
-    terminal_width_columns: int = os.get_terminal_size().columns
+    with tracing.phase("render table"):
+        terminal_size = shutil.get_terminal_size()
+        pages = rendering.iter_table(rendering.get_rows(all_commands.commands.values()), terminal_size.columns // 4)
 
-    for key, command in all_commands.commands.items():
-        _command = command.command
-        description = command.description
-        row = [f"'{key}'", f"'{_command}'", f"'{description}'" if description else ""]
-        table.append(row)
+        # every row takes at least two lines, so this is a lower bound of the table height
+        if not no_pager and sys.stdout.isatty() and 2 * len(all_commands.commands) + 3 > terminal_size.lines:
+            import click
 
-    typer.secho(
-        tabulate(
-            table,
-            headers=headers,
-            tablefmt="grid",
-            maxcolwidths=[int(terminal_width_columns // 4), int(terminal_width_columns // 4), int(terminal_width_columns // 4)],
-        ),
-        fg=typer.colors.CYAN,
-    )
+            click.echo_via_pager(typer.style(page, fg=typer.colors.CYAN) + "\n" for page in pages)
+        else:
+            for page in pages:
+                typer.secho(page, fg=typer.colors.CYAN)
 
 
 @app.command()
-def export(file: str = _INITIAL_FILE) -> None:
-    """Exports all stored commands into a JSON file."""
+def export(
+    file: Optional[str] = _INITIAL_FILE,
+    file_format: Optional[file_format_enums.FileFormat] = _INITIAL_FORMAT,
+    compress: Optional[compression_enums.Compression] = _INITIAL_COMPRESS,
+) -> None:
+    """Exports all stored commands into a JSON, NDJSON or CSV file, or stdout with '-f -'."""
+    from command_storage.controller import importer
+
+    if file is not None:
+        file_format = file_format or importer.detect_format(file)
+        if compress is None and importer.is_compressed(file):
+            compress = compression_enums.Compression.GZIP
+    file_format = file_format or file_format_enums.FileFormat.JSON
+    if file is None:
+        extension = file_format.value + (".gz" if compress is not None else "")
+        file = str(Path().joinpath(DEFAULT_FILE_LOCATION_TEMPLATE.format(timestamp=datetime.now(), extension=extension)))
+
+    from command_storage.controller.app import get_cmds
+
     cmds = get_cmds()
-    all_commands = cmds.list(0)
+    export_error, count = cmds.export(file, file_format, compress)
+    to_stdout = file == "-"  # keep messages out of the exported data
 
-    if all_commands.error != error_enums.Error.SUCCESS:
-        typer.secho(f"Error in fetching commands: '{all_commands.error}'", fg=typer.colors.RED)
+    if export_error != error_enums.Error.SUCCESS:
+        typer.secho(f"Exporting file to path: {file} failed with '{export_error}'", fg=typer.colors.RED, err=to_stdout)
         raise typer.Exit(1)
 
-    if len(all_commands.commands) == 0:
-        msg = "There are no commands in cmds"
-        typer.secho(msg, fg=typer.colors.RED)
+    if count == 0:
+        typer.secho("There are no commands in cmds", fg=typer.colors.RED, err=to_stdout)
         raise typer.Exit()
 
-    export_error = cmds.export_json(all_commands, file)
+    typer.secho(f"Successfully exported {count} commands to path: {file}: '{export_error}'", fg=typer.colors.GREEN, err=to_stdout)
 
-    if export_error == error_enums.Error.SUCCESS:
-        typer.secho(
-            f"Successfully exported file to path: {file}: '{export_error}'",
-            fg=typer.colors.GREEN,
-        )
-    else:
-        typer.secho(
-            f"Exporting file to path: {file} failed with '{export_error}'",
-            fg=typer.colors.RED,
-        )
+
+@app.command()
+def get(key: str = _INITIAL_COPY_KEY) -> None:
+    """Prints a command by its key, e.g. to run it with '$(cmds get <key>)'."""
+    from command_storage.controller.app import get_cmds
+
+    cmds = get_cmds()
+
+    commands = cmds.get(key)
+
+    if commands.error == error_enums.Error.NON_EXISTENT_KEY_ERROR:
+        typer.secho(f"There is no commands in cmds with key {key}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(1)
+
+    if commands.error != error_enums.Error.SUCCESS:
+        typer.secho(f"Error in fetching commands: '{commands.error}'", fg=typer.colors.RED, err=True)
+        raise typer.Exit(1)
+
+    typer.echo(commands.commands[key].command)
 
 
 @app.command()
 def copy(key: str = _INITIAL_COPY_KEY) -> None:
     """Allows copying a command by its key."""
+    from command_storage.controller.app import get_cmds
+
     cmds = get_cmds()
 
-    all_commands = cmds.list(0)
+    commands = cmds.get(key)
 
-    if all_commands.error != error_enums.Error.SUCCESS:
-        typer.secho(f"Error in fetching commands: '{all_commands.error}'", fg=typer.colors.RED)
-        raise typer.Exit(1)
-
-    if key not in all_commands.commands:
+    if commands.error == error_enums.Error.NON_EXISTENT_KEY_ERROR:
         msg = f"There is no commands in cmds with key {key}"
         typer.secho(msg, fg=typer.colors.RED)
         raise typer.Exit()
 
-    pyperclip.copy(all_commands.commands[key].command)
+    if commands.error != error_enums.Error.SUCCESS:
+        typer.secho(f"Error in fetching commands: '{commands.error}'", fg=typer.colors.RED)
+        raise typer.Exit(1)
+
+    import pyperclip
+
+    pyperclip.copy(commands.commands[key].command)
 
     typer.secho(
         "Copied",
@@ -2,7 +2,6 @@ from typing import Annotated
 
 import typer
 
-from command_storage.controller.app import get_cmds
 from command_storage.initializer import app
 from command_storage.models.enums import arguments as arguments_enums
 from command_storage.models.enums import error as error_enums
@@ -32,6 +31,8 @@ def update(
     orig_key: Annotated[str, typer.Argument(...)], new_key: str = _INITIAL_NEW_KEY, command: str = _INITIAL_COMMAND, description: str = _INITIAL_DESCRIPTION
 ) -> None:
     """Allows updating a stored command by its key. Also supports changing the key."""
+    from command_storage.controller.app import get_cmds
+
     cmds = get_cmds()
 
     update_error = cmds.update(orig_key, new_key, command, description)
@@ -1,21 +1,34 @@
-"""This module provides the commands-store CLI."""
+"""This module provides the commands-store CLI.
 
+Every `cmds` invocation imports this module, so the view modules import the controller and
+heavy dependencies (pydantic, thefuzz, pyperclip) inside the commands that use
+them. `tests/test_startup.py` guards this.
+"""
+
+import contextlib
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import typer
 
 from command_storage.controller import config
 from command_storage.initializer import app
-from command_storage.models.constants import APP_NAME, VERSION
-from command_storage.models.database.json_wrapper import (
+from command_storage.models import tracing
+from command_storage.models.constants import (
+    APP_NAME,
     DEFAULT_DB_FILE_PATH,
-    init_database,
+    DEFAULT_SHARD_COUNT,
+    VERSION,
 )
 from command_storage.models.enums import arguments as arguments_enums
+from command_storage.models.enums import engine as engine_enums
 from command_storage.models.enums import error as error_enums
+from command_storage.models.enums import shard_by as shard_by_enums
 from command_storage.views._create_cli import *  # noqa: F401 # NOSONAR
+from command_storage.views._daemon_cli import *  # noqa: F401 # NOSONAR
 from command_storage.views._delete_cli import *  # noqa: F401 # NOSONAR
+from command_storage.views._maintenance_cli import *  # noqa: F401 # NOSONAR
 from command_storage.views._read_cli import *  # noqa: F401 # NOSONAR
 from command_storage.views._update_cli import *  # noqa: F401 # NOSONAR
 
@@ -25,26 +38,82 @@ _INITIAL_DB_PATH = typer.Option(
     arguments_enums.Arguments.DB_PATH.value.short,
     prompt=arguments_enums.Arguments.DB_PATH.value.description,
 )
+_INITIAL_ENGINE = typer.Option(
+    engine_enums.Engine.JSON,
+    arguments_enums.Arguments.ENGINE.value.long,
+    arguments_enums.Arguments.ENGINE.value.short,
+    help=arguments_enums.Arguments.ENGINE.value.description,
+)
+_INITIAL_MIGRATE_FROM = typer.Option(
+    None,
+    arguments_enums.Arguments.MIGRATE_FROM.value.long,
+    arguments_enums.Arguments.MIGRATE_FROM.value.short,
+    help=arguments_enums.Arguments.MIGRATE_FROM.value.description,
+)
+_INITIAL_SHARDS = typer.Option(
+    None,
+    arguments_enums.Arguments.SHARDS.value.long,
+    arguments_enums.Arguments.SHARDS.value.short,
+    min=1,
+    help=f"{arguments_enums.Arguments.SHARDS.value.description} [default: {DEFAULT_SHARD_COUNT}]",
+)
+_INITIAL_SHARD_BY = typer.Option(
+    None,
+    arguments_enums.Arguments.SHARD_BY.value.long,
+    arguments_enums.Arguments.SHARD_BY.value.short,
+    help=f"{arguments_enums.Arguments.SHARD_BY.value.description} [default: {shard_by_enums.ShardBy.HASH.value}]",
+)
+_INITIAL_NO_CACHE = typer.Option(
+    False,
+    arguments_enums.Arguments.NO_CACHE.value.long,
+    arguments_enums.Arguments.NO_CACHE.value.short,
+    help=arguments_enums.Arguments.NO_CACHE.value.description,
+)
 
 
 @app.command()
 def init(
     db_path: str = _INITIAL_DB_PATH,
+    engine: engine_enums.Engine = _INITIAL_ENGINE,
+    migrate_from: Optional[str] = _INITIAL_MIGRATE_FROM,
+    no_cache: bool = _INITIAL_NO_CACHE,
+    shards: Optional[int] = _INITIAL_SHARDS,
+    shard_by: Optional[shard_by_enums.ShardBy] = _INITIAL_SHARD_BY,
 ) -> None:
     """Initialize the application. One time process and overwrites existing config and
     data files.
 
     Args:
         db_path (str, optional): `--db-path` argument. Defaults to _INITIAL_DB_PATH.
+        engine (engine_enums.Engine, optional): `--engine` argument. Defaults to
+        _INITIAL_ENGINE.
+        migrate_from (Optional[str], optional): `--migrate-from` argument. Defaults to
+        _INITIAL_MIGRATE_FROM.
+        no_cache (bool, optional): `--no-cache` argument. Defaults to _INITIAL_NO_CACHE.
+        shards (Optional[int], optional): `--shards` argument. Defaults to
+        _INITIAL_SHARDS.
+        shard_by (Optional[shard_by_enums.ShardBy], optional): `--shard-by` argument.
+        Defaults to _INITIAL_SHARD_BY.
 
     Raises:
+        typer.BadParameter: If `--migrate-from` is used with an engine other than SQLite
+        or sharded, or the shard options with an engine other than sharded
         typer.Exit: If error in app initialization
         typer.Exit: if error in database file initialization
+        typer.Exit: if error in database migration
     """
+    if migrate_from and engine not in (engine_enums.Engine.SQLITE, engine_enums.Engine.SHARDED):
+        raise typer.BadParameter("'--migrate-from' is only supported with '--engine sqlite' and '--engine sharded'.")
+    if (shards is not None or shard_by is not None) and engine != engine_enums.Engine.SHARDED:
+        raise typer.BadParameter("'--shards' and '--shard-by' are only supported with '--engine sharded'.")
+
+    from command_storage.models.database import shard_wrapper, sqlite_wrapper
+    from command_storage.models.database.db_handler import get_db_handler, init_database
+
     db_path_obj = Path(db_path)
 
     # Initialize application
-    app_init_error = config.initialize_app(db_path_obj)
+    app_init_error = config.initialize_app(db_path_obj, engine, not no_cache)
     if app_init_error != error_enums.Error.SUCCESS:
         typer.secho(
             f"Creating config file failed with '{app_init_error}'",
@@ -53,15 +122,35 @@ def init(
         raise typer.Exit(1)
 
     # Initialize database file
-    db_init_error = init_database(Path(db_path_obj))
+    db_init_error = init_database(Path(db_path_obj), engine, shards or DEFAULT_SHARD_COUNT, shard_by or shard_by_enums.ShardBy.HASH)
     if db_init_error != error_enums.Error.SUCCESS:
         typer.secho(
             f"Creating database failed with '{db_init_error}'",
             fg=typer.colors.RED,
         )
         raise typer.Exit(1)
-    else:
-        typer.secho(f"The cmds is successfully initialized '{db_path_obj};", fg=typer.colors.GREEN)
+
+    # Migrate existing JSON database
+    if migrate_from:
+        migrate_from_json = shard_wrapper.migrate_from_json if engine == engine_enums.Engine.SHARDED else sqlite_wrapper.migrate_from_json
+        migrate_error = migrate_from_json(Path(migrate_from), db_path_obj)
+        if migrate_error != error_enums.Error.SUCCESS:
+            typer.secho(
+                f"Migrating database '{migrate_from}' failed with '{migrate_error}'",
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(1)
+
+    # Fully validate the (possibly pre-existing) database once, later reads trust it
+    check_error = get_db_handler(db_path_obj, engine, not no_cache).check()
+    if check_error != error_enums.Error.SUCCESS:
+        typer.secho(
+            f"Validating database failed with '{check_error}'",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(1)
+
+    typer.secho(f"The cmds is successfully initialized '{db_path_obj};", fg=typer.colors.GREEN)
 
 
 def _version_callback(value: bool) -> None:
@@ -77,7 +166,7 @@ def _version_callback(value: bool) -> None:
         typer.secho(f"{APP_NAME} v{VERSION}", fg=typer.colors.CYAN)
         raise typer.Exit()
 
-    typer.secho("Welcome to command-storage. Run 'cmds --help' to get help.", fg=typer.colors.CYAN)
+    typer.secho("Welcome to command-storage. Run 'cmds --help' to get help.", fg=typer.colors.CYAN, err=True)  # keeps stdout for data
 
 
 _INITIAL_VERSION = typer.Option(
@@ -90,15 +179,75 @@ _INITIAL_VERSION = typer.Option(
 )
 
 
+_INITIAL_TIMINGS = typer.Option(
+    False,
+    arguments_enums.Arguments.TIMINGS.value.long,
+    arguments_enums.Arguments.TIMINGS.value.short,
+    help=arguments_enums.Arguments.TIMINGS.value.description,
+)
+_INITIAL_PROFILE = typer.Option(
+    None,
+    arguments_enums.Arguments.PROFILE.value.long,
+    arguments_enums.Arguments.PROFILE.value.short,
+    help=arguments_enums.Arguments.PROFILE.value.description,
+)
+
+
+@contextlib.contextmanager
+def _instrumented(name: str, trace_target: Optional[str], profile: Optional[str]) -> Iterator[None]:
+    """Records the phases and (or) profiles the command run inside the context
+
+    Args:
+        name (str): Name of the command
+        trace_target (Optional[str]): `stderr` or the trace file to write the phases to,
+        `None` to not record them
+        profile (Optional[str]): File to dump the cProfile stats to, `None` to not profile
+    """
+    recorder = tracing.start() if trace_target is not None else None
+    profiler = None
+    if profile is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+    try:
+        with tracing.phase(name):
+            if profiler is None:
+                yield
+            else:
+                with profiler:
+                    yield
+    finally:
+        tracing.stop()
+        if recorder is not None and trace_target is not None:
+            tracing.write_trace(recorder, trace_target)
+        if profiler is not None and profile is not None:
+            try:
+                profiler.dump_stats(profile)
+            except OSError as error:
+                typer.secho(f"Can't write profile {profile}: {error}", fg=typer.colors.RED, err=True)
+
+
 @app.callback(invoke_without_command=True)
-def version(version: Optional[bool] = _INITIAL_VERSION) -> None:
-    """Returns version of the application. Written to help with unittest cases.
+def version(
+    ctx: typer.Context,
+    version: Optional[bool] = _INITIAL_VERSION,
+    timings: bool = _INITIAL_TIMINGS,
+    profile: Optional[str] = _INITIAL_PROFILE,
+) -> None:
+    """Returns version of the application. Written to help with unittest cases. Also
+    starts the opt-in instrumentation of the command.
 
     Args:
+        ctx (typer.Context): Context of the invocation
         version (Optional[bool], optional): Version of application. Defaults to
         _INITIAL_VERSION.
+        timings (bool, optional): `--timings` argument. Defaults to _INITIAL_TIMINGS.
+        profile (Optional[str], optional): `--profile` argument. Defaults to
+        _INITIAL_PROFILE.
     """
-    pass
+    trace_target = tracing.get_trace_target(timings, os.environ)
+    if trace_target is not None or profile is not None:
+        ctx.with_resource(_instrumented(ctx.invoked_subcommand or APP_NAME, trace_target, profile))
 
 
 if __name__ == "__main__":
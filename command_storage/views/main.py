@@ -0,0 +1,78 @@
+"""Entry point of the `cmds` executable.
+
+While `cmds daemon` runs, command lines it serves are forwarded to it over its socket,
+which skips importing the application and reading the database. Everything else, and
+everything while no daemon runs, is handled in-process by `command_storage.views.cli`.
+Only the standard library is imported before deciding.
+"""
+
+import os
+import socket
+import sys
+from typing import Optional
+
+from command_storage.models import daemon_protocol, tracing
+from command_storage.models.constants import APP_NAME
+
+
+def _terminal_columns() -> int:
+    """Returns the width of the terminal the output goes to
+
+    Returns:
+        int: Number of columns
+    """
+    try:
+        return os.get_terminal_size(sys.stdout.fileno()).columns
+    except (AttributeError, OSError, ValueError):  # not a terminal
+        return int(os.environ.get("COLUMNS", "80"))
+
+
+def forward(argv: list[str]) -> Optional[int]:
+    """Runs the command line through the daemon
+
+    Args:
+        argv (list[str]): Command line arguments without the program name
+
+    Returns:
+        Optional[int]: Exit code of the command, `None` if the daemon can't run it
+    """
+    socket_path = daemon_protocol.get_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not daemon_protocol.is_forwarded(argv) or not socket_path.exists():
+        return None
+    if os.environ.get(tracing.TRACE_ENV):  # the phases to trace run in this process only
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(socket_path))
+        except OSError:  # socket left behind by a daemon that is gone
+            return None
+
+        try:
+            daemon_protocol.send_message(
+                connection,
+                {"argv": argv, "cwd": os.getcwd(), "color": sys.stdout.isatty(), "columns": _terminal_columns()},
+            )
+            response = daemon_protocol.receive_message(connection)
+        except (OSError, ValueError) as error:  # the command may have run, don't run it again
+            sys.stderr.write(f"Lost connection to cmds daemon: {error}\n")
+            return 1
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    return int(response.get("code", 1))
+
+
+def main() -> None:
+    """Runs `cmds`"""
+    code = forward(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+
+    from command_storage.views.cli import app
+
+    app(prog_name=APP_NAME)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Renderers of the commands `cmds list` prints.
+
+Tables are laid out a page of `LIST_PAGE_SIZE` rows at a time, so the first rows are
+printed before the later ones are wrapped and a long table can be streamed into a pager.
+The first page fixes the column widths and cells of later pages are wrapped to them. A
+table of a single page looks exactly like the `grid` format of `tabulate`, which `cmds list`
+used to print. TSV output has one command per line with the key, the command and the
+description separated by tabs.
+"""
+
+import textwrap
+from typing import IO, Iterable, Iterator, Sequence
+
+from command_storage.models.constants import LIST_PAGE_SIZE
+from command_storage.models.database import db_models
+
+HEADERS = ("Key", "Command", "Description")
+_MIN_PADDING = 2  # room around headers, as `tabulate` leaves
+_TSV_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def get_rows(commands: Iterable[db_models.Command]) -> Iterator[tuple[str, str, str]]:
+    """Yields the table rows of the commands
+
+    Args:
+        commands (Iterable[db_models.Command]): Commands to show
+
+    Yields:
+        Iterator[tuple[str, str, str]]: Quoted key, command and description
+    """
+    for command in commands:
+        yield f"'{command.key}'", f"'{command.command}'", f"'{command.description}'" if command.description else ""
+
+
+class _TextWrapper(textwrap.TextWrapper):
+    """Text wrapper breaking words longer than a line at the line end, as `tabulate` does,
+    instead of after their last hyphen
+    """
+
+    def _handle_long_word(self, reversed_chunks: list[str], cur_line: list[str], cur_len: int, width: int) -> None:
+        space_left = width - cur_len if width >= 1 else 1
+        if space_left > 0:
+            chunk = reversed_chunks[-1]
+            cur_line.append(chunk[:space_left])
+            reversed_chunks[-1] = chunk[space_left:]
+        elif not cur_line:
+            cur_line.append(reversed_chunks.pop())
+
+
+def _wrap(cell: str, width: int) -> list[str]:
+    """Returns the lines of the cell wrapped to the width
+
+    Args:
+        cell (str): Text of the cell
+        width (int): Maximum line length
+
+    Returns:
+        list[str]: Lines of the cell, one empty line for an empty cell. Blank lines are
+        dropped.
+    """
+    if len(cell) <= width and cell.isprintable():
+        return [cell]
+    wrapper = _TextWrapper(width)
+    return [wrapped for line in cell.splitlines() if line.strip() for wrapped in wrapper.wrap(line)] or [""]
+
+
+def _format_row(cells: Sequence[list[str]], widths: Sequence[int]) -> str:
+    """Returns the lines of a row of wrapped cells, padded to the column widths
+
+    Args:
+        cells (Sequence[list[str]]): Lines of every cell
+        widths (Sequence[int]): Width of every column
+
+    Returns:
+        str: Lines of the row
+    """
+    height = max(len(lines) for lines in cells)
+    return "\n".join(
+        "| " + " | ".join((lines[index] if index < len(lines) else "").ljust(width) for lines, width in zip(cells, widths)) + " |" for index in range(height)
+    )
+
+
+def _get_separator(widths: Sequence[int], character: str) -> str:
+    """Returns a horizontal border of the table
+
+    Args:
+        widths (Sequence[int]): Width of every column
+        character (str): Character the border is drawn with
+
+    Returns:
+        str: Border line
+    """
+    return "+" + "+".join(character * (width + 2) for width in widths) + "+"
+
+
+def _fix_widths(page: list[list[list[str]]]) -> list[int]:
+    """Returns the column widths fitting the headers and the wrapped cells of the page
+
+    Args:
+        page (list[list[list[str]]]): Lines of every cell of every row
+
+    Returns:
+        list[int]: Width of every column
+    """
+    widths = [len(header) + _MIN_PADDING for header in HEADERS]
+    for cells in page:
+        for column, lines in enumerate(cells):
+            widths[column] = max(widths[column], *(len(line) for line in lines))
+    return widths
+
+
+def _format_header(widths: Sequence[int], separator: str) -> str:
+    """Returns the header lines of the table
+
+    Args:
+        widths (Sequence[int]): Width of every column
+        separator (str): Line separating rows
+
+    Returns:
+        str: Lines from the top border to the line below the headers
+    """
+    return "\n".join((separator, _format_row([[header] for header in HEADERS], widths), _get_separator(widths, "=")))
+
+
+def iter_table(rows: Iterable[Sequence[str]], max_width: int, page_size: int = LIST_PAGE_SIZE) -> Iterator[str]:
+    """Yields a grid table of the rows, one page of rows at a time
+
+    Args:
+        rows (Iterable[Sequence[str]]): Cells of every row, one per header
+        max_width (int): Width cells are wrapped to
+        page_size (int, optional): No. of rows laid out at once. Defaults to
+        `LIST_PAGE_SIZE`.
+
+    Yields:
+        Iterator[str]: Lines of every page, without the last line break. The first page
+        holds the headers.
+    """
+    widths: list[int] = []  # fixed by the first page
+    separator = ""
+    page: list[list[list[str]]] = []
+
+    def format_page() -> str:
+        nonlocal widths, separator
+        lines = []
+        if not widths:
+            widths = _fix_widths(page)
+            separator = _get_separator(widths, "-")
+            lines.append(_format_header(widths, separator))
+        lines.extend(_format_row(cells, widths) + "\n" + separator for cells in page)
+        return "\n".join(lines)
+
+    for row in rows:
+        page.append([_wrap(cell, widths[column] if widths else max(max_width, 1)) for column, cell in enumerate(row)])
+        if len(page) == page_size:
+            yield format_page()
+            page = []
+    if page or not widths:
+        yield format_page()
+
+
+def write_tsv(stream: IO[str], commands: Iterable[db_models.Command]) -> int:
+    """Writes the key, command and description of every command as a line of tab
+    separated values. Backslashes, tabs and line breaks in values are escaped as `\\\\`,
+    `\\t`, `\\n` and `\\r`, missing descriptions are written empty.
+
+    Args:
+        stream (IO[str]): Stream to write to
+        commands (Iterable[db_models.Command]): Commands to write
+
+    Returns:
+        int: No. of written commands
+    """
+    count = 0
+    for command in commands:
+        description = (command.description or "").translate(_TSV_ESCAPES)
+        stream.write(f"{command.key.translate(_TSV_ESCAPES)}\t{command.command.translate(_TSV_ESCAPES)}\t{description}\n")
+        count += 1
+    return count
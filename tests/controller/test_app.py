@@ -0,0 +1,560 @@
+import io
+import json
+
+import pytest
+
+from command_storage.controller import app, fuzzy_search, importer
+from command_storage.controller.app import Cmds
+from command_storage.models.constants import FUZZY_SEARCH_THRESHOLD
+from command_storage.models.database import (
+    db_models,
+    json_stream,
+    json_wrapper,
+    key_index,
+    locking,
+    log_wrapper,
+    offset_index,
+    snapshot_cache,
+    sqlite_wrapper,
+)
+from command_storage.models.database.db_handler import init_database
+from command_storage.models.enums import compression as compression_enums
+from command_storage.models.enums import duplicate_policy as duplicate_policy_enums
+from command_storage.models.enums import engine as engine_enums
+from command_storage.models.enums import error as error_enums
+from command_storage.models.enums import file_format as file_format_enums
+from command_storage.models.enums import search_field as search_field_enums
+
+
+@pytest.fixture(params=list(engine_enums.Engine))
+def cmds(request, tmp_path):
+    engine = request.param
+    db_path = tmp_path / f"cmds.{engine.value}"
+    if engine in (engine_enums.Engine.JSON, engine_enums.Engine.JSON_LOG):
+        db_path.write_text("{}")
+    assert init_database(db_path, engine, shards=1) == error_enums.Error.SUCCESS  # a single shard keeps the insertion order the tests check
+    return Cmds(db_path, engine)
+
+
+class TestCmds:
+    def test_add_get_update_delete(self, cmds):
+        assert cmds.add("ls", "ls -la", "list").error == error_enums.Error.SUCCESS
+        assert cmds.add("ls", "ls", None).error == error_enums.Error.DUPLICATE_KEY_ERROR
+        assert cmds.add("gs", "git status", None).error == error_enums.Error.SUCCESS
+
+        assert cmds.get("ls").commands["ls"].command == "ls -la"
+        assert cmds.get("missing").error == error_enums.Error.NON_EXISTENT_KEY_ERROR
+
+        assert cmds.update("ls", "ll", None, "long list") == error_enums.Error.SUCCESS
+        assert cmds.update("missing", None, "x", None) == error_enums.Error.NON_EXISTENT_KEY_ERROR
+        commands = cmds.list(0).commands
+        assert list(commands) == ["gs", "ll"]
+        assert commands["ll"].command == "ls -la"
+        assert commands["ll"].description == "long list"
+
+        assert cmds.delete("gs", False) == error_enums.Error.SUCCESS
+        assert cmds.delete("gs", False) == error_enums.Error.NON_EXISTENT_KEY_ERROR
+        assert list(cmds.list(0).commands) == ["ll"]
+
+        assert cmds.delete(None, True) == error_enums.Error.SUCCESS
+        assert cmds.list(0).commands == {}
+
+
+class TestSqliteMigration:
+    def test_migrate_from_json(self, tmp_path):
+        json_path = tmp_path / "cmds.json"
+        json_path.write_text("{}")
+        json_cmds = Cmds(json_path)
+        json_cmds.add("ls", "ls -la", "list")
+        json_cmds.add("gs", "git status", None)
+
+        db_path = tmp_path / "cmds.sqlite"
+        assert sqlite_wrapper.migrate_from_json(json_path, db_path) == error_enums.Error.SUCCESS
+
+        sqlite_cmds = Cmds(db_path, engine_enums.Engine.SQLITE)
+        assert sqlite_cmds.list(0) == json_cmds.list(0)
+
+    def test_migrate_from_corrupt_json(self, tmp_path):
+        json_path = tmp_path / "cmds.json"
+        json_path.write_text("not json")
+
+        error = sqlite_wrapper.migrate_from_json(json_path, tmp_path / "cmds.sqlite")
+        assert error == error_enums.Error.JSON_ERROR
+
+
+class TestLogJsonWrapper:
+    def test_mutations_are_appended_and_compacted(self, tmp_path):
+        db_path = tmp_path / "cmds.json"
+        db_path.write_text("{}")
+        log_path = log_wrapper.get_log_path(db_path)
+        cmds = Cmds(db_path, engine_enums.Engine.JSON_LOG)
+
+        cmds.add("ls", "ls -la", None)
+        cmds.add("gs", "git status", None)
+        cmds.update("ls", "ll", None, "long list")
+        cmds.delete("gs", False)
+
+        assert db_path.read_text() == "{}"
+        assert len(log_path.read_text().splitlines()) == 5
+        expected = cmds.list(0)
+        assert list(expected.commands) == ["ll"]
+
+        assert cmds.compact() == error_enums.Error.SUCCESS
+        assert not log_path.exists()
+        assert cmds.list(0) == expected
+
+    def test_torn_append_is_ignored(self, tmp_path):
+        db_path = tmp_path / "cmds.json"
+        db_path.write_text("{}")
+        cmds = Cmds(db_path, engine_enums.Engine.JSON_LOG)
+        cmds.add("ls", "ls -la", None)
+
+        with log_wrapper.get_log_path(db_path).open("a") as log:
+            log.write('{"op": "put", "command": {"key": "gs"')
+
+        assert list(cmds.list(0).commands) == ["ls"]
+        assert cmds.add("gs", "git status", None).error == error_enums.Error.SUCCESS
+        assert list(cmds.list(0).commands) == ["ls", "gs"]
+
+
+class TestSnapshotCache:
+    def test_cache_follows_database_file(self, tmp_path):
+        db_path = tmp_path / "cmds.json"
+        db_path.write_text("{}")
+        cache_path = snapshot_cache.get_cache_path(db_path)
+        cmds = Cmds(db_path)
+
+        cmds.add("ls", "ls -la", None)
+        assert cache_path.exists()
+        assert list(cmds.list(0).commands) == ["ls"]
+
+        # external edit of the database file invalidates the cache
+        db_path.write_text(json.dumps({"commands": {"gs": {"key": "gs", "command": "git status"}}}))
+        assert list(cmds.list(0).commands) == ["gs"]
+
+        assert cmds.clear_cache() == error_enums.Error.SUCCESS
+        assert not cache_path.exists()
+        assert list(cmds.list(0).commands) == ["gs"]
+
+    def test_cache_disabled(self, tmp_path):
+        db_path = tmp_path / "cmds.json"
+        db_path.write_text("{}")
+        cmds = Cmds(db_path, use_cache=False)
+
+        cmds.add("ls", "ls -la", None)
+        assert list(cmds.list(0).commands) == ["ls"]
+        assert not snapshot_cache.get_cache_path(db_path).exists()
+
+
+class TestOffsetIndex:
+    @pytest.fixture(params=[engine_enums.Engine.JSON, engine_enums.Engine.JSON_LOG])
+    def json_cmds(self, request, tmp_path):
+        db_path = tmp_path / "cmds.json"
+        db_path.write_text("{}")
+        return Cmds(db_path, request.param)
+
+    def _forbid_full_reads(self, monkeypatch):
+        def get_commands(self):
+            raise AssertionError("read all commands")
+
+        monkeypatch.setattr(json_wrapper.JsonWrapper, "get_commands", get_commands)
+
+    def test_point_operations_read_single_records(self, json_cmds, monkeypatch):
+        for key in ("ls", "gs", "dps"):
+            json_cmds.add(key, f"{key} command", None)
+        json_cmds.compact()
+        self._forbid_full_reads(monkeypatch)
+
+        assert json_cmds.get("gs").commands["gs"].command == "gs command"
+        assert json_cmds.get("missing").error == error_enums.Error.NON_EXISTENT_KEY_ERROR
+        if json_cmds._db_handler.__class__ is log_wrapper.LogJsonWrapper:  # mutations only append
+            assert json_cmds.add("gs", "x", None).error == error_enums.Error.DUPLICATE_KEY_ERROR
+            assert json_cmds.update("gs", "gst", "git status", None) == error_enums.Error.SUCCESS
+            assert json_cmds.delete("ls", False) == error_enums.Error.SUCCESS
+            assert json_cmds.get("gs").error == error_enums.Error.NON_EXISTENT_KEY_ERROR
+            assert json_cmds.get("gst").commands["gst"].command == "git status"
+            assert json_cmds.get("ls").error == error_enums.Error.NON_EXISTENT_KEY_ERROR
+            assert json_cmds.get("dps").commands["dps"].command == "dps command"
+
+    def test_database_written_like_before(self, json_cmds):
+        json_cmds.add("ls", "ls -la", "list \u00e9")
+        json_cmds.add("gs", 'git "status"', None)
+        json_cmds.compact()
+        expected = {"commands": {key: command.model_dump() for key, command in json_cmds.list(0).commands.items()}, "error": 0}
+        assert json_cmds._db_path.read_text() == json.dumps(expected, indent=4)
+
+    def test_changed_database_is_reindexed(self, tmp_path, monkeypatch):
+        db_path = tmp_path / "cmds.json"
+        db_path.write_text("{}")
+        cmds = Cmds(db_path)
+        cmds.add("ls", "ls -la", None)
+
+        # written by an older version, laid out alike
+        commands = {"gs": {"key": "gs", "command": "git status", "description": None}}
+        db_path.write_text(json.dumps({"commands": commands, "error": 0}, indent=4))
+        assert cmds.get("gs").commands["gs"].command == "git status"
+        assert offset_index.find_spans(db_path, snapshot_cache.get_signature(db_path.stat()), "gs")
+
+        # laid out differently, can't be indexed and is read as a whole
+        db_path.write_text(json.dumps({"commands": {**commands, "ls": {"key": "ls", "command": "ls"}}}))
+        assert cmds.get("ls").commands["ls"].command == "ls"
+        assert cmds.get("gs").commands["gs"].command == "git status"
+        assert cmds.get("ll").error == error_enums.Error.NON_EXISTENT_KEY_ERROR
+
+        assert cmds.clear_cache() == error_enums.Error.SUCCESS
+        assert not offset_index.get_index_path(db_path).exists()
+
+    def test_colliding_hashes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(offset_index, "_hash", lambda key: 7)
+        db_path = tmp_path / "cmds.json"
+        db_path.write_text("{}")
+        cmds = Cmds(db_path)
+        for idx in range(20):
+            cmds.add(f"k{idx}", f"echo {idx}", None)
+
+        assert [cmds.get(f"k{idx}").commands[f"k{idx}"].command for idx in range(20)] == [f"echo {idx}" for idx in range(20)]
+        assert cmds.get("k20").error == error_enums.Error.NON_EXISTENT_KEY_ERROR
+
+
+class TestIncrementalRead:
+    def test_limited_list_stops_early(self, tmp_path, monkeypatch):
+        db_path = tmp_path / "cmds.json"
+        db_path.write_text("{}")
+        cmds = Cmds(db_path, use_cache=False)
+        for index in range(5):
+            cmds.add(f"key-{index}", f"echo {index}", None)
+        text = db_path.read_text()
+        db_path.write_text(text[: text.index('"key-3"')] + "not json")  # corrupt from the fourth record on
+
+        monkeypatch.setattr(json_stream, "_CHUNK_SIZE", 16)
+        assert list(cmds.list(2).commands) == ["key-0", "key-1"]
+        assert cmds.list(0).error == error_enums.Error.JSON_ERROR
+        assert cmds.list(5).error == error_enums.Error.JSON_ERROR
+        assert cmds.export(str(tmp_path / "export.json"), file_format_enums.FileFormat.JSON)[0] == error_enums.Error.JSON_ERROR
+
+    def test_log_replay_matches_full_read(self, tmp_path, monkeypatch):
+        db_path = tmp_path / "cmds.json"
+        db_path.write_text("{}")
+        cmds = Cmds(db_path, engine_enums.Engine.JSON_LOG)
+        for index in range(6):
+            cmds.add(f"key-{index}", f"echo {index}", None)
+        assert cmds.compact() == error_enums.Error.SUCCESS
+
+        cmds.update("key-1", None, "echo one", None)
+        cmds.update("key-2", "key-9", None, None)
+        cmds.delete("key-3", False)
+        cmds.add("key-3", "echo three", "again")
+        cmds.add("key-7", "echo 7", None)
+        cmds.delete("key-7", False)
+
+        monkeypatch.setattr(json_stream, "_CHUNK_SIZE", 16)
+        expected = cmds.list(0).commands
+        assert cmds.list(len(expected)).commands == expected
+        assert list(cmds.list(3).commands) == list(expected)[:3]
+
+    def test_members_with_escapes(self, monkeypatch):
+        monkeypatch.setattr(json_stream, "_CHUNK_SIZE", 3)
+        document = {'a\\"b': [1, 2.5], "c": {"d": None}, "": 12345}
+        stream = json_stream.JsonStream(io.StringIO(json.dumps(document, indent=2)))
+        assert dict(stream.members()) == document
+        assert stream.peek() == ""
+
+        with pytest.raises(ValueError):
+            list(json_stream.JsonStream(io.StringIO('{"a": 1 "b": 2}')).members())
+
+
+class TestTrustedLoading:
+    def test_reads_trust_database_and_check_validates(self, cmds):
+        cmds.add("ls", "ls -la", "list")
+        assert cmds.check() == error_enums.Error.SUCCESS
+
+    def test_check_finds_invalid_commands(self, tmp_path):
+        db_path = tmp_path / "cmds.json"
+        db_path.write_text(json.dumps({"commands": {"ls": {"key": "ls", "command": 42}}}))
+        cmds = Cmds(db_path)
+
+        # regular reads skip validation
+        assert cmds.list(0).commands["ls"].command == 42
+        assert cmds.check() == error_enums.Error.DB_VALIDATION_ERROR
+
+    def test_malformed_database_is_json_error(self, tmp_path):
+        db_path = tmp_path / "cmds.json"
+        db_path.write_text(json.dumps({"commands": {"ls": {"command": "ls"}}}))
+
+        assert Cmds(db_path).list(0).error == error_enums.Error.JSON_ERROR
+
+
+class TestKeyIndex:
+    KEYS = ["git-status", "git-push", "docker-ps", "docker-push", "kubectl-get-pods", "ls", "tar-xzf", "gs"]
+
+    def test_fuzzy_search_matches_full_scan(self, cmds, monkeypatch):
+        for key in self.KEYS:
+            cmds.add(key, f"command {key}", None)
+
+        queries = ["git", "push", "docker push", "kubectl", "pods", "tar", "git-stat"]
+        full_scan = {query: list(cmds.list_fuzzy(query, 0).commands) for query in queries}
+        assert not key_index.get_index_path(cmds._db_path).exists()
+
+        monkeypatch.setattr(app, "FUZZY_INDEX_MIN_COMMANDS", 1)
+        for query in queries:
+            assert list(cmds.list_fuzzy(query, 0).commands) == full_scan[query]
+        assert key_index.get_index_path(cmds._db_path).exists()
+
+    def test_index_is_maintained_incrementally(self, cmds, monkeypatch):
+        monkeypatch.setattr(app, "FUZZY_INDEX_MIN_COMMANDS", 1)
+        for key in self.KEYS:
+            cmds.add(key, f"command {key}", None)
+        cmds.list_fuzzy("git", 0)
+
+        cmds.add("git-log", "git log", None)
+        cmds.update("git-push", "git-push-force", None, None)
+        cmds.update("ls", None, "ls -la", None)
+        cmds.delete("docker-ps", False)
+
+        keys = list(cmds.list(0).commands)
+        assert key_index.load_index(cmds._db_path).matches(keys)
+        assert list(cmds.list_fuzzy("git", 0).commands) == ["git-status", "git-log", "git-push-force"]
+
+        cmds.delete(None, True)
+        assert not key_index.get_index_path(cmds._db_path).exists()
+
+    def test_stale_index_is_rebuilt(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(app, "FUZZY_INDEX_MIN_COMMANDS", 1)
+        db_path = tmp_path / "cmds.json"
+        db_path.write_text("{}")
+        cmds = Cmds(db_path)
+        cmds.add("git-status", "git status", None)
+        cmds.list_fuzzy("git", 0)
+
+        # external edit of the database file
+        db_path.write_text(json.dumps({"commands": {"git-log": {"key": "git-log", "command": "git log"}}}))
+        assert list(cmds.list_fuzzy("git", 0).commands) == ["git-log"]
+        assert key_index.load_index(db_path).matches(["git-log"])
+
+
+class TestFieldSearch:
+    FIELDS = list(search_field_enums.SearchField)
+
+    def _store(self, cmds):
+        cmds.add("gs", "git status", "show the working tree status")
+        cmds.add("dps", "docker ps -a", "list containers")
+        cmds.add("kgp", "kubectl get pods", None)
+        cmds.add("ll", "ls -la", "list directory contents")
+
+    def test_matches_command_and_description(self, cmds):
+        self._store(cmds)
+
+        assert list(cmds.list_fuzzy("docker", 0).commands) == []
+        assert list(cmds.list_fuzzy("docker", 0, self.FIELDS).commands) == ["dps"]
+        assert list(cmds.list_fuzzy("containers", 0, [search_field_enums.SearchField.DESCRIPTION]).commands) == ["dps"]
+        assert list(cmds.list_fuzzy("list", 0, self.FIELDS).commands) == ["dps", "ll"]
+        assert list(cmds.list_fuzzy("kubectl pods", 1, self.FIELDS).commands) == ["kgp"]
+
+    def test_process_pool_matches_single_process(self, cmds, monkeypatch):
+        self._store(cmds)
+        single_process = {(query, limit): list(cmds.list_fuzzy(query, limit, self.FIELDS).commands) for query in ("list", "git") for limit in (0, 1)}
+
+        monkeypatch.setattr(fuzzy_search, "FUZZY_POOL_MIN_COMMANDS", 1)
+        monkeypatch.setattr(fuzzy_search.os, "cpu_count", lambda: 3)
+        for (query, limit), keys in single_process.items():
+            assert list(cmds.list_fuzzy(query, limit, self.FIELDS).commands) == keys
+
+
+class TestStagedSearch:
+    def test_exact_key_comes_first(self, cmds):
+        for key in ["GS", "git-status", "gs", "gst"]:
+            cmds.add(key, f"command {key}", None)
+
+        assert list(cmds.list_fuzzy("gs", 1).commands) == ["gs"]
+        assert list(cmds.list_fuzzy("gs", 0).commands) == ["gs", "GS", "gst"]
+
+    def test_matches_full_scan(self):
+        from thefuzz import process
+
+        keys = ["git-status", "git-stash", "GIT_STATUS", "x", "--gs!", "status", "st", "git-status-porcelain-long-format", "gitk"]
+        positions = {key: position for position, key in enumerate(keys)}
+        for query in ["git status", "status", "x", "git", "gs", "stat"]:
+            full_scan = [
+                key for key, score in sorted(process.extract(query, keys, limit=None), key=lambda match: (-match[1], positions[match[0]])) if score >= 70
+            ]
+            for limit in (0, 1, 3):
+                expected = full_scan[:limit] if limit else full_scan
+                assert fuzzy_search.staged_search(query, dict.fromkeys(keys), limit) == expected
+                index = key_index.build_index(keys)
+                assert fuzzy_search.staged_search(query, dict.fromkeys(keys), limit, lambda _: index) == expected
+
+    def test_score_upper_bound(self):
+        from thefuzz import fuzz
+
+        for query, key in [("ab", "ab"), ("abc", "abcd"), ("ab", "abc"), ("a", "abcdefgh"), ("a", "abcdefghi")]:
+            assert fuzz.WRatio(query, key) <= fuzzy_search.score_upper_bound(len(query), len(key))
+        assert fuzzy_search.score_upper_bound(1, 9) < FUZZY_SEARCH_THRESHOLD
+
+
+class TestTransaction:
+    def _count_writes(self, cmds, monkeypatch):
+        writes = []
+        write_commands = cmds._db_handler.write_commands
+
+        def counted(commands):
+            writes.append(len(commands.commands))
+            return write_commands(commands)
+
+        monkeypatch.setattr(cmds._db_handler, "write_commands", counted)
+        return writes
+
+    def test_changes_are_written_once(self, cmds, monkeypatch):
+        monkeypatch.setattr(app, "FUZZY_INDEX_MIN_COMMANDS", 1)
+        cmds.add_many([db_models.Command(key, f"command {key}") for key in ("ls", "gs", "git-push", "docker-ps")])
+        cmds.list_fuzzy("git", 0)
+        writes = self._count_writes(cmds, monkeypatch)
+
+        with cmds.transaction() as transaction:
+            assert transaction.add_many(db_models.Command(f"git-{index}", f"git {index}") for index in range(100)) == error_enums.Error.SUCCESS
+            assert transaction.update("ls", None, "ls -la", "long list") == error_enums.Error.SUCCESS
+            assert transaction.update("git-push", "git-push-force", None, None) == error_enums.Error.SUCCESS
+            assert transaction.delete_many(f"git-{index}" for index in range(1, 100)) == error_enums.Error.SUCCESS
+            assert transaction.delete("docker-ps") == error_enums.Error.SUCCESS
+            assert transaction.add("docker-ps", "docker ps -a", None) == error_enums.Error.SUCCESS
+            assert transaction.get("ls").commands["ls"].command == "ls -la"
+            assert cmds.get("ls").commands["ls"].command == "command ls"  # not written yet
+        assert transaction.error == error_enums.Error.SUCCESS
+
+        assert writes == [5]
+        commands = cmds.list(0).commands
+        assert list(commands) == ["ls", "gs", "git-0", "git-push-force", "docker-ps"]
+        assert commands["ls"].description == "long list"
+        assert commands["git-push-force"].command == "command git-push"
+        assert key_index.load_index(cmds._db_path).matches(list(commands))
+
+    def test_exception_rolls_back(self, cmds, monkeypatch):
+        cmds.add("ls", "ls", None)
+        writes = self._count_writes(cmds, monkeypatch)
+
+        with pytest.raises(RuntimeError):
+            with cmds.transaction() as transaction:
+                transaction.add("gs", "git status", None)
+                transaction.update("ls", None, "ls -la", None)
+                raise RuntimeError
+
+        assert writes == []
+        commands = cmds.list(0).commands
+        assert list(commands) == ["ls"]
+        assert commands["ls"].command == "ls"
+
+    def test_batches_are_all_or_nothing(self, cmds, monkeypatch):
+        cmds.add("ls", "ls", None)
+        writes = self._count_writes(cmds, monkeypatch)
+
+        assert cmds.add_many([db_models.Command("gs", "git status"), db_models.Command("ls", "ls -la")]) == error_enums.Error.DUPLICATE_KEY_ERROR
+        assert cmds.add_many([db_models.Command("gs", "git status"), db_models.Command("gs", "git st")]) == error_enums.Error.DUPLICATE_KEY_ERROR
+        assert cmds.delete_many(["ls", "missing"]) == error_enums.Error.NON_EXISTENT_KEY_ERROR
+        assert writes == []
+        assert list(cmds.list(0).commands) == ["ls"]
+
+        assert cmds.delete_many(["ls", "ls"]) == error_enums.Error.SUCCESS
+        assert cmds.list(0).commands == {}
+
+    def test_locked_database(self, cmds):
+        cmds._lock_settings = locking.LockSettings(retries=0, backoff=0)
+        with locking.file_lock(cmds._db_path, cmds._lock_settings):
+            with cmds.transaction() as transaction:
+                assert transaction.add("ls", "ls", None) == error_enums.Error.DB_LOCK_ERROR
+        assert transaction.error == error_enums.Error.DB_LOCK_ERROR
+
+
+class TestImport:
+    def test_reads_json_ndjson_and_csv(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(json_stream, "_CHUNK_SIZE", 7)  # items span chunks
+        monkeypatch.setattr(importer, "IMPORT_BATCH_SIZE", 2)
+        records = [{"key": "ls", "command": "ls -la", "description": "list"}, {"key": "gs", "command": "git status", "description": None}]
+        expected = [db_models.Command(**record) for record in records]
+
+        (tmp_path / "cmds.json").write_text(json.dumps(records, indent=4))
+        (tmp_path / "cmds.ndjson").write_text("\n".join(json.dumps(record) for record in records) + "\n\n")
+        (tmp_path / "cmds.csv").write_text("key,command,description\nls,ls -la,list\ngs,git status,\n")
+        for name in ("cmds.json", "cmds.ndjson", "cmds.csv"):
+            file = str(tmp_path / name)
+            read: list[int] = []
+            assert list(importer.read_commands(file, importer.detect_format(file), read.append)) == expected
+            assert sum(read) == (tmp_path / name).stat().st_size
+
+    @pytest.mark.parametrize(
+        "file_format, content, message",
+        [
+            (file_format_enums.FileFormat.JSON, '{"key": "ls"}', "list of commands"),
+            (file_format_enums.FileFormat.JSON, '[{"key": "ls", "command": "ls"} {"key": "gs"}]', "after command no. 1"),
+            (file_format_enums.FileFormat.JSON, '[{"key": "ls", "command": "ls"}, {"key": "gs"}]', "command no. 2: command: Field required"),
+            (file_format_enums.FileFormat.NDJSON, '{"key": "ls", "command": "ls"}\n{"key": \n', "line 2"),
+            (file_format_enums.FileFormat.CSV, "name,command\nls,ls\n", "'key' and 'command' columns"),
+        ],
+    )
+    def test_invalid_files(self, tmp_path, file_format, content, message):
+        file = tmp_path / "cmds"
+        file.write_text(content)
+        with pytest.raises(importer.ImportFileError, match=message):
+            list(importer.read_commands(str(file), file_format))
+
+    @pytest.mark.parametrize(
+        "policy, stored, counts",
+        [
+            (duplicate_policy_enums.DuplicatePolicy.SKIP, {"ls": "ls", "gs": "git status", "dk": "docker"}, (1, 0, 2)),
+            (duplicate_policy_enums.DuplicatePolicy.OVERWRITE, {"ls": "ls -la", "gs": "git status", "dk": "docker ps"}, (1, 1, 0)),
+        ],
+    )
+    def test_duplicate_policies(self, cmds, monkeypatch, policy, stored, counts):
+        monkeypatch.setattr(app, "FUZZY_INDEX_MIN_COMMANDS", 0)
+        cmds.add("ls", "ls", None)
+        cmds.add("gs", "git status", None)
+        cmds.list_fuzzy("git", 1)  # builds the key index
+        imported = [db_models.Command("ls", "ls -la"), db_models.Command("dk", "docker"), db_models.Command("dk", "docker ps")]
+
+        summary = cmds.import_commands(imported, policy)
+        assert summary.error == error_enums.Error.SUCCESS
+        assert (summary.imported, summary.overwritten, summary.skipped) == counts
+        assert {key: command.command for key, command in cmds.list(0).commands.items()} == stored
+        assert list(cmds.list(0).commands) == ["ls", "gs", "dk"]
+        assert key_index.load_index(cmds._db_path).matches(["ls", "gs", "dk"])
+
+    def test_fail_policy_stores_nothing(self, cmds):
+        cmds.add("ls", "ls", None)
+        imported = [db_models.Command("dk", "docker"), db_models.Command("ls", "ls -la")]
+
+        summary = cmds.import_commands(imported, duplicate_policy_enums.DuplicatePolicy.FAIL)
+        assert summary.error == error_enums.Error.DUPLICATE_KEY_ERROR
+        assert summary.duplicate_key == "ls"
+        assert list(cmds.list(0).commands) == ["ls"]
+
+
+class TestExport:
+    def _store(self, cmds):
+        cmds.add("ls", "ls -la", "list")
+        cmds.add("quote", 'echo "a,b"\n\u00e9', None)
+
+    @pytest.mark.parametrize("compression", [None, compression_enums.Compression.GZIP])
+    @pytest.mark.parametrize("file_format", list(file_format_enums.FileFormat))
+    def test_round_trip(self, cmds, tmp_path, file_format, compression):
+        self._store(cmds)
+        file = str(tmp_path / f"export.{file_format.value}{'.gz' if compression else ''}")
+
+        assert cmds.export(file, file_format, compression) == (error_enums.Error.SUCCESS, 2)
+        assert list(importer.read_commands(file, file_format)) == list(cmds.list(0).commands.values())
+
+    def test_json_matches_previous_export(self, cmds, tmp_path):
+        self._store(cmds)
+        cmds.export_json(cmds.list(0), str(tmp_path / "old.json"))
+        cmds.export(str(tmp_path / "new.json"), file_format_enums.FileFormat.JSON)
+        assert (tmp_path / "new.json").read_text() == (tmp_path / "old.json").read_text()
+
+    def test_stdout_and_empty_store(self, cmds, tmp_path, capsysbinary):
+        assert cmds.export(str(tmp_path / "empty.csv"), file_format_enums.FileFormat.CSV) == (error_enums.Error.SUCCESS, 0)
+        assert not (tmp_path / "empty.csv").exists()
+
+        self._store(cmds)
+        assert cmds.export("-", file_format_enums.FileFormat.NDJSON) == (error_enums.Error.SUCCESS, 2)
+        lines = capsysbinary.readouterr().out.decode().splitlines()
+        assert [json.loads(line)["key"] for line in lines] == ["ls", "quote"]
+
+    def test_unwritable_file(self, cmds, tmp_path):
+        self._store(cmds)
+        assert cmds.export(str(tmp_path / "missing" / "export.json"), file_format_enums.FileFormat.JSON) == (error_enums.Error.JSON_EXPORT_FILE_ERROR, 0)
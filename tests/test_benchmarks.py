@@ -0,0 +1,26 @@
+# Smoke test of the benchmark suite on a tiny database
+
+import pytest
+
+from benchmarks import results, stores, suite
+from command_storage.models.enums import engine as engine_enums
+
+
+def test_generated_commands_are_deterministic():
+    commands = stores.generate_commands(200, seed=1)
+    assert len(commands) == 200
+    assert commands == stores.generate_commands(200, seed=1)
+    assert commands != stores.generate_commands(200, seed=2)
+
+
+@pytest.mark.integration
+def test_run_and_compare(tmp_path):
+    run = suite.run_suite([50], list(engine_enums.Engine), repeat=1, subprocesses=False)
+    assert set(run) == {f"{engine.value}/50/{case.name}" for engine in engine_enums.Engine for case in suite.CASES if not case.subprocess}
+
+    results.write_results(tmp_path / "base.json", run, {})
+    base = results.load_results(tmp_path / "base.json")
+    assert not any(comparison.is_regression(0.2) for comparison in results.compare(base, run))
+
+    slower = {name: {**stats, "min": stats["min"] * 2 + 0.01} for name, stats in run.items()}
+    assert all(comparison.is_regression(0.2) for comparison in results.compare(base, slower))
@@ -0,0 +1,67 @@
+# Stress tests for concurrent writers
+
+import json
+import multiprocessing
+import time
+
+import pytest
+
+from command_storage.controller.app import Cmds
+from command_storage.models.database.db_handler import get_db_handler, init_database
+from command_storage.models.enums import engine as engine_enums
+from command_storage.models.enums import error as error_enums
+
+WRITERS = 8
+COMMANDS_PER_WRITER = 25
+
+
+def _writer(db_path, engine, writer_id, errors):
+    cmds = Cmds(db_path, engine)
+    for idx in range(COMMANDS_PER_WRITER):
+        key = f"writer-{writer_id}-{idx}"
+        for error in (cmds.add(key, "echo", None).error, cmds.update(key, None, f"echo {idx}", "updated")):
+            if error != error_enums.Error.SUCCESS:
+                errors.put(str(error))
+
+
+def _reader(db_path, engine, stop, errors):
+    handler = get_db_handler(db_path, engine)
+    while not stop.is_set():
+        error = handler.get_commands().error
+        if error != error_enums.Error.SUCCESS:
+            errors.put(str(error))
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("engine", list(engine_enums.Engine))
+def test_concurrent_writers_lose_no_updates(engine, tmp_path):
+    db_path = tmp_path / "cmds.db"
+    if engine != engine_enums.Engine.SQLITE:
+        db_path.write_text("{}")
+    init_database(db_path, engine)
+
+    errors = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    reader = multiprocessing.Process(target=_reader, args=(db_path, engine, stop, errors))
+    writers = [multiprocessing.Process(target=_writer, args=(db_path, engine, idx, errors)) for idx in range(WRITERS)]
+
+    reader.start()
+    start = time.perf_counter()
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    reader.join()
+
+    assert errors.empty(), errors.get()
+    commands = Cmds(db_path, engine).list(0)
+    assert commands.error == error_enums.Error.SUCCESS
+    assert len(commands.commands) == WRITERS * COMMANDS_PER_WRITER
+    assert all(command.description == "updated" for command in commands.commands.values())
+    if engine == engine_enums.Engine.JSON:
+        json.loads(db_path.read_text())
+
+    operations = 2 * WRITERS * COMMANDS_PER_WRITER
+    print(f"{engine.value}: {operations} writes by {WRITERS} processes in {elapsed:.2f}s ({operations / elapsed:.0f} writes/s)")
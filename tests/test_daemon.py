@@ -0,0 +1,69 @@
+# Round trips through `cmds daemon`
+
+import json
+import threading
+
+import pytest
+
+from command_storage.controller import app, config, daemon
+from command_storage.models import daemon_protocol
+from command_storage.models.enums import error as error_enums
+from command_storage.views import main
+
+pytestmark = pytest.mark.skipif(not hasattr(daemon.socket, "AF_UNIX"), reason="Unix domain sockets are not available")
+
+
+@pytest.fixture
+def served(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CONFIG_DIR_PATH", tmp_path / "config")
+    monkeypatch.setattr(config, "CONFIG_FILE_PATH", tmp_path / "config" / "config.ini")
+    monkeypatch.setattr(app, "_warm_cmds", None)
+    monkeypatch.setenv(daemon_protocol.DAEMON_SOCKET_ENV, str(tmp_path / "cmds.sock"))
+    db_path = tmp_path / "cmds.json"
+    db_path.write_text("{}")
+    assert config.initialize_app(db_path) == error_enums.Error.SUCCESS
+
+    socket_path = daemon_protocol.get_socket_path()
+    create_error, server = daemon.create_server(socket_path)
+    assert create_error == error_enums.Error.SUCCESS
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield db_path
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def test_commands_are_served_from_memory(served, capsys):
+    assert main.forward(["store", "-k", "gs", "-c", "git status"]) == 0
+    assert "Successfully stored" in capsys.readouterr().out
+
+    assert main.forward(["list"]) == 0
+    assert "git status" in capsys.readouterr().out
+
+    assert main.forward(["store", "-k", "gs", "-c", "git status"]) == 1
+    assert "DUPLICATE_KEY_ERROR" in capsys.readouterr().out
+
+    # external edit of the database file is picked up
+    served.write_text(json.dumps({"commands": {"ls": {"key": "ls", "command": "ls -la"}}}))
+    assert main.forward(["list"]) == 0
+    output = capsys.readouterr().out
+    assert "ls -la" in output and "git status" not in output
+
+
+def test_only_forwarded_commands_are_served(served, capsys):
+    assert main.forward(["init"]) is None
+    assert main.forward(["delete", "--all"]) is None
+    assert main.forward(["store", "--from-stdin"]) is None
+    assert main.forward(["list", "--help"]) is None
+    assert daemon.run_command({"argv": ["compact"]})["code"] == 2
+
+
+def test_second_daemon_is_refused(served):
+    create_error, _ = daemon.create_server(daemon_protocol.get_socket_path())
+    assert create_error == error_enums.Error.DAEMON_RUNNING_ERROR
+
+
+def test_falls_back_without_daemon(tmp_path, monkeypatch):
+    monkeypatch.setenv(daemon_protocol.DAEMON_SOCKET_ENV, str(tmp_path / "missing.sock"))
+    assert main.forward(["list"]) is None
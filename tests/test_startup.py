@@ -0,0 +1,76 @@
+# Startup regression checks: every `cmds` subcommand must only import what it uses
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+HEAVY_MODULES = {"pydantic", "thefuzz", "tabulate", "pyperclip"}
+
+SUBCOMMANDS = [
+    (["--version"], set()),
+    (["list", "--help"], set()),
+    (["store", "-k", "new", "-c", "echo new"], {"pydantic"}),
+    (["update", "gs", "-des", "git status"], {"pydantic"}),
+    (["list"], {"pydantic"}),
+    (["list", "gs"], {"pydantic", "thefuzz"}),
+    (["list", "-fmt", "tsv"], {"pydantic"}),
+    (["get", "gs"], {"pydantic"}),
+    (["copy", "gs"], {"pydantic", "pyperclip"}),
+    (["export", "-f", "export.json"], {"pydantic"}),
+    (["import", "export.json", "-od", "skip"], {"pydantic"}),
+    (["delete", "gs"], {"pydantic"}),
+]
+
+
+def _run(args, env, cwd):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "command_storage.views.cli", *args],
+        env=env,
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+
+
+def _parse_importtime(stderr):
+    """Returns the imported top level packages and the total import time in ms"""
+    modules, total_us = set(), 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not name.startswith("  "):  # top level import
+            total_us += int(cumulative)
+        modules.add(name.strip().split(".")[0])
+    return modules, total_us / 1000
+
+
+@pytest.fixture(scope="module")
+def cli_env(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("startup")
+    env = {**os.environ, "HOME": str(tmp_path), "XDG_CONFIG_HOME": str(tmp_path), "PYTHONPATH": str(Path(__file__).resolve().parents[1])}
+    db_path = tmp_path / "cmds.json"
+    db_path.write_text("{}")
+    assert _run(["init", "--db-path", str(db_path)], env, tmp_path).returncode == 0
+    assert _run(["store", "-k", "gs", "-c", "git status"], env, tmp_path).returncode == 0
+    return env, tmp_path
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("args,expected_heavy_modules", SUBCOMMANDS, ids=[" ".join(args) for args, _ in SUBCOMMANDS])
+def test_subcommand_imports(args, expected_heavy_modules, cli_env):
+    env, cwd = cli_env
+    result = _run(args, env, cwd)
+    if args[0] != "copy":  # no clipboard on headless machines
+        assert result.returncode == 0, result.stderr
+
+    modules, total_ms = _parse_importtime(result.stderr)
+    assert modules & HEAVY_MODULES == expected_heavy_modules
+
+    print(f"cmds {' '.join(args)}: {total_ms:.1f}ms spent on imports")
+    budget_ms = os.environ.get("CMDS_STARTUP_BUDGET_MS")
+    if budget_ms:
+        assert total_ms <= float(budget_ms)
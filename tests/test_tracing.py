@@ -0,0 +1,53 @@
+# Opt-in phase timings and profiling of `cmds` invocations
+
+import json
+import pstats
+
+import pytest
+from typer.testing import CliRunner
+
+from command_storage.controller import app, config
+from command_storage.models import tracing
+from command_storage.models.enums import error as error_enums
+from command_storage.views import cli
+
+runner = CliRunner(mix_stderr=False)
+
+
+@pytest.fixture
+def initialized(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CONFIG_DIR_PATH", tmp_path / "config")
+    monkeypatch.setattr(config, "CONFIG_FILE_PATH", tmp_path / "config" / "config.ini")
+    monkeypatch.setattr(app, "_warm_cmds", None)
+    monkeypatch.delenv(tracing.TRACE_ENV, raising=False)
+    db_path = tmp_path / "cmds.json"
+    db_path.write_text("{}")
+    assert config.initialize_app(db_path) == error_enums.Error.SUCCESS
+    assert app.get_cmds().add("gs", "git status", None).error == error_enums.Error.SUCCESS
+    return tmp_path
+
+
+def test_phases_are_free_when_not_tracing():
+    assert tracing.phase("a") is tracing.phase("b")
+
+
+def test_timings_go_to_stderr(initialized):
+    result = runner.invoke(cli.app, ["--timings", "list", "gs"])
+    assert result.exit_code == 0
+    assert "git status" in result.stdout
+    assert [line.split()[0] for line in result.stderr.splitlines()[2:]] == ["list", "read", "read", "load", "fuzzy", "render"]
+
+
+def test_trace_file_and_profile(initialized, monkeypatch):
+    trace_path, profile_path = initialized / "trace.json", initialized / "cmds.prof"
+    monkeypatch.setenv(tracing.TRACE_ENV, str(trace_path))
+
+    result = runner.invoke(cli.app, ["--profile", str(profile_path), "store", "-k", "ls", "-c", "ls -la"])
+    assert result.exit_code == 0
+    phases = json.loads(trace_path.read_text())["phases"]
+    assert [(phase["name"], phase["depth"]) for phase in phases][:3] == [("store", 0), ("read config", 1), ("locked update", 1)]
+    assert all(phase["wall_ms"] >= 0 for phase in phases)
+    assert pstats.Stats(str(profile_path)).total_calls > 0
+
+    monkeypatch.delenv(tracing.TRACE_ENV)
+    assert runner.invoke(cli.app, ["list"]).stderr.count("read database") == 0
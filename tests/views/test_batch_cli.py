@@ -0,0 +1,114 @@
+# Batch `cmds delete` and `cmds store --from-stdin`
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from command_storage.controller import app, config
+from command_storage.models.enums import error as error_enums
+from command_storage.views import cli
+
+runner = CliRunner(mix_stderr=False)
+
+KEYS = ["tmp-1", "tmp-2", "tmp-10", "gs", "ls"]
+
+
+@pytest.fixture
+def cmds(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CONFIG_DIR_PATH", tmp_path / "config")
+    monkeypatch.setattr(config, "CONFIG_FILE_PATH", tmp_path / "config" / "config.ini")
+    monkeypatch.setattr(app, "_warm_cmds", None)
+    db_path = tmp_path / "cmds.json"
+    db_path.write_text("{}")
+    assert config.initialize_app(db_path) == error_enums.Error.SUCCESS
+    cmds = app.get_cmds()
+    for key in KEYS:
+        assert cmds.add(key, f"echo {key}", None).error == error_enums.Error.SUCCESS
+    return cmds
+
+
+def _count_writes(cmds, monkeypatch):
+    writes = []
+    write_commands = type(cmds._db_handler).write_commands
+
+    def counted(self, commands):
+        writes.append(len(commands.commands))
+        return write_commands(self, commands)
+
+    monkeypatch.setattr(type(cmds._db_handler), "write_commands", counted)
+    return writes
+
+
+def test_delete_keys_pattern_and_stdin_with_one_write(cmds, monkeypatch):
+    writes = _count_writes(cmds, monkeypatch)
+
+    result = runner.invoke(cli.app, ["delete", "gs", "--match", "tmp-?", "--dry-run"])
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == ["Would delete 3 commands:", "tmp-1", "tmp-2", "gs"]
+    assert writes == []
+
+    result = runner.invoke(cli.app, ["delete", "gs", "-mt", "tmp-[0-9]+", "--regex", "--from-stdin"], input="ls\n\n")
+    assert result.exit_code == 0
+    assert result.stdout == "Successfully deleted 5 commands\n"
+    assert writes == [0]
+
+
+def test_delete_stores_nothing_for_missing_keys(cmds, monkeypatch):
+    writes = _count_writes(cmds, monkeypatch)
+
+    result = runner.invoke(cli.app, ["delete", "gs", "missing", "-mt", "tmp-*"])
+    assert result.exit_code == 1
+    assert "keys not stored: 'missing'" in result.stdout
+    assert writes == []
+
+    result = runner.invoke(cli.app, ["delete", "-mt", "nothing-*"])
+    assert result.exit_code == 0
+    assert "No stored command matches" in result.stdout
+    assert list(cmds.list(0).commands) == KEYS
+
+
+@pytest.mark.parametrize(
+    "args",
+    [["delete"], ["delete", "gs", "--all"], ["delete", "gs", "--regex"], ["delete", "-mt", "(", "--regex"]],
+)
+def test_delete_rejects_invalid_options(cmds, args):
+    assert runner.invoke(cli.app, args).exit_code == 2
+
+
+def test_delete_all_dry_run(cmds):
+    result = runner.invoke(cli.app, ["delete", "--all", "--dry-run"])
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == ["Would delete 5 commands:", *KEYS]
+    assert list(cmds.list(0).commands) == KEYS
+
+
+def test_store_from_stdin(cmds, monkeypatch):
+    writes = _count_writes(cmds, monkeypatch)
+    records = "".join(json.dumps({"key": f"new-{index}", "command": f"echo {index}"}) + "\n" for index in range(3))
+
+    result = runner.invoke(cli.app, ["store", "--from-stdin", "--dry-run"], input=records)
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == ["Would store 3 new commands:", "new-0", "new-1", "new-2"]
+    assert writes == []
+
+    result = runner.invoke(cli.app, ["store", "-si"], input=records)
+    assert result.exit_code == 0
+    assert result.stdout == "Successfully stored 3 new commands\n"
+    assert writes == [8]
+    assert cmds.get("new-2").commands["new-2"].command == "echo 2"
+
+    result = runner.invoke(cli.app, ["store", "-si"], input=records)
+    assert result.exit_code == 1
+    assert "key 'new-0' is already stored" in result.stdout
+
+    result = runner.invoke(cli.app, ["store", "-si"], input='{"key": "x"}\n')
+    assert result.exit_code == 1
+    assert "Invalid command no. 1" in result.stdout
+
+
+def test_store_validates_options(cmds):
+    assert runner.invoke(cli.app, ["store", "-k", "x"]).exit_code == 2
+    assert runner.invoke(cli.app, ["store", "-k", "x", "-c", "y", "--from-stdin"]).exit_code == 2
+    assert runner.invoke(cli.app, ["store", "-k", "x", "-c", "y", "--dry-run"]).stdout == "Would store 1 new commands:\nx\n"
+    assert cmds.get("x").error == error_enums.Error.NON_EXISTENT_KEY_ERROR
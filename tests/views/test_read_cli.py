@@ -0,0 +1,102 @@
+# Streamed tables and machine readable output of `cmds list`, and `cmds get`
+
+import json
+
+import pytest
+from tabulate import tabulate
+from typer.testing import CliRunner
+
+from command_storage.controller import app, config
+from command_storage.models.database import db_models
+from command_storage.models.enums import error as error_enums
+from command_storage.views import cli, rendering
+
+runner = CliRunner(mix_stderr=False)
+
+ROWS = [
+    ("'gs'", "'git status'", ""),
+    ("'dps'", "'docker ps --format \"table {{.Names}}\\t{{.Status}}\"'", "'list running containers'"),
+    ("'multi'", "'echo a\n\necho b'", "'spans\nlines'"),
+    ("'long-key-without-any-spaces-at-all'", "'x'", "'a-b-c-d-e-f-g-h'"),
+]
+
+
+@pytest.mark.parametrize("max_width", [1, 5, 12, 20, 60])
+def test_single_page_looks_like_tabulate(max_width):
+    expected = tabulate(ROWS, headers=list(rendering.HEADERS), tablefmt="grid", maxcolwidths=[max_width] * 3)
+    assert "\n".join(rendering.iter_table(ROWS, max_width)) == expected
+
+
+def test_pages_keep_the_widths_of_the_first_page():
+    rows = [("'a'", "'b'", "")] * 3 + [("'key'", "'a much longer command'", "")]
+    pages = list(rendering.iter_table(rows, 40, page_size=2))
+
+    assert len(pages) == 2
+    lines = "\n".join(pages).splitlines()
+    assert len({len(line) for line in lines}) == 1
+    assert pages[1].endswith("| 'key' | 'a much   |               |\n|       | longer    |               |\n|       | command'  |               |\n" + lines[0])
+
+
+def test_tsv_escapes_separators():
+    commands = [db_models.Command(key="a\tb", command="echo 1\necho \\2", description=None), db_models.Command(key="c", command="d", description="e\r")]
+    lines = []
+
+    class Stream:
+        write = lines.append
+
+    assert rendering.write_tsv(Stream(), commands) == 2
+    assert "".join(lines) == "a\\tb\techo 1\\necho \\\\2\t\nc\td\te\\r\n"
+
+
+@pytest.fixture
+def initialized(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CONFIG_DIR_PATH", tmp_path / "config")
+    monkeypatch.setattr(config, "CONFIG_FILE_PATH", tmp_path / "config" / "config.ini")
+    monkeypatch.setattr(app, "_warm_cmds", None)
+    db_path = tmp_path / "cmds.json"
+    db_path.write_text("{}")
+    assert config.initialize_app(db_path) == error_enums.Error.SUCCESS
+    cmds = app.get_cmds()
+    assert cmds.add("gs", "git status", None).error == error_enums.Error.SUCCESS
+    assert cmds.add("ls", "ls -la", "list\tfiles").error == error_enums.Error.SUCCESS
+    return tmp_path
+
+
+def test_list_formats(initialized):
+    result = runner.invoke(cli.app, ["list", "-l", "0", "--format", "json"])
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == [
+        {"key": "gs", "command": "git status", "description": None},
+        {"key": "ls", "command": "ls -la", "description": "list\tfiles"},
+    ]
+
+    result = runner.invoke(cli.app, ["list", "-l", "0", "-fmt", "ndjson"])
+    assert [json.loads(line)["key"] for line in result.stdout.splitlines()] == ["gs", "ls"]
+
+    result = runner.invoke(cli.app, ["list", "-l", "0", "-fmt", "tsv"])
+    assert result.stdout == "gs\tgit status\t\nls\tls -la\tlist\\tfiles\n"
+
+    result = runner.invoke(cli.app, ["list", "-l", "0"])
+    assert (
+        result.stdout
+        == tabulate(
+            [("'gs'", "'git status'", ""), ("'ls'", "'ls -la'", "'list\tfiles'")], headers=list(rendering.HEADERS), tablefmt="grid", maxcolwidths=[20] * 3
+        )
+        + "\n"
+    )
+
+
+def test_machine_formats_print_empty_results(initialized):
+    assert runner.invoke(cli.app, ["list", "nothing-like-it", "-fmt", "json"]).stdout == "[]\n"
+    assert runner.invoke(cli.app, ["list", "nothing-like-it", "-fmt", "tsv"]).stdout == ""
+
+
+def test_get_prints_the_command(initialized):
+    result = runner.invoke(cli.app, ["get", "ls"])
+    assert result.exit_code == 0
+    assert result.stdout == "ls -la\n"
+
+    result = runner.invoke(cli.app, ["get", "missing"])
+    assert result.exit_code == 1
+    assert result.stdout == ""
+    assert "There is no commands in cmds with key missing" in result.stderr